@@ -0,0 +1,34 @@
+"""add contacts birthday digest index
+
+Revision ID: a4d9e2c7b5f1
+Revises: f3b7d2e6a1c4
+Create Date: 2026-10-17 19:41:27.615093
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d9e2c7b5f1"
+down_revision: Union[str, None] = "f3b7d2e6a1c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_contacts_birth_day_of_year_user_id",
+        "contacts",
+        ["birth_day_of_year", "user_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_contacts_birth_day_of_year_user_id", table_name="contacts")
@@ -0,0 +1,34 @@
+"""add contacts keyset pagination index
+
+Revision ID: b7e41c9d2f53
+Revises: 93n6342a7gs4
+Create Date: 2026-10-17 10:12:44.218903
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e41c9d2f53"
+down_revision: Union[str, None] = "93n6342a7gs4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_contacts_user_id_last_name_first_name_id",
+        "contacts",
+        ["user_id", "last_name", "first_name", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_contacts_user_id_last_name_first_name_id", table_name="contacts")
@@ -0,0 +1,41 @@
+"""add trigram search indexes on contacts
+
+Revision ID: c3a9d5e8f1b6
+Revises: b7e41c9d2f53
+Create Date: 2026-10-17 11:02:17.640512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a9d5e8f1b6"
+down_revision: Union[str, None] = "b7e41c9d2f53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ("first_name", "last_name", "email")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name in SEARCH_COLUMNS:
+        op.create_index(
+            f"ix_contacts_{name}_trgm",
+            "contacts",
+            [name],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={name: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(SEARCH_COLUMNS):
+        op.drop_index(f"ix_contacts_{name}_trgm", table_name="contacts")
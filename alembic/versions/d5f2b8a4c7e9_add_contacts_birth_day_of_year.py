@@ -0,0 +1,50 @@
+"""add birth_day_of_year to contacts
+
+Revision ID: d5f2b8a4c7e9
+Revises: c3a9d5e8f1b6
+Create Date: 2026-10-17 11:48:52.307116
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5f2b8a4c7e9"
+down_revision: Union[str, None] = "c3a9d5e8f1b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "contacts", sa.Column("birth_day_of_year", sa.SmallInteger(), nullable=True)
+    )
+    # Day of the year in a leap-year calendar, so Feb 29 is always day 60
+    op.execute(
+        """
+        UPDATE contacts
+        SET birth_day_of_year = EXTRACT(DOY FROM make_date(
+            2000,
+            EXTRACT(MONTH FROM birth_date)::int,
+            EXTRACT(DAY FROM birth_date)::int
+        ))
+        """
+    )
+    op.alter_column("contacts", "birth_day_of_year", nullable=False)
+    op.create_index(
+        "ix_contacts_user_id_birth_day_of_year",
+        "contacts",
+        ["user_id", "birth_day_of_year"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_contacts_user_id_birth_day_of_year", table_name="contacts")
+    op.drop_column("contacts", "birth_day_of_year")
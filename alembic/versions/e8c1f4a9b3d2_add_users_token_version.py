@@ -0,0 +1,32 @@
+"""add token_version to users
+
+Revision ID: e8c1f4a9b3d2
+Revises: d5f2b8a4c7e9
+Create Date: 2026-10-17 15:20:41.582903
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8c1f4a9b3d2"
+down_revision: Union[str, None] = "d5f2b8a4c7e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "token_version")
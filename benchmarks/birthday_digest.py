@@ -0,0 +1,129 @@
+"""Measure the birthday digest job on a large generated address book.
+
+Fills a temporary SQLite database with ``--users`` users owning
+``--contacts`` contacts with random birthdays, then runs
+:class:`BirthdayDigestJob` for a 7-day window against a local ``aiosmtpd``
+server (``pip install -r benchmarks/requirements.txt``), once reading and
+rendering only and once sending as well. SQLite stands in for PostgreSQL,
+so the read rate is only indicative. Run from the project root with the
+usual environment variables (or ``.env``) available::
+
+    python -m benchmarks.birthday_digest [--contacts 1000000] [--users 20000]
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from aiosmtpd.controller import Controller
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks.smtp_pool import CountingHandler, free_port, local_config
+from src.database.models import Base, Contact, User, birthday_ordinal
+from src.services.email import EmailService
+from src.services.smtp_pool import SMTPConnectionPool
+from src.workers.birthday_digest import BirthdayDigestJob
+
+
+async def seed(engine, users: int, contacts: int) -> None:
+    """Insert users and contacts with birthdays spread over the year."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(User),
+            [
+                {
+                    "id": i,
+                    "username": f"user{i}",
+                    "email": f"user{i}@example.com",
+                    "hashed_password": "x",
+                    "confirmed": True,
+                }
+                for i in range(1, users + 1)
+            ],
+        )
+        rng = random.Random(0)
+        for offset in range(0, contacts, 50_000):
+            rows = []
+            for i in range(offset, min(offset + 50_000, contacts)):
+                birth_date = date(1970, 1, 1) + timedelta(days=rng.randrange(15_000))
+                rows.append(
+                    {
+                        "first_name": f"First{i}",
+                        "last_name": f"Last{i}",
+                        "email": f"contact{i}@example.com",
+                        "phone": "+1234567890",
+                        "birth_date": birth_date,
+                        "birth_day_of_year": birthday_ordinal(birth_date),
+                        "user_id": rng.randint(1, users),
+                    }
+                )
+            await conn.execute(insert(Contact), rows)
+
+
+class RenderOnly:
+    """Email service stand-in that renders digests and drops them."""
+
+    def __init__(self, service: EmailService):
+        self.build_birthday_digest = service.build_birthday_digest
+
+    async def send_batch(self, messages):
+        for message in messages:
+            message.as_bytes()
+        return [None] * len(messages)
+
+
+async def measure(name: str, factory, email_service) -> None:
+    """Run the job once and print its throughput."""
+    job = BirthdayDigestJob(email_service, session_factory=factory, days=7)
+    stats = await job.run(date(2026, 10, 17))
+    print(
+        f"{name:<10} {stats['contacts']:>8} contacts {stats['users']:>7} digests "
+        f"{stats['elapsed_seconds']:7.2f}s {stats['contacts_per_second']:10.0f} "
+        f"contacts/s {stats['emails_per_second']:8.0f} emails/s"
+    )
+
+
+async def run(args, port: int, path: Path) -> None:
+    """Seed the database and measure the job with and without sending."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    start = time.perf_counter()
+    await seed(engine, args.users, args.contacts)
+    print(f"seeded {args.contacts} contacts in {time.perf_counter() - start:.1f}s")
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    service = EmailService(pool_size=args.concurrency)
+    service.config = local_config(port, service)
+    service.pool = SMTPConnectionPool(service.config, args.concurrency, 30)
+    try:
+        await measure("render", factory, RenderOnly(service))
+        await measure("send", factory, service)
+    finally:
+        await service.pool.close()
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contacts", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    handler = CountingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            asyncio.run(run(args, controller.port, Path(tmp) / "bench.db"))
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
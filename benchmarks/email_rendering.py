@@ -0,0 +1,77 @@
+"""Compare the cost of building an email with fastapi-mail and with compiled templates.
+
+The fastapi-mail path creates a Jinja environment, loads and compiles the
+template and builds the MIME message through ``MessageSchema`` and
+``MailMsg`` for every email. :meth:`EmailService.build_verification_email`
+substitutes the fields into the cached static segments of a template
+compiled once per process. Both include minting the verification token.
+Run from the project root with the usual environment variables (or
+``.env``) available::
+
+    python -m benchmarks.email_rendering [--number 2000]
+"""
+
+import argparse
+import asyncio
+import time
+from email.utils import formataddr
+
+from fastapi_mail import MessageSchema, MessageType
+from fastapi_mail.msg import MailMsg
+
+from src.services.auth import create_email_token
+from src.services.email import EmailService
+
+
+async def fastapi_mail_message(service: EmailService, i: int):
+    """Build a verification email the way ``FastMail.send_message`` does."""
+    config = service.config
+    email = f"user{i}@example.com"
+    message = MessageSchema(
+        subject="Confirm your email - Contacts API",
+        recipients=[email],
+        template_body={
+            "host": "http://localhost:8000/",
+            "username": f"user{i}",
+            "token": create_email_token({"sub": email}),
+        },
+        subtype=MessageType.html,
+    )
+    template = config.template_engine().get_template("verify_email.html")
+    message.template_body = template.render(**message.template_body)
+    sender = formataddr((config.MAIL_FROM_NAME, config.MAIL_FROM))
+    return await MailMsg(message)._message(sender)
+
+
+async def compiled_message(service: EmailService, i: int):
+    """Build a verification email from the compiled template."""
+    return await service.build_verification_email(
+        f"user{i}@example.com", f"user{i}", "http://localhost:8000/"
+    )
+
+
+async def measure(name: str, build, service: EmailService, number: int) -> None:
+    """Print the per-message time and rate of one way of building emails."""
+    await build(service, 0)
+    start = time.perf_counter()
+    for i in range(number):
+        (await build(service, i)).as_bytes()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<12} {elapsed / number * 1e6:9.1f} us per message "
+        f"{number / elapsed:10.0f} messages/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    service = EmailService()
+    asyncio.run(measure("fastapi-mail", fastapi_mail_message, service, args.number))
+    asyncio.run(measure("compiled", compiled_message, service, args.number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Compare email throughput with a connection per message and with the SMTP pool.
+
+Sends verification emails to a local ``aiosmtpd`` server (``pip install -r
+benchmarks/requirements.txt``), first the way the service used to, opening
+a ``FastMail`` connection per message, then over
+:class:`SMTPConnectionPool` with :meth:`EmailService.send_batch`. Both
+render the template per message and send ``--concurrency`` messages at
+once. The local server has no TLS or AUTH, so against a real mail server
+the difference is larger. Run from the project root with the usual
+environment variables (or ``.env``) available::
+
+    python -m benchmarks.smtp_pool [--number 2000] [--concurrency 4]
+"""
+
+import argparse
+import asyncio
+import socket
+import time
+
+from aiosmtpd.controller import Controller
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+
+from src.services.email import EmailService
+from src.services.smtp_pool import SMTPConnectionPool
+
+
+class CountingHandler:
+    """aiosmtpd handler accepting and counting every message."""
+
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 Message accepted"
+
+
+def free_port() -> int:
+    """Return a TCP port that is free on the loopback interface."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def local_config(port: int, service: EmailService) -> ConnectionConfig:
+    """Return the service's mail settings pointed at the local server."""
+    return service.config.model_copy(
+        update={
+            "MAIL_SERVER": "127.0.0.1",
+            "MAIL_PORT": port,
+            "MAIL_SSL_TLS": False,
+            "MAIL_STARTTLS": False,
+            "USE_CREDENTIALS": False,
+            "VALIDATE_CERTS": False,
+        }
+    )
+
+
+async def per_message(config: ConnectionConfig, number: int, concurrency: int):
+    """Send with a new FastMail connection per message."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(i: int):
+        message = MessageSchema(
+            subject="Confirm your email - Contacts API",
+            recipients=[f"user{i}@example.com"],
+            template_body={
+                "host": "http://localhost:8000/",
+                "username": f"user{i}",
+                "token": "token",
+            },
+            subtype=MessageType.html,
+        )
+        async with semaphore:
+            await FastMail(config).send_message(
+                message, template_name="verify_email.html"
+            )
+
+    await asyncio.gather(*(send(i) for i in range(number)))
+
+
+async def pooled(service: EmailService, number: int):
+    """Send over pooled connections in one batch."""
+    messages = [
+        await service.build_verification_email(
+            f"user{i}@example.com", f"user{i}", "http://localhost:8000/"
+        )
+        for i in range(number)
+    ]
+    results = await service.send_batch(messages)
+    assert not any(results), [error for error in results if error][:1]
+    await service.pool.close()
+
+
+async def measure(name: str, handler: CountingHandler, number: int, send) -> None:
+    """Print messages per second of one sending strategy."""
+    received = handler.received
+    start = time.perf_counter()
+    await send
+    elapsed = time.perf_counter() - start
+    assert handler.received - received == number
+    print(f"{name:<20} {number / elapsed:10.1f} messages/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    handler = CountingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    try:
+        service = EmailService(pool_size=args.concurrency)
+        config = local_config(controller.port, service)
+        service.config = config
+        service.pool = SMTPConnectionPool(config, args.concurrency, 30)
+
+        asyncio.run(
+            measure(
+                "per-message connect",
+                handler,
+                args.number,
+                per_message(config, args.number, args.concurrency),
+            )
+        )
+        asyncio.run(
+            measure(
+                "pooled connections",
+                handler,
+                args.number,
+                pooled(service, args.number),
+            )
+        )
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare pickle and orjson encodings of cached users.
+
+Measures encode and decode time and payload size of the previous
+``pickle.dumps(User)`` cache format against :func:`encode_user` /
+:func:`decode_user`. Run from the project root with the usual environment
+variables (or ``.env``) available::
+
+    python -m benchmarks.user_cache_serialization [--number 100000]
+"""
+
+import argparse
+import pickle
+import timeit
+
+from src.database.models import User, UserRole
+from src.database.redis_db import decode_user, encode_user
+
+
+def make_user() -> User:
+    """Build a user as loaded from the database by ``get_current_user``."""
+    return User(
+        id=42,
+        username="benchmark_user",
+        email="benchmark.user@example.com",
+        hashed_password="$2b$12$" + "x" * 53,
+        avatar="https://www.gravatar.com/avatar/0123456789abcdef0123456789abcdef",
+        confirmed=True,
+        role=UserRole.USER,
+    )
+
+
+def measure(name: str, encode, decode, number: int) -> None:
+    """Print per-call timings and payload size of one encoding."""
+    user = make_user()
+    payload = encode(user)
+    encode_time = timeit.timeit(lambda: encode(user), number=number)
+    decode_time = timeit.timeit(lambda: decode(payload), number=number)
+    print(
+        f"{name:<8} encode {encode_time / number * 1e6:8.2f} us"
+        f"  decode {decode_time / number * 1e6:8.2f} us"
+        f"  size {len(payload):5d} bytes"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    measure("pickle", pickle.dumps, pickle.loads, args.number)
+    measure("orjson", encode_user, decode_user, args.number)
+
+
+if __name__ == "__main__":
+    main()
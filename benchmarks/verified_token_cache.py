@@ -0,0 +1,64 @@
+"""Compare authentication overhead with and without the verified-token cache.
+
+Times :func:`get_current_user` for a user that is already cached, so the
+result is the per-request cost of token verification plus the cache lookup.
+Run from the project root with the usual environment variables (or ``.env``)
+available::
+
+    python -m benchmarks.verified_token_cache [--number 100000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.database.models import User, UserRole
+from src.services.auth import create_access_token, get_current_user, verified_tokens
+
+
+class CachedUser:
+    """Stand-in for :class:`RedisCache` that always hits its local tier."""
+
+    def __init__(self, user: User):
+        self.user = user
+
+    async def get_user(self, username: str):
+        return self.user
+
+
+async def measure(name: str, number: int) -> None:
+    """Print the per-request time of ``get_current_user``."""
+    user = User(
+        id=42,
+        username="benchmark_user",
+        email="benchmark.user@example.com",
+        hashed_password="$2b$12$" + "x" * 53,
+        confirmed=True,
+        role=UserRole.USER,
+    )
+    cache = CachedUser(user)
+    token = create_access_token(data={"sub": user.username})
+
+    await get_current_user(token=token, db=None, cache=cache)
+    start = time.perf_counter()
+    for _ in range(number):
+        await get_current_user(token=token, db=None, cache=cache)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<12} {elapsed / number * 1e6:8.2f} us per request")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    maxsize = verified_tokens.maxsize
+    verified_tokens.maxsize = 0
+    verified_tokens.clear()
+    asyncio.run(measure("no cache", args.number))
+    verified_tokens.maxsize = maxsize
+    asyncio.run(measure("with cache", args.number))
+
+
+if __name__ == "__main__":
+    main()
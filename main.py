@@ -1,29 +1,43 @@
-from fastapi import FastAPI, Request, status
-from slowapi.errors import RateLimitExceeded
+import asyncio
+import contextlib
+
+from fastapi import FastAPI
 from src.api import contacts, utils, auth, users
-from starlette.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from src.database.redis_db import redis_cache
+from src.services.hashing import hash_executor
+from src.services.revocation import token_revocations
 
-app = FastAPI()
-
-origins = ["http://localhost:8000"]
 
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run background tasks for the lifetime of the application.
 
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    """Handle rate limit exceeded exceptions.
+    Starts the user cache invalidation listener and the token revocation
+    poller of this worker and stops them and the password hashing threads on
+    shutdown.
 
     Args:
-        request (Request): The incoming request that exceeded the rate limit.
-        exc (RateLimitExceeded): The rate limit exception that was raised.
-
-    Returns:
-        JSONResponse: A JSON response with HTTP 429 status and error message.
+        app (FastAPI): The application instance.
     """
-    return JSONResponse(
-        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content={"error": "Перевищено ліміт запитів. Спробуйте пізніше."},
-    )
+    # Load revocations before serving, so revoked tokens are never accepted
+    await token_revocations.refresh(redis_cache)
+    tasks = [
+        asyncio.create_task(redis_cache.listen_invalidations()),
+        asyncio.create_task(token_revocations.run(redis_cache)),
+    ]
+    yield
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    hash_executor.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+origins = ["http://localhost:8000"]
 
 
 app.add_middleware(
@@ -89,6 +89,36 @@ class ContactResponse(ContactBase):
     user_id: int
 
 
+class ContactImportError(BaseModel):
+    """Schema describing a rejected row of a bulk contact import.
+
+    Attributes:
+        row: Row number in the uploaded file (1-based, header excluded).
+        errors: Validation messages for the row.
+    """
+
+    row: int
+    errors: List[str]
+
+
+class ContactImportResult(BaseModel):
+    """Schema for bulk contact import results.
+
+    Attributes:
+        imported: Number of contacts created.
+        failed: Number of rows rejected by validation.
+        errors: Details of rejected rows (capped to keep the response small).
+        elapsed_seconds: Total processing time.
+        rows_per_second: Import throughput over all processed rows.
+    """
+
+    imported: int
+    failed: int
+    errors: List[ContactImportError]
+    elapsed_seconds: float
+    rows_per_second: float
+
+
 class User(BaseModel):
     """Schema for user data in API responses.
 
@@ -137,14 +167,69 @@ class Token(BaseModel):
     authentication.
 
     Attributes:
-        access_token: The JWT access token string.
+        access_token: The short-lived JWT access token string.
+        refresh_token: Long-lived JWT used to obtain new access tokens.
         token_type: Type of token (typically "bearer").
     """
 
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str
 
 
+class RefreshTokenRequest(BaseModel):
+    """Schema for access token refresh requests.
+
+    Attributes:
+        refresh_token: Refresh token issued at login or by a previous refresh.
+    """
+
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    """Schema for logout requests.
+
+    Attributes:
+        refresh_token: Optional refresh token to revoke together with the
+            access token.
+    """
+
+    refresh_token: Optional[str] = None
+
+
+class RevokeTokenRequest(BaseModel):
+    """Schema for admin token revocation requests.
+
+    Attributes:
+        token: Access or refresh token to revoke.
+    """
+
+    token: str
+
+
+class TokenIdentity(BaseModel):
+    """Identity and authorization claims carried by an access token.
+
+    Lets endpoints that only need to know who the caller is and what role
+    they have authorize without loading the user.
+
+    Attributes:
+        id: User's unique identifier.
+        username: User's username.
+        role: User's role at the time the token was issued.
+        confirmed: Whether the user's email was confirmed when the token was issued.
+        token_version: User's token version at issue time; None for tokens
+            issued before tokens carried claims.
+    """
+
+    id: int
+    username: str
+    role: UserRole
+    confirmed: bool
+    token_version: Optional[int] = None
+
+
 class RequestEmail(BaseModel):
     """Schema for email confirmation requests.
 
@@ -4,52 +4,106 @@ from fastapi import (
     HTTPException,
     status,
     Security,
-    BackgroundTasks,
     Request,
 )
+from typing import Optional
+
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 from schemas import (
     UserCreate,
     Token,
+    TokenIdentity,
+    RefreshTokenRequest,
+    LogoutRequest,
+    RevokeTokenRequest,
     User,
     RequestEmail,
     RequestPasswordReset,
     ConfirmPasswordReset,
 )
 from src.services.auth import (
+    access_token_claims,
     create_access_token,
+    create_refresh_token,
+    decode_access_token,
+    get_refresh_token_payload,
+    get_revocable_token_payload,
+    oauth2_scheme,
     Hash,
     get_email_from_token,
     get_email_from_password_reset_token,
     require_admin_role,
 )
+from src.services.rate_limit import RateLimiter, client_ip
+from src.services.revocation import token_revocations
 from src.services.users import UserService
-from src.database.db import get_db
+from src.database.db import get_db, release_session
+from src.database.redis_db import get_redis_cache, RedisCache
 from src.database.models import UserRole
-from src.services.email import send_email, send_password_reset_email
+from src.services.email_outbox import (
+    EmailOutboxService,
+    PASSWORD_RESET_EMAIL,
+    VERIFY_EMAIL,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+register_limit = RateLimiter("auth-register", "5/minute")
+login_ip_limit = RateLimiter("auth-login-ip", "20/minute")
+login_username_limit = RateLimiter("auth-login-username", "5/minute")
+refresh_limit = RateLimiter("auth-refresh", "30/minute")
+confirm_email_limit = RateLimiter("auth-confirm-email", "10/minute")
+email_request_limit = RateLimiter("auth-email-request", "3/minute")
+password_reset_limit = RateLimiter("auth-password-reset", "5/minute")
+
+
+async def limit_login_attempts(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    cache: RedisCache = Depends(get_redis_cache),
+):
+    """Throttle login attempts per client address and per username.
+
+    Runs before the password is checked, so brute-force attempts are turned
+    away without spending bcrypt time.
+
+    Args:
+        request (Request): The incoming request.
+        form_data (OAuth2PasswordRequestForm): Login form of the request.
+        cache (RedisCache): Redis cache dependency.
+
+    Raises:
+        HTTPException: 429 Too Many Requests if either limit is exceeded.
+    """
+    await login_ip_limit.hit(cache, f"ip:{client_ip(request)}")
+    await login_username_limit.hit(cache, f"user:{form_data.username.lower()}")
+
 
-@router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=User,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(register_limit)],
+)
+@release_session
 async def register_user(
     user_data: UserCreate,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """Register a new user account.
 
-    Creates a new user account with the provided user data. Sends a verification
-    email to the user's email address for account confirmation.
+    Creates a new user account with the provided user data. A verification
+    email is queued in the outbox in the same transaction and sent by the
+    email worker.
 
     Args:
         user_data (UserCreate): User registration data including username, email, and password.
-        background_tasks (BackgroundTasks): FastAPI background tasks for sending emails.
         request (Request): The HTTP request object to get the base URL.
         db (AsyncSession): Database session dependency.
 
@@ -74,18 +128,13 @@ async def register_user(
             status_code=status.HTTP_409_CONFLICT,
             detail="Користувач з таким іменем вже існує",
         )
-    user_data.password = Hash().get_password_hash(user_data.password)
+    user_data.password = await Hash().get_password_hash_async(user_data.password)
+    # Лист зберігається разом з користувачем під час коміту create_user
+    EmailOutboxService(db).stage(
+        VERIFY_EMAIL, user_data.email, user_data.username, str(request.base_url)
+    )
     new_user = await user_service.create_user(user_data)
-
-    try:
-        background_tasks.add_task(
-            send_email, new_user.email, new_user.username, str(request.base_url)
-        )
-        logger.info(f"Email для підтвердження для {new_user.email} в черзі")
-    except Exception as e:
-        logger.error(
-            f"Не вдалося поставити в чергу email для підтвердження для {new_user.email}: {e}"
-        )
+    logger.info(f"Email для підтвердження для {new_user.email} в черзі")
 
     return new_user
 
@@ -93,23 +142,22 @@ async def register_user(
 @router.post(
     "/register-admin", response_model=User, status_code=status.HTTP_201_CREATED
 )
+@release_session
 async def register_admin_user(
     user_data: UserCreate,
-    background_tasks: BackgroundTasks,
     request: Request,
-    current_user: User = Depends(require_admin_role),
+    current_user: TokenIdentity = Depends(require_admin_role),
     db: AsyncSession = Depends(get_db),
 ):
     """Admin-only endpoint to create admin users.
 
     Creates a new admin user account. This endpoint requires admin privileges
-    and sends a verification email to the new admin user.
+    and queues a verification email to the new admin user.
 
     Args:
         user_data (UserCreate): Admin user data including username, email, and password.
-        background_tasks (BackgroundTasks): FastAPI background tasks for sending emails.
         request (Request): The HTTP request object to get the base URL.
-        current_user (User): Current authenticated admin user.
+        current_user (TokenIdentity): Identity of the current admin user.
         db (AsyncSession): Database session dependency.
 
     Returns:
@@ -135,29 +183,27 @@ async def register_admin_user(
             detail="User with this username already exists",
         )
 
-    user_data.password = Hash().get_password_hash(user_data.password)
+    user_data.password = await Hash().get_password_hash_async(user_data.password)
+    EmailOutboxService(db).stage(
+        VERIFY_EMAIL, user_data.email, user_data.username, str(request.base_url)
+    )
     new_admin = await user_service.create_user(user_data, UserRole.ADMIN)
-
-    try:
-        background_tasks.add_task(
-            send_email, new_admin.email, new_admin.username, str(request.base_url)
-        )
-        logger.info(f"Email confirmation queued for admin user {new_admin.email}")
-    except Exception as e:
-        logger.error(
-            f"Failed to queue email confirmation for admin user {new_admin.email}: {e}"
-        )
+    logger.info(f"Email confirmation queued for admin user {new_admin.email}")
 
     return new_admin
 
 
-@router.post("/login", response_model=Token)
+@router.post(
+    "/login", response_model=Token, dependencies=[Depends(limit_login_attempts)]
+)
+@release_session
 async def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
 ):
     """Authenticate user and return access token.
 
-    Validates user credentials and returns a JWT access token for authenticated requests.
+    Validates user credentials and returns a short-lived JWT access token for
+    authenticated requests together with a long-lived refresh token.
     The user's email must be confirmed before login is allowed.
 
     Args:
@@ -165,14 +211,19 @@ async def login_user(
         db (AsyncSession): Database session dependency.
 
     Returns:
-        Token: Access token and token type for authenticated API access.
+        Token: Access token, refresh token and token type for authenticated API access.
 
     Raises:
-        HTTPException: 401 Unauthorized if credentials are invalid or email not confirmed.
+        HTTPException: 401 Unauthorized if credentials are invalid or email not confirmed,
+            429 Too Many Requests if too many attempts were made for the client
+            address or username, 503 Service Unavailable if password hashing
+            is saturated.
     """
     user_service = UserService(db)
     user = await user_service.get_user_by_username(form_data.username)
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    if not user or not await Hash().verify_password_async(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неправильний логін або пароль",
@@ -184,11 +235,176 @@ async def login_user(
             detail="Електронна адреса не підтверджена",
         )
 
-    access_token = create_access_token(data={"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {
+        "access_token": create_access_token(data=access_token_claims(user)),
+        "refresh_token": create_refresh_token(user),
+        "token_type": "bearer",
+    }
+
+
+@router.post(
+    "/refresh", response_model=Token, dependencies=[Depends(refresh_limit)]
+)
+@release_session
+async def refresh_tokens(
+    body: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_db),
+    cache: RedisCache = Depends(get_redis_cache),
+):
+    """Exchange a refresh token for new access and refresh tokens.
+
+    The new access token carries the user's current role and confirmation
+    status. Refresh tokens issued before the user's token version was bumped
+    (by a role or password change) or revoked are rejected. The exchanged
+    refresh token is revoked atomically before new tokens are issued, so
+    each one can be used only once, even by concurrent requests.
+
+    Args:
+        body (RefreshTokenRequest): Request body containing the refresh token.
+        db (AsyncSession): Database session dependency.
+        cache (RedisCache): Redis cache dependency.
+
+    Returns:
+        Token: New access token, refresh token and token type.
+
+    Raises:
+        HTTPException: 401 Unauthorized if the refresh token is invalid,
+            expired or revoked, or the user no longer exists.
+        HTTPException: 503 Service Unavailable if the refresh token can't be
+            revoked.
+    """
+    invalid_token = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = get_refresh_token_payload(body.refresh_token)
+    # Токени без jti неможливо використати лише один раз
+    if payload.get("jti") is None or await token_revocations.is_revoked(
+        payload, cache
+    ):
+        raise invalid_token
+    # Читаємо з основної бази, щоб бачити актуальну версію токенів
+    user_service = UserService(db)
+    user = await user_service.get_user_by_username(payload["sub"])
+    if (
+        user is None
+        or user.id != payload.get("uid")
+        or user.token_version != payload.get("ver")
+    ):
+        raise invalid_token
+
+    # Лише запит, який першим відкликав токен, отримує нову пару
+    if not await _revoke_or_fail(payload, cache):
+        raise invalid_token
+    return {
+        "access_token": create_access_token(data=access_token_claims(user)),
+        "refresh_token": create_refresh_token(user),
+        "token_type": "bearer",
+    }
+
+
+async def _revoke_or_fail(payload: dict, cache: RedisCache) -> bool:
+    """Revoke a token, failing the request if that isn't possible.
+
+    Args:
+        payload (dict): Verified token payload.
+        cache (RedisCache): Redis cache dependency.
+
+    Returns:
+        bool: False if the token had already been revoked, True otherwise.
+
+    Raises:
+        HTTPException: 503 Service Unavailable if the revocation can't be stored.
+    """
+    if payload.get("jti") is None:
+        # Токени, видані до появи jti, відкликати неможливо; вони спливуть самі
+        return True
+    revoked = await token_revocations.revoke(payload, cache)
+    if revoked is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Не вдалося відкликати токен. Спробуйте пізніше.",
+        )
+    return revoked
+
+
+@router.post("/logout")
+async def logout(
+    body: Optional[LogoutRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    cache: RedisCache = Depends(get_redis_cache),
+):
+    """Log out by revoking the current access token.
 
+    The refresh token, if given, is revoked as well. Revoked tokens are
+    rejected by every worker within ``REVOCATION_REFRESH_SECONDS``.
+
+    Args:
+        body (Optional[LogoutRequest]): Optional body with the refresh token.
+        token (str): JWT access token from Authorization header.
+        cache (RedisCache): Redis cache dependency.
 
-@router.get("/confirmed_email/{token}")
+    Returns:
+        dict: Success message.
+
+    Raises:
+        HTTPException: 401 Unauthorized if the access token is invalid.
+        HTTPException: 503 Service Unavailable if the revocation can't be stored.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise credentials_exception
+    if payload.get("type") == "refresh":
+        raise credentials_exception
+    payloads = [payload]
+    if body is not None and body.refresh_token:
+        refresh_payload = get_refresh_token_payload(body.refresh_token)
+        if refresh_payload.get("sub") == payload.get("sub"):
+            payloads.append(refresh_payload)
+
+    for token_payload in payloads:
+        await _revoke_or_fail(token_payload, cache)
+    return {"message": "Ви вийшли з системи"}
+
+
+@router.post("/revoke")
+async def revoke_token(
+    body: RevokeTokenRequest,
+    current_user: TokenIdentity = Depends(require_admin_role),
+    cache: RedisCache = Depends(get_redis_cache),
+):
+    """Revoke any access or refresh token (Admin only).
+
+    Args:
+        body (RevokeTokenRequest): Request body containing the token to revoke.
+        current_user (TokenIdentity): Identity of the current admin user.
+        cache (RedisCache): Redis cache dependency.
+
+    Returns:
+        dict: Success message.
+
+    Raises:
+        HTTPException: 400 Bad Request if the token is invalid, expired or
+            has no ``jti`` claim.
+        HTTPException: 403 Forbidden if current user is not an admin.
+        HTTPException: 503 Service Unavailable if the revocation can't be stored.
+    """
+    payload = get_revocable_token_payload(body.token)
+    await _revoke_or_fail(payload, cache)
+    return {"message": "Token revoked"}
+
+
+@router.get(
+    "/confirmed_email/{token}", dependencies=[Depends(confirm_email_limit)]
+)
+@release_session
 async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     """Confirm user's email address using verification token.
 
@@ -223,29 +439,31 @@ async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     return {"message": "Електронну пошту підтверджено. Email confirmed successfully."}
 
 
-@router.post("/request_email")
+@router.post("/request_email", dependencies=[Depends(email_request_limit)])
+@release_session
 async def request_email(
     body: RequestEmail,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    cache: RedisCache = Depends(get_redis_cache),
 ):
     """Request email verification for user account.
 
-    Sends a verification email to the user's email address. Returns a generic
+    Queues a verification email to the user's email address, unless one was
+    queued for it recently or the email budget is spent. Returns a generic
     success message regardless of whether the email exists for security reasons.
 
     Args:
         body (RequestEmail): Request body containing the email address.
-        background_tasks (BackgroundTasks): FastAPI background tasks for sending emails.
         request (Request): The HTTP request object to get the base URL.
         db (AsyncSession): Database session dependency.
+        cache (RedisCache): Redis cache dependency.
 
     Returns:
         dict: Success message asking user to check their email.
 
     Raises:
-        HTTPException: 500 Internal Server Error if email sending fails.
+        HTTPException: 500 Internal Server Error if the email can't be queued.
     """
     user_service = UserService(db)
     user = await user_service.get_user_by_email(body.email)
@@ -257,17 +475,18 @@ async def request_email(
         return {"message": "Ваша електронна пошта вже підтверджена"}
 
     try:
-        background_tasks.add_task(
-            send_email, user.email, user.username, str(request.base_url)
+        queued = await EmailOutboxService(db, cache).enqueue_once(
+            VERIFY_EMAIL, user.email, user.username, str(request.base_url)
         )
-        logger.info(f"Email для підтвердження для {user.email} в черзі")
+        if queued:
+            logger.info(f"Email для підтвердження для {user.email} в черзі")
     except Exception as e:
         logger.error(
             f"Не вдалося поставити в чергу email для підтвердження для {user.email}: {e}"
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Не вдалося надіслати email. Перевірте налаштування пошти.",
+            detail="Не вдалося поставити email у чергу. Спробуйте пізніше.",
         )
 
     return {
@@ -275,23 +494,27 @@ async def request_email(
     }
 
 
-@router.post("/request-password-reset")
+@router.post(
+    "/request-password-reset", dependencies=[Depends(email_request_limit)]
+)
+@release_session
 async def request_password_reset(
     body: RequestPasswordReset,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    cache: RedisCache = Depends(get_redis_cache),
 ):
     """Request password reset for user account.
 
-    Sends a password reset email to the user's email address. Always returns
+    Queues a password reset email to the user's email address, unless one
+    was queued for it recently or the email budget is spent. Always returns
     a success message for security reasons, regardless of whether the email exists.
 
     Args:
         body (RequestPasswordReset): Request body containing the email address.
-        background_tasks (BackgroundTasks): FastAPI background tasks for sending emails.
         request (Request): The HTTP request object to get the base URL.
         db (AsyncSession): Database session dependency.
+        cache (RedisCache): Redis cache dependency.
 
     Returns:
         dict: Generic success message about password reset instructions.
@@ -301,13 +524,11 @@ async def request_password_reset(
 
     if user is not None:
         try:
-            background_tasks.add_task(
-                send_password_reset_email,
-                user.email,
-                user.username,
-                str(request.base_url),
+            queued = await EmailOutboxService(db, cache).enqueue_once(
+                PASSWORD_RESET_EMAIL, user.email, user.username, str(request.base_url)
             )
-            logger.info(f"Password reset email queued for {user.email}")
+            if queued:
+                logger.info(f"Password reset email queued for {user.email}")
         except Exception as e:
             logger.error(f"Failed to queue password reset email for {user.email}: {e}")
 
@@ -316,7 +537,10 @@ async def request_password_reset(
     }
 
 
-@router.post("/confirm-password-reset")
+@router.post(
+    "/confirm-password-reset", dependencies=[Depends(password_reset_limit)]
+)
+@release_session
 async def confirm_password_reset(
     body: ConfirmPasswordReset,
     db: AsyncSession = Depends(get_db),
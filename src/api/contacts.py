@@ -1,23 +1,65 @@
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, status
+from typing import List, Literal, Optional
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.db import get_db
-from schemas import ContactBase, ContactCreate, ContactUpdate, ContactResponse
+from src.database.db import (
+    get_db,
+    get_read_db,
+    get_read_session_factory,
+    release_session,
+)
+from schemas import (
+    ContactBase,
+    ContactCreate,
+    ContactUpdate,
+    ContactResponse,
+    ContactImportResult,
+)
 from src.database.models import User
+from src.database.redis_db import RedisCache, get_redis_cache
 from src.services.auth import get_current_user
 from src.services.contacts import ContactService
+from src.services.rate_limit import RateLimiter
+from src.services.contacts_io import (
+    EXPORT_MEDIA_TYPES,
+    LineError,
+    detect_format,
+    iter_csv_rows,
+    iter_lines,
+    iter_ndjson_rows,
+)
 
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
+read_limit = RateLimiter("contacts-read", "120/minute", per="user")
+write_limit = RateLimiter("contacts-write", "60/minute", per="user")
+bulk_limit = RateLimiter("contacts-bulk", "5/minute", per="user")
+export_limit = RateLimiter("contacts-export", "5/minute", per="user")
+
 
 # Створити новий контакт
-@router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=ContactResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(write_limit)],
+)
+@release_session
 async def create_contact(
     body: ContactCreate,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
+    cache: RedisCache = Depends(get_redis_cache),
 ):
     """Create a new contact for the authenticated user.
 
@@ -28,70 +70,201 @@ async def create_contact(
         body (ContactCreate): Contact data including name, email, phone, and birth date.
         db (AsyncSession): Database session dependency.
         user (User): Currently authenticated user.
+        cache (RedisCache): Redis cache dependency.
 
     Returns:
         ContactResponse: The created contact object with generated ID.
     """
-    contact_service = ContactService(db)
+    contact_service = ContactService(db, cache)
     return await contact_service.create_contact(body, user)
 
 
+# Імпортувати контакти пакетом
+@router.post(
+    "/bulk", response_model=ContactImportResult, dependencies=[Depends(bulk_limit)]
+)
+@release_session
+async def import_contacts(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+    cache: RedisCache = Depends(get_redis_cache),
+):
+    """Bulk-import contacts for the authenticated user.
+
+    Accepts a streamed request body in NDJSON (``application/x-ndjson``) or
+    CSV with a header row (``text/csv``), using the same fields as contact
+    creation. Rows are validated and written in chunks; invalid rows are
+    skipped and reported without aborting the import.
+
+    Args:
+        request (Request): The HTTP request whose body is streamed.
+        db (AsyncSession): Database session dependency.
+        user (User): Currently authenticated user.
+        cache (RedisCache): Redis cache dependency.
+
+    Returns:
+        ContactImportResult: Imported and rejected row counts, per-row errors
+        and throughput in rows per second.
+
+    Raises:
+        HTTPException: 400 Bad Request if the CSV header can't be read, 415
+            Unsupported Media Type for other content types.
+    """
+    import_format = detect_format(request.headers.get("content-type"))
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Use application/x-ndjson or text/csv",
+        )
+
+    lines = iter_lines(request.stream())
+    rows = iter_csv_rows(lines) if import_format == "csv" else iter_ndjson_rows(lines)
+
+    contact_service = ContactService(db, cache)
+    try:
+        return await contact_service.import_contacts(rows, user)
+    except LineError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 # Отримати список всіх контактів
-@router.get("/", response_model=List[ContactResponse])
+@router.get(
+    "/", response_model=List[ContactResponse], dependencies=[Depends(read_limit)]
+)
+@release_session
 async def read_contacts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
+    cache: RedisCache = Depends(get_redis_cache),
 ):
     """Get list of contacts for the authenticated user.
 
     Retrieves contacts belonging to the authenticated user with optional
-    pagination and search functionality.
+    pagination and search functionality. Contacts are ordered by last name,
+    first name and ID.
+
+    Two pagination modes are supported. Offset mode uses ``skip``; cursor
+    mode is enabled by passing ``cursor`` and ignores ``skip``, so that every
+    page costs the same regardless of its depth. The cursor for the following
+    page is returned in the ``X-Next-Cursor`` response header when more
+    contacts may be available. In offset mode, search results are ranked by
+    relevance and come without a cursor.
 
     Args:
+        response (Response): Outgoing response used to set the cursor header.
         skip (int): Number of records to skip for pagination. Defaults to 0.
         limit (int): Maximum number of records to return. Defaults to 100.
         search (Optional[str]): Search term to filter contacts by name or email.
-        db (AsyncSession): Database session dependency.
+        cursor (Optional[str]): Opaque cursor from a previous ``X-Next-Cursor`` header.
+        db (AsyncSession): Read-only database session dependency.
         user (User): Currently authenticated user.
+        cache (RedisCache): Redis cache dependency.
 
     Returns:
         List[ContactResponse]: List of contact objects matching the criteria.
+
+    Raises:
+        HTTPException: 400 Bad Request if the cursor is invalid.
     """
-    contact_service = ContactService(db)
-    contacts = await contact_service.get_contacts(skip, limit, user, search)
+    contact_service = ContactService(db, cache)
+    contacts, next_cursor = await contact_service.list_contacts(
+        skip, limit, user, search, cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return contacts
 
 
 # Отримати контакти, у яких день народження протягом тижня
-@router.get("/upcoming-birthdays", response_model=List[ContactResponse])
+@router.get(
+    "/upcoming-birthdays",
+    response_model=List[ContactResponse],
+    dependencies=[Depends(read_limit)],
+)
+@release_session
 async def get_upcoming_birthdays(
-    db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)
+    days: int = Query(7, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+    cache: RedisCache = Depends(get_redis_cache),
 ):
-    """Get contacts with upcoming birthdays within 7 days.
+    """Get contacts with upcoming birthdays.
 
     Retrieves all contacts belonging to the authenticated user whose birthdays
-    occur within the next 7 days from today.
+    occur within the next ``days`` days, today included. People born on
+    February 29 are listed on February 28 in common years.
 
     Args:
-        db (AsyncSession): Database session dependency.
+        days (int): Length of the window in days (1-366). Defaults to 7.
+        db (AsyncSession): Read-only database session dependency.
         user (User): Currently authenticated user.
+        cache (RedisCache): Redis cache dependency.
 
     Returns:
-        List[ContactResponse]: List of contacts with upcoming birthdays.
+        List[ContactResponse]: Contacts ordered by how soon their birthday comes.
     """
-    contact_service = ContactService(db)
-    contacts = await contact_service.get_contacts_birthday_in_7_days(user)
+    contact_service = ContactService(db, cache)
+    contacts = await contact_service.get_upcoming_birthdays(user, days)
     return contacts
 
 
+# Експортувати всі контакти
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(export_limit)],
+)
+async def export_contacts(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    session_factory=Depends(get_read_session_factory),
+    user: User = Depends(get_current_user),
+):
+    """Export all contacts of the authenticated user.
+
+    Streams the address book as NDJSON or CSV. Rows are read through a
+    server-side cursor and sent in chunks, so memory use stays constant
+    regardless of the number of contacts.
+
+    Args:
+        export_format (str): Output format, "ndjson" (default) or "csv".
+        session_factory (Callable): Factory of the read-only session used by the stream.
+        user (User): Currently authenticated user.
+
+    Returns:
+        StreamingResponse: The exported contacts as an attachment.
+    """
+
+    async def stream():
+        async with session_factory() as session:
+            contact_service = ContactService(session)
+            async for chunk in contact_service.export_contacts(user, export_format):
+                yield chunk
+
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="contacts.{export_format}"'
+        },
+    )
+
+
 # Отримати один контакт за ідентифікатором
-@router.get("/{contact_id}", response_model=ContactResponse)
+@router.get(
+    "/{contact_id}",
+    response_model=ContactResponse,
+    dependencies=[Depends(read_limit)],
+)
+@release_session
 async def read_contact(
     contact_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user: User = Depends(get_current_user),
 ):
     """Get a specific contact by ID.
@@ -101,7 +274,7 @@ async def read_contact(
 
     Args:
         contact_id (int): The unique identifier of the contact.
-        db (AsyncSession): Database session dependency.
+        db (AsyncSession): Read-only database session dependency.
         user (User): Currently authenticated user.
 
     Returns:
@@ -120,12 +293,18 @@ async def read_contact(
 
 
 # Оновити контакт, що існує
-@router.patch("/{contact_id}", response_model=ContactResponse)
+@router.patch(
+    "/{contact_id}",
+    response_model=ContactResponse,
+    dependencies=[Depends(write_limit)],
+)
+@release_session
 async def update_contact(
     body: ContactUpdate,
     contact_id: int,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
+    cache: RedisCache = Depends(get_redis_cache),
 ):
     """Update an existing contact.
 
@@ -138,6 +317,7 @@ async def update_contact(
         contact_id (int): The unique identifier of the contact to update.
         db (AsyncSession): Database session dependency.
         user (User): Currently authenticated user.
+        cache (RedisCache): Redis cache dependency.
 
     Returns:
         ContactResponse: The updated contact object.
@@ -145,7 +325,7 @@ async def update_contact(
     Raises:
         HTTPException: 404 Not Found if contact doesn't exist or doesn't belong to user.
     """
-    contact_service = ContactService(db)
+    contact_service = ContactService(db, cache)
     contact = await contact_service.update_contact(contact_id, body, user)
     if contact is None:
         raise HTTPException(
@@ -155,11 +335,17 @@ async def update_contact(
 
 
 # Видалити контакт
-@router.delete("/{contact_id}", response_model=ContactResponse)
+@router.delete(
+    "/{contact_id}",
+    response_model=ContactResponse,
+    dependencies=[Depends(write_limit)],
+)
+@release_session
 async def remove_contact(
     contact_id: int,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
+    cache: RedisCache = Depends(get_redis_cache),
 ):
     """Delete a specific contact.
 
@@ -170,6 +356,7 @@ async def remove_contact(
         contact_id (int): The unique identifier of the contact to delete.
         db (AsyncSession): Database session dependency.
         user (User): Currently authenticated user.
+        cache (RedisCache): Redis cache dependency.
 
     Returns:
         ContactResponse: The deleted contact object.
@@ -177,7 +364,7 @@ async def remove_contact(
     Raises:
         HTTPException: 404 Not Found if contact doesn't exist or doesn't belong to user.
     """
-    contact_service = ContactService(db)
+    contact_service = ContactService(db, cache)
     contact = await contact_service.remove_contact(contact_id, user)
     if contact is None:
         raise HTTPException(
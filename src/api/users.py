@@ -1,22 +1,24 @@
-from fastapi import APIRouter, Depends, Request, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.database.db import get_db
+from src.database.db import get_db, release_session
 from src.database.redis_db import get_redis_cache, RedisCache
 
-from schemas import User, UserRole
+from schemas import TokenIdentity, User, UserRole
 from src.database.models import UserRole as ModelUserRole
 from src.conf.config import settings
 from src.services.auth import get_current_user, require_admin_role
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from pydantic import BaseModel
 
+from src.services.rate_limit import RateLimiter
 from src.services.upload_file import UploadFileService
 from src.services.users import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-limiter = Limiter(key_func=get_remote_address)
+me_limit = RateLimiter("users-me", "3/minute", per="user")
+avatar_update_limit = RateLimiter("users-avatar-update", "5/minute", per="user")
+avatar_delete_limit = RateLimiter("users-avatar-delete", "3/minute", per="user")
+role_update_limit = RateLimiter("users-role", "5/minute", per="user")
 
 
 class UserRoleUpdate(BaseModel):
@@ -24,16 +26,14 @@ class UserRoleUpdate(BaseModel):
     role: UserRole
 
 
-@router.get("/me", response_model=User)
-@limiter.limit("3/minute")
-async def me(request: Request, user: User = Depends(get_current_user)):
+@router.get("/me", response_model=User, dependencies=[Depends(me_limit)])
+async def me(user: User = Depends(get_current_user)):
     """Get current user information.
 
     Returns the profile information of the currently authenticated user.
-    Rate limited to 3 requests per minute.
+    Rate limited to 3 requests per minute per user.
 
     Args:
-        request (Request): The HTTP request object.
         user (User): Currently authenticated user from JWT token.
 
     Returns:
@@ -42,12 +42,14 @@ async def me(request: Request, user: User = Depends(get_current_user)):
     return user
 
 
-@router.patch("/avatar", response_model=User)
-@limiter.limit("5/minute")
+@router.patch(
+    "/avatar", response_model=User, dependencies=[Depends(avatar_update_limit)]
+)
+@release_session
 async def update_avatar_user(
-    request: Request,
     file: UploadFile = File(..., description="Avatar image file (max 5MB)"),
-    current_user: User = Depends(require_admin_role),
+    admin: TokenIdentity = Depends(require_admin_role),
+    current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     cache: RedisCache = Depends(get_redis_cache),
 ):
@@ -55,11 +57,11 @@ async def update_avatar_user(
 
     Uploads a new avatar image for the user to cloud storage and updates
     the user's profile. Requires admin privileges and confirmed email.
-    Rate limited to 5 requests per minute.
+    Rate limited to 5 requests per minute per user.
 
     Args:
-        request (Request): The HTTP request object.
         file (UploadFile): Avatar image file to upload (max 5MB).
+        admin (TokenIdentity): Identity of the current admin user.
         current_user (User): Currently authenticated admin user.
         db (AsyncSession): Database session dependency.
         cache (RedisCache): Redis cache dependency.
@@ -105,11 +107,13 @@ async def update_avatar_user(
         )
 
 
-@router.delete("/avatar", response_model=User)
-@limiter.limit("3/minute")
+@router.delete(
+    "/avatar", response_model=User, dependencies=[Depends(avatar_delete_limit)]
+)
+@release_session
 async def delete_avatar_user(
-    request: Request,
-    current_user: User = Depends(require_admin_role),
+    admin: TokenIdentity = Depends(require_admin_role),
+    current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     cache: RedisCache = Depends(get_redis_cache),
 ):
@@ -117,10 +121,10 @@ async def delete_avatar_user(
 
     Removes the current avatar and resets it to the default Gravatar image
     based on the user's email. Requires admin privileges.
-    Rate limited to 3 requests per minute.
+    Rate limited to 3 requests per minute per user.
 
     Args:
-        request (Request): The HTTP request object.
+        admin (TokenIdentity): Identity of the current admin user.
         current_user (User): Currently authenticated admin user.
         db (AsyncSession): Database session dependency.
         cache (RedisCache): Redis cache dependency.
@@ -160,24 +164,23 @@ async def delete_avatar_user(
         )
 
 
-@router.patch("/role", response_model=User)
-@limiter.limit("5/minute")
+@router.patch("/role", response_model=User, dependencies=[Depends(role_update_limit)])
+@release_session
 async def update_user_role(
-    request: Request,
     role_update: UserRoleUpdate,
-    current_user: User = Depends(require_admin_role),
+    current_user: TokenIdentity = Depends(require_admin_role),
     db: AsyncSession = Depends(get_db),
     cache: RedisCache = Depends(get_redis_cache),
 ):
     """Update user role (Admin only).
 
     Updates a user's role in the system. This endpoint is restricted to admin users only.
-    Rate limited to 5 requests per minute.
+    The new role reaches the user's access tokens when they are refreshed.
+    Rate limited to 5 requests per minute per user.
 
     Args:
-        request (Request): The HTTP request object.
         role_update (UserRoleUpdate): Request body containing email and new role.
-        current_user (User): Currently authenticated admin user.
+        current_user (TokenIdentity): Identity of the current admin user.
         db (AsyncSession): Database session dependency.
         cache (RedisCache): Redis cache dependency.
 
@@ -2,15 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from src.database.db import get_db
+from src.database.db import get_read_db, sessionmanager
 from src.database.redis_db import get_redis_cache, RedisCache
+from src.services.auth import require_admin_role
+from src.services.contacts import contacts_cache_stats
+from src.services.hashing import hash_executor
+from src.services.revocation import token_revocations
 
 router = APIRouter(tags=["utils"])
 
 
 @router.get("/healthchecker")
 async def healthchecker(
-    db: AsyncSession = Depends(get_db), cache: RedisCache = Depends(get_redis_cache)
+    db: AsyncSession = Depends(get_read_db), cache: RedisCache = Depends(get_redis_cache)
 ):
     """Check the health status of the application and its dependencies.
 
@@ -18,7 +22,8 @@ async def healthchecker(
     the application is functioning properly.
 
     Args:
-        db (AsyncSession): Database session dependency.
+        db (AsyncSession): Read-only database session dependency (a replica
+            when replicas are configured).
         cache (RedisCache): Redis cache dependency.
 
     Returns:
@@ -45,6 +50,7 @@ async def healthchecker(
             "message": "Welcome to FastAPI!",
             "database": "connected",
             "redis": "connected" if redis_status else "disconnected",
+            "redis_circuit": cache.breaker.state,
         }
     except Exception as e:
         print(e)
@@ -52,3 +58,33 @@ async def healthchecker(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the database or Redis",
         )
+
+
+@router.get("/metrics", dependencies=[Depends(require_admin_role)])
+async def metrics(cache: RedisCache = Depends(get_redis_cache)):
+    """Report runtime metrics of shared resources (Admin only).
+
+    Exposes connection pool usage of this worker process, so pools can be
+    sized against the database ``max_connections`` and exhaustion is visible
+    before checkouts start timing out, the state of the Redis circuit
+    breaker, the effectiveness of the contact result cache, the load on
+    the password hashing threads and the token revocation filter.
+
+    Args:
+        cache (RedisCache): Redis cache dependency.
+
+    Returns:
+        dict: Pool statistics keyed by pool name, Redis breaker state,
+        contact cache counters, password hashing executor usage and
+        revocation filter statistics.
+    """
+    db_pools = {"primary": sessionmanager.pool_stats()}
+    for index, stats in enumerate(sessionmanager.replica_pool_stats(), start=1):
+        db_pools[f"replica_{index}"] = stats
+    return {
+        "db_pools": db_pools,
+        "redis": {"circuit": cache.breaker.as_dict()},
+        "contacts_cache": contacts_cache_stats.as_dict(),
+        "password_hashing": hash_executor.as_dict(),
+        "token_revocations": token_revocations.as_dict(),
+    }
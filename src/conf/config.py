@@ -5,9 +5,33 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DB_URL: str
+
+    # Database connection pool settings (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Read replicas (comma-separated URLs); reads go to the primary when empty
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_STRATEGY: str = "round_robin"  # or "least_loaded"
+    # Reads of a client stay on the primary this long after it commits a write
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
-    JWT_EXPIRATION_SECONDS: int = 3600
+    # Access tokens carry role claims that are only re-checked on refresh,
+    # so a role change or lock-out takes up to this long to apply
+    JWT_EXPIRATION_SECONDS: int = 300
+    JWT_REFRESH_EXPIRATION_SECONDS: int = 30 * 24 * 3600
+    # Revoked token ids mirrored per worker in a Bloom filter, polled from
+    # Redis every REVOCATION_REFRESH_SECONDS
+    REVOCATION_FILTER_CAPACITY: int = 100000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_REFRESH_SECONDS: float = 2.0
+    # Verified access tokens kept per worker process; 0 disables the cache
+    JWT_CACHE_SIZE: int = 10000
 
     # Redis settings
     REDIS_HOST: str = "localhost"
@@ -15,6 +39,56 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: Optional[str] = None
     REDIS_DB: int = 0
     REDIS_URL: Optional[str] = None
+    REDIS_CONNECT_TIMEOUT: float = 0.5
+    REDIS_SOCKET_TIMEOUT: float = 1.0
+
+    # Lifetime of cached contact lists and upcoming birthdays
+    CONTACTS_CACHE_TTL: int = 300
+
+    # Redis circuit breaker: skip Redis for REDIS_BREAKER_RESET_SECONDS after
+    # REDIS_BREAKER_FAILURE_THRESHOLD consecutive failures, then probe it
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 5
+    REDIS_BREAKER_RESET_SECONDS: float = 10.0
+    REDIS_BREAKER_HALF_OPEN_CALLS: int = 1
+
+    # Redis-backed rate limits of the API routes
+    RATE_LIMIT_ENABLED: bool = True
+
+    # Lifetime of users cached in Redis, independent of the token lifetime
+    USER_CACHE_TTL_SECONDS: int = 3600
+    # In-process user cache in front of Redis (per worker process)
+    USER_CACHE_LOCAL_SIZE: int = 1024
+    USER_CACHE_LOCAL_TTL: float = 30.0
+
+    # bcrypt runs in PASSWORD_HASH_WORKERS threads; up to
+    # PASSWORD_HASH_QUEUE_LIMIT more calls wait, the rest get 503
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
+
+    # Email outbox worker (python -m src.workers.email_outbox): retries
+    # failures with exponential backoff, gives up after EMAIL_MAX_ATTEMPTS
+    EMAIL_WORKER_BATCH_SIZE: int = 50
+    EMAIL_WORKER_POLL_SECONDS: float = 2.0
+    EMAIL_WORKER_LEASE_SECONDS: float = 300.0
+    EMAIL_MAX_ATTEMPTS: int = 8
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+    # Verification and password reset emails requested on demand: one per
+    # address and kind every EMAIL_DEDUP_SECONDS, at most EMAIL_SEND_BUDGET
+    # in total across all workers
+    EMAIL_DEDUP_SECONDS: int = 600
+    EMAIL_SEND_BUDGET: str = "500/hour"
+    # Daily birthday digest (python -m src.workers.birthday_digest): reads
+    # BIRTHDAY_DIGEST_FETCH_SIZE rows per fetch, sends
+    # BIRTHDAY_DIGEST_BATCH_SIZE digests per batch over the SMTP pool
+    BIRTHDAY_DIGEST_DAYS: int = 7
+    BIRTHDAY_DIGEST_BATCH_SIZE: int = 200
+    BIRTHDAY_DIGEST_FETCH_SIZE: int = 5000
+
+    # Persistent SMTP connections per process, checked with NOOP before reuse
+    # after SMTP_IDLE_CHECK_SECONDS idle
+    SMTP_POOL_SIZE: int = 4
+    SMTP_IDLE_CHECK_SECONDS: float = 30.0
 
     MAIL_USERNAME: EmailStr
     MAIL_PASSWORD: str
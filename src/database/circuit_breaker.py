@@ -0,0 +1,123 @@
+import time
+
+
+class CircuitBreaker:
+    """Stop calling a failing dependency for a while, then probe it.
+
+    The breaker starts *closed* and lets every call through. After
+    ``failure_threshold`` consecutive failures it *opens*: callers skip the
+    dependency and use their fallback right away. Once ``reset_timeout`` has
+    passed it becomes *half-open* and lets up to ``half_open_max_calls``
+    probe calls through; a successful probe closes it, a failed one opens it
+    again. A probe that reports no outcome within ``probe_timeout`` is
+    considered lost and frees its slot, so the breaker can't stay half-open
+    with no probes left.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds the breaker stays open before probing.
+        half_open_max_calls (int): Concurrent probes allowed while half-open.
+        probe_timeout (float): Seconds after which unanswered probes are
+            considered lost.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        half_open_max_calls: int = 1,
+        probe_timeout: float = 10.0,
+    ):
+        """Initialize a closed breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker.
+            reset_timeout (float): Seconds the breaker stays open before probing.
+            half_open_max_calls (int): Concurrent probes allowed while half-open.
+            probe_timeout (float): Seconds after which unanswered probes are
+                considered lost.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.probe_timeout = probe_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probed_at = 0.0
+        self.rejected_calls = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """str: Current state, moving from open to half-open when due."""
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Check whether a call may go to the dependency.
+
+        A call allowed while half-open counts as a probe and must be
+        followed by :meth:`record_success`, :meth:`record_failure` or, if it
+        ended without an outcome, :meth:`release`.
+
+        Returns:
+            bool: True to make the call, False to use the fallback.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            now = time.monotonic()
+            if self._probes and now - self._probed_at >= self.probe_timeout:
+                self._probes = 0
+            if self._probes < self.half_open_max_calls:
+                self._probes += 1
+                self._probed_at = now
+                return True
+        self.rejected_calls += 1
+        return False
+
+    def release(self) -> None:
+        """Give back a probe that ended without an outcome, e.g. cancelled."""
+        if self._state == self.HALF_OPEN and self._probes:
+            self._probes -= 1
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the breaker."""
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probes = 0
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the breaker if needed."""
+        self._failures += 1
+        if self._state == self.HALF_OPEN or (
+            self._state == self.CLOSED and self._failures >= self.failure_threshold
+        ):
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+
+    def as_dict(self) -> dict:
+        """Return the breaker state as a JSON-serializable dictionary.
+
+        Returns:
+            dict: State, consecutive failures and counters.
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "rejected_calls": self.rejected_calls,
+            "times_opened": self.times_opened,
+        }
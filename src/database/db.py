@@ -1,13 +1,167 @@
 import contextlib
+import functools
+import hashlib
+import itertools
+import time
+from collections import OrderedDict
 
-from sqlalchemy.exc import SQLAlchemyError
+from fastapi import Request
+from sqlalchemy import event, make_url
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
+    AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.conf.config import settings
+from src.database.redis_db import RedisCache, redis_cache
+
+REPLICA_STRATEGIES = ("round_robin", "least_loaded")
+
+# Clients whose stickiness is also remembered in process; the least
+# recently written ones are dropped beyond this
+MAX_STICKY_CLIENTS = 10000
+
+# Upper bounds (seconds) of the checkout wait-time histogram buckets
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """Counters describing how long requests wait for a pooled connection.
+
+    Attributes:
+        checkouts (int): Number of successful connection checkouts.
+        timeouts (int): Number of checkouts that gave up after ``pool_timeout``.
+        wait_seconds_sum (float): Total time spent waiting for connections.
+    """
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_sum = 0.0
+        self._bucket_counts = [0] * (len(POOL_WAIT_BUCKETS) + 1)
+
+    def observe(self, wait_seconds: float, timed_out: bool = False) -> None:
+        """Record a single checkout attempt.
+
+        Args:
+            wait_seconds (float): Time spent waiting for the connection.
+            timed_out (bool): Whether the attempt ended with a pool timeout.
+        """
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+        self.wait_seconds_sum += wait_seconds
+        for index, bound in enumerate(POOL_WAIT_BUCKETS):
+            if wait_seconds <= bound:
+                self._bucket_counts[index] += 1
+                break
+        else:
+            self._bucket_counts[-1] += 1
+
+    def histogram(self) -> dict:
+        """Return cumulative bucket counts keyed by upper bound.
+
+        Returns:
+            dict: Prometheus-style cumulative counts, the last key being "+Inf".
+        """
+        result = {}
+        total = 0
+        for bound, count in zip(POOL_WAIT_BUCKETS + ("+Inf",), self._bucket_counts):
+            total += count
+            result[str(bound)] = total
+        return result
+
+    def as_dict(self) -> dict:
+        """Return the counters as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Checkouts, timeouts, wait time sum and histogram.
+        """
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_sum": round(self.wait_seconds_sum, 6),
+            "wait_seconds_histogram": self.histogram(),
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records checkout wait times and timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.observe(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # Keep counting across engine.dispose() / invalidation
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def pool_options(url: str) -> dict:
+    """Build connection pool arguments for ``create_async_engine``.
+
+    SQLite engines keep SQLAlchemy's default pool, which is chosen per
+    database type (e.g. ``StaticPool`` for in-memory databases).
+
+    Args:
+        url (str): Database connection URL.
+
+    Returns:
+        dict: Keyword arguments configuring the pool from settings.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def engine_pool_stats(engine: AsyncEngine) -> dict:
+    """Return current connection pool usage of an engine.
+
+    Args:
+        engine (AsyncEngine): The engine to inspect.
+
+    Returns:
+        dict: Pool size, idle (checked in) and checked out connections,
+        overflow, plus checkout counters when the pool is instrumented.
+    """
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.as_dict())
+    return stats
 
 
 class DatabaseSessionManager:
@@ -15,26 +169,82 @@ class DatabaseSessionManager:
 
     This class provides a centralized way to manage database connections
     and sessions using SQLAlchemy's async engine and session maker.
+
+    Writes always go to the primary. Read-only sessions are spread over the
+    configured replicas; a client that has just committed a write keeps
+    reading from the primary for a short window, so it sees its own changes
+    despite replication lag. Stickiness markers are shared between worker
+    processes through ``sticky_store`` and also kept in process, which
+    spares a lookup for clients served by the same worker and covers for
+    the shared store while it is unavailable.
     """
 
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        replica_urls: list[str] | None = None,
+        replica_strategy: str = "round_robin",
+        read_your_writes_seconds: float = 0.0,
+        sticky_store: RedisCache | None = None,
+        **engine_options,
+    ):
         """Initialize the database session manager.
 
         Args:
-            url (str): Database connection URL.
+            url (str): Primary database connection URL.
+            replica_urls (list[str] | None): Read replica connection URLs.
+            replica_strategy (str): "round_robin" or "least_loaded" (fewest
+                checked-out connections) replica selection.
+            read_your_writes_seconds (float): How long a client's reads stay on
+                the primary after it commits.
+            sticky_store (RedisCache | None): Shared store of stickiness
+                markers; without one, stickiness is tracked per process.
+            **engine_options: Extra ``create_async_engine`` arguments, overriding
+                the pool options taken from settings.
+
+        Raises:
+            ValueError: If the replica strategy is unknown.
         """
-        self._engine: AsyncEngine | None = create_async_engine(url)
+        if replica_strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"Unknown replica strategy: {replica_strategy}")
+        self._engine: AsyncEngine | None = create_async_engine(
+            url, **{**pool_options(url), **engine_options}
+        )
+        # Objects stay loaded after commit, so returning them needs no refresh
         self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
+            autoflush=False, autocommit=False, expire_on_commit=False, bind=self._engine
         )
+        self._replica_engines: list[AsyncEngine] = [
+            create_async_engine(
+                replica_url, **{**pool_options(replica_url), **engine_options}
+            )
+            for replica_url in replica_urls or []
+        ]
+        self._replica_session_makers = [
+            async_sessionmaker(
+                autoflush=False, autocommit=False, expire_on_commit=False, bind=engine
+            )
+            for engine in self._replica_engines
+        ]
+        self._replica_strategy = replica_strategy
+        self._replica_counter = itertools.count()
+        self._read_your_writes_seconds = read_your_writes_seconds
+        self.sticky_store = sticky_store
+        # Insertion order is expiry order, since every entry lives as long
+        self._sticky_until: OrderedDict[str, float] = OrderedDict()
 
     @contextlib.asynccontextmanager
-    async def session(self):
+    async def session(self, sticky_key: str | None = None):
         """Create and manage a database session context.
 
         This async context manager ensures proper session lifecycle management,
         including automatic rollback on errors and session cleanup.
 
+        Args:
+            sticky_key (str | None): Client identifier; once the session
+                commits, the client's reads stay on the primary for the
+                read-your-writes window.
+
         Yields:
             AsyncSession: An async database session.
 
@@ -45,6 +255,45 @@ class DatabaseSessionManager:
         if self._session_maker is None:
             raise Exception("Database session is not initialized")
         session = self._session_maker()
+        committed = []
+        if sticky_key is not None and self._replica_session_makers:
+            event.listen(
+                session.sync_session,
+                "after_commit",
+                lambda _: committed.append(True),
+            )
+        try:
+            async with self._managed(session) as session:
+                yield session
+        finally:
+            # Recorded before the response is sent, so the client's next
+            # request already sees the marker
+            if committed:
+                await self.mark_written(sticky_key)
+
+    @contextlib.asynccontextmanager
+    async def read_session(self, sticky_key: str | None = None):
+        """Create a session for read-only queries.
+
+        The session is bound to a replica, unless there are none or the client
+        wrote recently, in which case the primary is used.
+
+        Args:
+            sticky_key (str | None): Client identifier used for read-your-writes.
+
+        Yields:
+            AsyncSession: An async database session.
+        """
+        if not self._replica_session_makers or await self.is_sticky(sticky_key):
+            async with self.session() as session:
+                yield session
+            return
+        session = self._replica_session_makers[self._pick_replica()]()
+        async with self._managed(session) as session:
+            yield session
+
+    @contextlib.asynccontextmanager
+    async def _managed(self, session: AsyncSession):
         try:
             yield session
         except SQLAlchemyError as e:
@@ -53,18 +302,217 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    def _pick_replica(self) -> int:
+        if self._replica_strategy == "least_loaded":
+            return min(
+                range(len(self._replica_engines)),
+                key=lambda index: getattr(
+                    self._replica_engines[index].pool, "checkedout", lambda: 0
+                )(),
+            )
+        return next(self._replica_counter) % len(self._replica_engines)
 
-sessionmanager = DatabaseSessionManager(settings.DB_URL)
+    async def mark_written(self, sticky_key: str) -> None:
+        """Pin a client's reads to the primary for the read-your-writes window.
 
+        Args:
+            sticky_key (str): Client identifier.
+        """
+        seconds = self._read_your_writes_seconds
+        if seconds <= 0:
+            return
+        now = time.monotonic()
+        self._sticky_until.pop(sticky_key, None)
+        self._sticky_until[sticky_key] = now + seconds
+        while len(self._sticky_until) > MAX_STICKY_CLIENTS or (
+            next(iter(self._sticky_until.values())) <= now
+        ):
+            self._sticky_until.popitem(last=False)
+        if self.sticky_store is not None:
+            await self.sticky_store.mark_sticky(sticky_key, seconds)
+
+    async def is_sticky(self, sticky_key: str | None) -> bool:
+        """Check whether a client's reads must go to the primary.
 
-async def get_db():
+        Args:
+            sticky_key (str | None): Client identifier.
+
+        Returns:
+            bool: True if the client committed within the read-your-writes
+            window in any worker process, as far as can be told.
+        """
+        if sticky_key is None:
+            return False
+        until = self._sticky_until.get(sticky_key)
+        if until is not None:
+            if until > time.monotonic():
+                return True
+            self._sticky_until.pop(sticky_key, None)
+        if self.sticky_store is None:
+            return False
+        return bool(await self.sticky_store.is_sticky(sticky_key))
+
+    def is_replica(self, session: AsyncSession) -> bool:
+        """Check whether a session reads from a replica.
+
+        Args:
+            session (AsyncSession): A session from this manager.
+
+        Returns:
+            bool: True if the session is bound to a replica.
+        """
+        return session.bind in self._replica_engines
+
+    def pool_stats(self) -> dict:
+        """Return current connection pool usage of the primary.
+
+        Returns:
+            dict: Pool size, idle (checked in) and checked out connections,
+            overflow, plus checkout counters when the pool is instrumented.
+        """
+        return engine_pool_stats(self._engine)
+
+    def replica_pool_stats(self) -> list[dict]:
+        """Return current connection pool usage of each replica.
+
+        Returns:
+            list[dict]: Statistics in the format of :meth:`pool_stats`, in
+            replica order.
+        """
+        return [engine_pool_stats(engine) for engine in self._replica_engines]
+
+
+sessionmanager = DatabaseSessionManager(
+    settings.DB_URL,
+    replica_urls=[
+        url.strip() for url in settings.DB_REPLICA_URLS.split(",") if url.strip()
+    ],
+    replica_strategy=settings.DB_REPLICA_STRATEGY,
+    read_your_writes_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+    sticky_store=redis_cache,
+)
+
+
+def get_sticky_key(request: Request) -> str | None:
+    """Identify the client of a request for read-your-writes routing.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        str | None: Hash of the Authorization header, or None if absent.
+    """
+    authorization = request.headers.get("Authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+async def get_db(request: Request):
     """Dependency function to get a database session.
 
     This function is typically used as a FastAPI dependency to inject
-    database sessions into route handlers.
+    database sessions into route handlers. The session is bound to the
+    primary; committing it routes the client's reads to the primary for a
+    short while.
+
+    Args:
+        request (Request): The incoming request.
+
+    Yields:
+        AsyncSession: An async database session for use in API endpoints.
+    """
+    async with sessionmanager.session(get_sticky_key(request)) as session:
+        yield session
+
+
+async def get_read_db(request: Request):
+    """Dependency function to get a session for read-only queries.
+
+    The session is bound to a read replica when replicas are configured,
+    except shortly after the same client wrote.
+
+    Args:
+        request (Request): The incoming request.
 
     Yields:
         AsyncSession: An async database session for use in API endpoints.
     """
-    async with sessionmanager.session() as session:
+    async with sessionmanager.read_session(get_sticky_key(request)) as session:
         yield session
+
+
+def get_session_factory():
+    """Dependency providing a factory of standalone database sessions.
+
+    Sessions from :func:`get_db` are closed once the route handler returns,
+    before a streaming response body is sent. Handlers that stream from the
+    database use this factory to open a session that lives as long as the
+    stream.
+
+    Returns:
+        Callable: A no-argument callable returning an async context manager
+        that yields an AsyncSession.
+    """
+    return sessionmanager.session
+
+
+def get_read_session_factory(request: Request):
+    """Dependency providing a factory of standalone read-only sessions.
+
+    Like :func:`get_session_factory`, but sessions are routed as in
+    :func:`get_read_db`.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        Callable: A no-argument callable returning an async context manager
+        that yields an AsyncSession.
+    """
+    sticky_key = get_sticky_key(request)
+    return lambda: sessionmanager.read_session(sticky_key)
+
+
+def release_session(func):
+    """Decorator closing the endpoint's database sessions when it returns.
+
+    Sessions check out a pooled connection on their first query and would
+    hold it until the ``get_db`` dependency exits, which happens only after
+    FastAPI has serialized the response. Closing them as soon as the handler
+    returns gives the connection back to the pool before serialization.
+    Loaded objects stay usable, since sessions don't expire them on commit.
+
+    Apply it below the ``@router`` decorator.
+
+    Args:
+        func (Callable): Async endpoint receiving sessions as keyword arguments.
+
+    Returns:
+        Callable: The wrapped endpoint with the same signature.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            for value in kwargs.values():
+                if isinstance(value, AsyncSession):
+                    await value.close()
+
+    return wrapper
+
+
+def get_dialect_name(session: AsyncSession) -> str | None:
+    """Get the name of the database dialect a session is bound to.
+
+    Args:
+        session (AsyncSession): The session to inspect.
+
+    Returns:
+        str | None: Dialect name such as "postgresql" or "sqlite", or None if
+        the session is not bound to an engine.
+    """
+    bind = getattr(session, "bind", None)
+    return getattr(getattr(bind, "dialect", None), "name", None)
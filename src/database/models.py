@@ -1,10 +1,46 @@
 from datetime import date, datetime
 from typing import Optional
-from sqlalchemy import String, Date, ForeignKey, DateTime, Boolean, func, Enum
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy import (
+    String,
+    Date,
+    SmallInteger,
+    Integer,
+    ForeignKey,
+    DateTime,
+    Boolean,
+    JSON,
+    Text,
+    func,
+    Enum,
+    Index,
+    DDL,
+    event,
+)
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    relationship,
+    validates,
+)
 import enum
 
 
+def birthday_ordinal(birth_date: date) -> int:
+    """Return the day of the year of a birthday in a leap-year calendar.
+
+    Using a fixed leap year makes the value independent of the birth year:
+    February 29 is always day 60 and March 1 is always day 61.
+
+    Args:
+        birth_date (date): Date of birth.
+
+    Returns:
+        int: Day of the year between 1 and 366.
+    """
+    return date(2000, birth_date.month, birth_date.day).timetuple().tm_yday
+
+
 class UserRole(enum.Enum):
     """Enumeration for user roles in the system.
 
@@ -16,6 +52,15 @@ class UserRole(enum.Enum):
     ADMIN = "admin"
 
 
+class EmailStatus(enum.Enum):
+    """Delivery states of a message in the email outbox."""
+
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    DEAD = "dead"
+
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy ORM models.
 
@@ -41,6 +86,8 @@ class User(Base):
         avatar: Optional URL or path to user's avatar image.
         confirmed: Boolean flag indicating if the user's email is confirmed.
         role: User's role in the system (USER or ADMIN).
+        token_version: Version stamped into issued tokens; bumping it makes
+            outstanding refresh tokens invalid.
         contacts: Relationship to the user's contact entries.
     """
 
@@ -54,6 +101,7 @@ class User(Base):
     avatar: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     confirmed: Mapped[bool] = mapped_column(Boolean, default=False)
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.USER)
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     contacts = relationship(
         "Contact", back_populates="user", cascade="all, delete-orphan"
@@ -73,12 +121,38 @@ class Contact(Base):
         email: Contact's email address.
         phone: Contact's phone number.
         birth_date: Contact's date of birth.
+        birth_day_of_year: Birthday as a leap-year day of the year, derived
+            from birth_date, used for indexed birthday lookups.
         additional_data: Optional field for additional contact information.
         user_id: Foreign key linking to the user who owns this contact.
         user: Relationship to the User model who owns this contact.
     """
 
     __tablename__ = "contacts"
+    __table_args__ = (
+        # Serves keyset pagination over (last_name, first_name, id) per user
+        Index(
+            "ix_contacts_user_id_last_name_first_name_id",
+            "user_id",
+            "last_name",
+            "first_name",
+            "id",
+        ),
+        # Serves upcoming-birthday range scans per user
+        Index("ix_contacts_user_id_birth_day_of_year", "user_id", "birth_day_of_year"),
+        # Serves the all-users birthday digest range scan
+        Index("ix_contacts_birth_day_of_year_user_id", "birth_day_of_year", "user_id"),
+        # Trigram indexes serving substring search (see src.repository.search)
+        *(
+            Index(
+                f"ix_contacts_{name}_trgm",
+                name,
+                postgresql_using="gin",
+                postgresql_ops={name: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for name in ("first_name", "last_name", "email")
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     first_name: Mapped[str] = mapped_column(String(50), index=True)
@@ -86,7 +160,88 @@ class Contact(Base):
     email: Mapped[str] = mapped_column(String(100), index=True)
     phone: Mapped[str] = mapped_column(String(50))
     birth_date: Mapped[date] = mapped_column(Date)
+    birth_day_of_year: Mapped[int] = mapped_column(SmallInteger)
     additional_data: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
 
     user = relationship("User", back_populates="contacts")
+
+    @validates("birth_date")
+    def _sync_birth_day_of_year(self, key: str, value: date) -> date:
+        """Keep birth_day_of_year in sync whenever birth_date is assigned."""
+        if value is not None:
+            self.birth_day_of_year = birthday_ordinal(value)
+        return value
+
+
+class EmailOutbox(Base):
+    """Email waiting to be sent by the outbox worker.
+
+    Rows are written in the transaction of the request that asks for the
+    email and drained by ``python -m src.workers.email_outbox``, so the API
+    process does no SMTP I/O and queued mail survives restarts.
+
+    Attributes:
+        id: Primary key identifier for the message.
+        kind: Template of the email, e.g. "verify_email" or "password_reset".
+        recipient: Email address the message is sent to.
+        payload: Template parameters such as the username and host.
+        status: Delivery state of the message.
+        attempts: Number of times a worker claimed the message.
+        next_attempt_at: When the message is due (naive UTC); while it is
+            being sent, when the worker's claim expires.
+        last_error: Error of the last failed attempt.
+        created_at: Timestamp when the message was queued.
+        sent_at: Timestamp when the message was sent.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Serves the worker's scan for due messages
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50))
+    recipient: Mapped[str] = mapped_column(String(100))
+    payload: Mapped[dict] = mapped_column(JSON)
+    status: Mapped[EmailStatus] = mapped_column(
+        Enum(EmailStatus), default=EmailStatus.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+# SQLite has no trigram indexes, so search there goes through an FTS5 table
+# kept in sync with ``contacts`` by triggers.
+for _statement in (
+    """CREATE VIRTUAL TABLE contacts_fts USING fts5(
+        first_name, last_name, email,
+        content='contacts', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER contacts_fts_ai AFTER INSERT ON contacts BEGIN
+        INSERT INTO contacts_fts(rowid, first_name, last_name, email)
+        VALUES (new.id, new.first_name, new.last_name, new.email);
+    END""",
+    """CREATE TRIGGER contacts_fts_ad AFTER DELETE ON contacts BEGIN
+        INSERT INTO contacts_fts(contacts_fts, rowid, first_name, last_name, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+    END""",
+    """CREATE TRIGGER contacts_fts_au AFTER UPDATE ON contacts BEGIN
+        INSERT INTO contacts_fts(contacts_fts, rowid, first_name, last_name, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+        INSERT INTO contacts_fts(rowid, first_name, last_name, email)
+        VALUES (new.id, new.first_name, new.last_name, new.email);
+    END""",
+):
+    event.listen(
+        Contact.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Contact.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS contacts_fts").execute_if(dialect="sqlite"),
+)
@@ -1,9 +1,252 @@
-import json
-import pickle
-from typing import Optional, Any
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
 import redis.asyncio as redis
 from src.conf.config import settings
-from src.database.models import User
+from src.database.circuit_breaker import CircuitBreaker
+from src.database.models import User, UserRole
+import schemas
+
+# Bump when the cached user layout changes; entries of other versions are
+# treated as cache misses, so deploys never read incompatible data.
+USER_CACHE_VERSION = 1
+
+# Fields stored for cached users: the public ``schemas.User`` shape
+USER_CACHE_FIELDS = tuple(schemas.User.model_fields)
+
+# Pub/sub channel announcing usernames evicted from the user cache; an empty
+# message evicts everything
+USER_INVALIDATION_CHANNEL = "user:invalidate"
+
+# Cached users live in the "user" namespace. Keys embed the namespace epoch,
+# "user:<epoch>:<username>", so bumping the epoch stored under "epoch:user"
+# invalidates every user at once; the abandoned keys expire on their own.
+# Workers keep the epoch in memory while subscribed to the invalidation
+# channel, on which every bump is announced.
+USER_NAMESPACE = "user"
+
+# Keys examined per SCAN call and unlinked per pipeline when purging
+PURGE_BATCH_SIZE = 500
+
+# Deletes a lock only if it still holds the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+# Revoked token ids are stored under "revoked:<jti>" until the token expires
+# and appended to a sorted set scored by revocation time in milliseconds,
+# which workers read incrementally to mirror the revoked set
+REVOKED_TOKENS_LOG = "revoked:log"
+
+# Revokes a token id (ARGV[1]) for ARGV[2] seconds and logs it, dropping log
+# entries older than ARGV[3] seconds; Redis time keeps scores consistent
+# across workers. Returns 0 if the token id was already revoked, so exactly
+# one caller can claim it
+REVOKE_TOKEN_SCRIPT = """
+if not redis.call("SET", KEYS[1], "1", "NX", "EX", ARGV[2]) then
+    return 0
+end
+local now = redis.call("TIME")
+local score = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+redis.call("ZADD", KEYS[2], score, ARGV[1])
+redis.call("ZREMRANGEBYSCORE", KEYS[2], "-inf", score - tonumber(ARGV[3]) * 1000)
+return score
+"""
+
+# Token bucket in GCRA form: KEYS[1] holds the theoretical arrival time
+# (TAT) in milliseconds; a request is admitted if the bucket of ARGV[2]
+# tokens, refilled one token per ARGV[1] ms, has a token left. Returns
+# {allowed, retry after ms, remaining tokens}.
+RATE_LIMIT_SCRIPT = """
+local now = redis.call("TIME")
+now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local tat = math.max(tonumber(redis.call("GET", KEYS[1]) or now), now)
+local new_tat = tat + interval
+local allow_at = new_tat - burst * interval
+if allow_at > now then
+    return {0, allow_at - now, 0}
+end
+local ttl = math.ceil(new_tat - now)
+redis.call("SET", KEYS[1], string.format("%.3f", new_tat), "PX", ttl)
+return {1, 0, math.floor((now - allow_at) / interval)}
+"""
+
+# Delay before resubscribing after the invalidation listener lost Redis
+INVALIDATION_RETRY_SECONDS = 1.0
+# Longest wait for an invalidation message per read; must not exceed the
+# socket timeout, which would otherwise drop the subscription
+INVALIDATION_POLL_SECONDS = 1.0
+
+
+class LocalTTLCache:
+    """Bounded in-process LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        """Initialize an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of entries; the least recently used
+                entry is evicted beyond it.
+            ttl (float): Default entry lifetime in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        """Return a live entry and mark it as recently used.
+
+        Args:
+            key (str): Entry key.
+
+        Returns:
+            Any: The cached value, or None if missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key (str): Entry key.
+            value (Any): Value to cache.
+            ttl (Optional[float]): Lifetime in seconds, capped by the default.
+        """
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        """Remove an entry if present.
+
+        Args:
+            key (str): Entry key.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def encode_user(user: User) -> bytes:
+    """Serialize the cacheable fields of a user.
+
+    Args:
+        user (User): The user to serialize.
+
+    Returns:
+        bytes: JSON object with the ``USER_CACHE_FIELDS`` and version "v".
+    """
+    data = {name: getattr(user, name) for name in USER_CACHE_FIELDS}
+    data["v"] = USER_CACHE_VERSION
+    return orjson.dumps(data)
+
+
+def decode_user_fields(payload: bytes) -> Optional[dict]:
+    """Parse :func:`encode_user` output into user fields.
+
+    Args:
+        payload (bytes): Cached bytes.
+
+    Returns:
+        Optional[dict]: The ``USER_CACHE_FIELDS`` values, or None if the
+        payload has another version or can't be decoded.
+    """
+    try:
+        data = orjson.loads(payload)
+        if not isinstance(data, dict) or data.get("v") != USER_CACHE_VERSION:
+            return None
+        fields = {name: data[name] for name in USER_CACHE_FIELDS}
+        fields["role"] = UserRole(fields["role"])
+    except (KeyError, ValueError):
+        return None
+    return fields
+
+
+def user_from_fields(fields: dict) -> User:
+    """Build a transient ``User`` holding the given cached fields.
+
+    The instance is not attached to a session, and every call returns a new
+    one, so callers can't alter cached state.
+
+    Args:
+        fields (dict): Values of the ``USER_CACHE_FIELDS``.
+
+    Returns:
+        User: The rebuilt user.
+    """
+    # Populate the instance the way the ORM does for loaded rows, skipping the
+    # change tracking of the constructor
+    user = User.__mapper__.class_manager.new_instance()
+    user.__dict__.update(fields)
+    return user
+
+
+def decode_user(payload: bytes) -> Optional[User]:
+    """Rebuild a user from :func:`encode_user` output.
+
+    Args:
+        payload (bytes): Cached bytes.
+
+    Returns:
+        Optional[User]: A transient user, or None if the payload has another
+        version or can't be decoded.
+    """
+    fields = decode_user_fields(payload)
+    return None if fields is None else user_from_fields(fields)
+
+
+def epoch_key(namespace: str) -> str:
+    """Return the key holding the current epoch of a namespace.
+
+    Args:
+        namespace (str): Key namespace, e.g. ``USER_NAMESPACE``.
+
+    Returns:
+        str: Key of the epoch counter, outside the namespace itself.
+    """
+    return f"epoch:{namespace}"
+
+
+def contacts_key(user_id: int, suffix: str) -> str:
+    """Return a key of a user's cached contact results.
+
+    The user id is a hash tag, so all of a user's keys share a cluster slot
+    and can be read in one ``MGET``.
+
+    Args:
+        user_id (int): Owner of the contacts.
+        suffix (str): ``gen``, ``written`` or ``<generation>:<query hash>``.
+
+    Returns:
+        str: Key ``contacts:{<user_id>}:<suffix>``.
+    """
+    return f"contacts:{{{user_id}}}:{suffix}"
 
 
 class RedisCache:
@@ -11,6 +254,15 @@ class RedisCache:
 
     This class provides methods to cache, retrieve, and manage user data
     in Redis for improved application performance and session handling.
+
+    Users are also kept in a small in-process LRU tier, so most lookups need
+    no Redis round trip. The tier is only used while
+    :meth:`listen_invalidations` is subscribed to the invalidation channel,
+    through which :meth:`delete_user` evicts users on every worker.
+
+    Redis calls go through a circuit breaker: after repeated failures they
+    are skipped for a cool-down period and the methods return their
+    fallback values immediately, instead of waiting for socket timeouts.
     """
 
     def __init__(self):
@@ -19,8 +271,12 @@ class RedisCache:
         Creates a Redis client instance using either REDIS_URL or individual
         connection parameters from the application settings.
         """
+        timeouts = {
+            "socket_connect_timeout": settings.REDIS_CONNECT_TIMEOUT,
+            "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        }
         if settings.REDIS_URL:
-            self.redis = redis.from_url(settings.REDIS_URL)
+            self.redis = redis.from_url(settings.REDIS_URL, **timeouts)
         else:
             self.redis = redis.Redis(
                 host=settings.REDIS_HOST,
@@ -28,12 +284,62 @@ class RedisCache:
                 password=settings.REDIS_PASSWORD,
                 db=settings.REDIS_DB,
                 decode_responses=False,
+                **timeouts,
             )
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.REDIS_BREAKER_RESET_SECONDS,
+            half_open_max_calls=settings.REDIS_BREAKER_HALF_OPEN_CALLS,
+            probe_timeout=settings.REDIS_BREAKER_RESET_SECONDS,
+        )
+        self.local = LocalTTLCache(
+            settings.USER_CACHE_LOCAL_SIZE, settings.USER_CACHE_LOCAL_TTL
+        )
+        # Loaded once and then called with EVALSHA
+        self.release_lock_script = self.redis.register_script(RELEASE_LOCK_SCRIPT)
+        self.revoke_token_script = self.redis.register_script(REVOKE_TOKEN_SCRIPT)
+        self.rate_limit_script = self.redis.register_script(RATE_LIMIT_SCRIPT)
+        self.local_enabled = False
+        # Epoch of the user namespace, kept only while subscribed
+        self._user_epoch: Optional[int] = None
+        # Invalidation messages applied; a read that sees this change may
+        # have fetched data from before the invalidation
+        self._invalidations = 0
+
+    async def _call(
+        self, operation: str, fn: Callable[[], Awaitable[Any]], fallback: Any = None
+    ) -> Any:
+        """Run a Redis call through the circuit breaker.
+
+        Args:
+            operation (str): Operation name used in error messages.
+            fn (Callable[[], Awaitable[Any]]): Function making the Redis call.
+            fallback (Any): Value returned if the call fails or is skipped.
+
+        Returns:
+            Any: The call's result, or ``fallback``.
+        """
+        if not self.breaker.allow():
+            return fallback
+        try:
+            result = await fn()
+        except Exception as e:
+            self.breaker.record_failure()
+            print(f"Redis {operation} error: {e}")
+            return fallback
+        except BaseException:
+            # Cancelled before an outcome; don't hold a half-open probe slot
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
 
     async def get_user(self, username: str) -> Optional[User]:
         """Get user from cache.
 
-        Retrieves a cached user object from Redis using the username as key.
+        Retrieves a cached user object from the in-process tier or from Redis
+        using the username as key. Entries in an unknown format are treated
+        as missing.
 
         Args:
             username (str): The username to look up in cache.
@@ -41,20 +347,31 @@ class RedisCache:
         Returns:
             Optional[User]: The cached User object if found, None otherwise.
         """
-        try:
-            cached_user = await self.redis.get(f"user:{username}")
-            if cached_user:
-                user_data = pickle.loads(cached_user)
-                return user_data
+        if self.local_enabled:
+            fields = self.local.get(username)
+            if fields is not None:
+                return user_from_fields(fields)
+
+        async def get():
+            return await self.redis.get(await self._user_key(username))
+
+        seen = self._invalidations
+        cached_user = await self._call("get", get)
+        if not cached_user:
             return None
-        except Exception as e:
-            print(f"Redis get error: {e}")
+        fields = decode_user_fields(cached_user)
+        if fields is None:
             return None
+        # Skipped if an invalidation arrived while the value was in flight
+        if self.local_enabled and self._invalidations == seen:
+            self.local.set(username, fields)
+        return user_from_fields(fields)
 
     async def set_user(self, username: str, user: User, expire: int = 3600) -> bool:
         """Cache user data.
 
-        Stores a user object in Redis cache with an optional expiration time.
+        Stores the public fields of a user (see ``schemas.User``) in Redis
+        cache with an optional expiration time.
 
         Args:
             username (str): The username to use as cache key.
@@ -64,18 +381,26 @@ class RedisCache:
         Returns:
             bool: True if caching was successful, False otherwise.
         """
-        try:
-            user_data = pickle.dumps(user)
-            await self.redis.setex(f"user:{username}", expire, user_data)
-            return True
-        except Exception as e:
-            print(f"Redis set error: {e}")
-            return False
+        user_data = encode_user(user)
+
+        async def store():
+            key = await self._user_key(username)
+            return await self.redis.setex(key, expire, user_data)
+
+        stored = await self._call("set", store, fallback=False)
+        if stored and self.local_enabled:
+            self.local.set(
+                username,
+                {name: getattr(user, name) for name in USER_CACHE_FIELDS},
+                ttl=expire,
+            )
+        return bool(stored)
 
     async def delete_user(self, username: str) -> bool:
         """Remove user from cache.
 
-        Deletes a user's cached data from Redis.
+        Deletes a user's cached data from Redis and announces the deletion
+        on the invalidation channel, so every worker drops its local copy.
 
         Args:
             username (str): The username whose cache entry should be deleted.
@@ -83,44 +408,445 @@ class RedisCache:
         Returns:
             bool: True if deletion was successful, False otherwise.
         """
-        try:
-            await self.redis.delete(f"user:{username}")
-            return True
-        except Exception as e:
-            print(f"Redis delete error: {e}")
-            return False
+        self.local.pop(username)
+
+        async def delete():
+            key = await self._user_key(username)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.unlink(key)
+                pipe.publish(USER_INVALIDATION_CHANNEL, username)
+                return (await pipe.execute())[0]
+
+        deleted = await self._call("delete", delete)
+        return deleted is not None
+
+    async def _user_key(self, username: str) -> str:
+        epoch = self._user_epoch if self.local_enabled else None
+        if epoch is None:
+            seen = self._invalidations
+            epoch = int(await self.redis.get(epoch_key(USER_NAMESPACE)) or 0)
+            if self.local_enabled and self._invalidations == seen:
+                self._user_epoch = epoch
+        return f"{USER_NAMESPACE}:{epoch}:{username}"
 
     async def clear_all_users(self) -> bool:
         """Clear all cached users (useful for testing or cleanup).
 
-        Removes all user cache entries from Redis by deleting all keys
-        that match the "user:*" pattern.
+        Bumps the epoch of the user namespace, which makes every cached user
+        unreachable in O(1), and tells all workers to drop their local
+        copies. The old entries expire on their own; :meth:`purge_stale_keys`
+        reclaims their memory earlier.
 
         Returns:
             bool: True if clearing was successful, False otherwise.
         """
-        try:
-            keys = await self.redis.keys("user:*")
-            if keys:
-                await self.redis.delete(*keys)
+        self.handle_invalidation(b"")
+
+        async def clear():
+            await self.redis.incr(epoch_key(USER_NAMESPACE))
+            await self.redis.publish(USER_INVALIDATION_CHANNEL, "")
             return True
-        except Exception as e:
-            print(f"Redis clear error: {e}")
-            return False
+
+        return await self._call("clear", clear, fallback=False)
+
+    async def purge_stale_keys(
+        self, namespace: str = USER_NAMESPACE, batch_size: int = PURGE_BATCH_SIZE
+    ) -> int:
+        """Delete the keys of a namespace left behind by earlier epochs.
+
+        Walks the namespace incrementally with ``SCAN`` and unlinks stale
+        keys in pipelined batches, so Redis is never blocked for long.
+
+        Args:
+            namespace (str): Namespace to purge. Defaults to cached users.
+            batch_size (int): ``SCAN`` count hint and keys unlinked per batch.
+
+        Returns:
+            int: Number of keys unlinked.
+        """
+
+        async def purge():
+            epoch = await self.redis.get(epoch_key(namespace))
+            current = f"{namespace}:{int(epoch or 0)}:".encode()
+            prefix = f"{namespace}:".encode()
+            purged = 0
+            stale = []
+            async for key in self.redis.scan_iter(
+                match=f"{namespace}:*", count=batch_size
+            ):
+                if isinstance(key, str):
+                    key = key.encode()
+                if key.startswith(prefix) and not key.startswith(current):
+                    stale.append(key)
+                if len(stale) >= batch_size:
+                    purged += await self._unlink(stale)
+                    stale = []
+            if stale:
+                purged += await self._unlink(stale)
+            return purged
+
+        return await self._call("purge", purge, fallback=0)
+
+    async def _unlink(self, keys: list) -> int:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.unlink(key)
+            results = await pipe.execute()
+        return sum(results)
+
+    async def acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        """Try to take a short-lived lock shared by all workers.
+
+        The lock expires by itself after ``ttl``, so a crashed holder can't
+        keep it. If Redis is unavailable the lock is reported as taken by
+        the caller, so work proceeds without coordination.
+
+        Args:
+            name (str): Lock name.
+            ttl (float): Lock lifetime in seconds.
+
+        Returns:
+            Optional[str]: Token to pass to :meth:`release_lock`, or None if
+            another holder has the lock.
+        """
+        token = secrets.token_hex(16)
+        acquired = await self._call(
+            "lock",
+            lambda: self.redis.set(f"lock:{name}", token, nx=True, px=int(ttl * 1000)),
+            fallback=True,
+        )
+        return token if acquired else None
+
+    async def release_lock(self, name: str, token: str) -> bool:
+        """Release a lock taken with :meth:`acquire_lock`.
+
+        The lock is left alone if it expired and was taken by someone else.
+
+        Args:
+            name (str): Lock name.
+            token (str): Token returned by :meth:`acquire_lock`.
+
+        Returns:
+            bool: True if the lock was released, False otherwise.
+        """
+        released = await self._call(
+            "unlock",
+            lambda: self.release_lock_script(
+                keys=[f"lock:{name}"], args=[token], client=self.redis
+            ),
+            fallback=0,
+        )
+        return bool(released)
+
+    async def get_contacts_result(
+        self, user_id: int, query_hash: str
+    ) -> tuple[Optional[int], Optional[bytes], bool]:
+        """Get a cached contact query result for the current generation.
+
+        Args:
+            user_id (int): Owner of the contacts.
+            query_hash (str): Hash identifying the query and its parameters.
+
+        Returns:
+            tuple[Optional[int], Optional[bytes], bool]: The user's current
+            generation (None if Redis is unavailable), the cached result
+            (None on a miss) and whether the generation was bumped within
+            the window given to :meth:`bump_contacts_generation`.
+        """
+
+        async def get():
+            generation, written = await self.redis.mget(
+                contacts_key(user_id, "gen"), contacts_key(user_id, "written")
+            )
+            generation = int(generation or 0)
+            payload = await self.redis.get(
+                contacts_key(user_id, f"{generation}:{query_hash}")
+            )
+            return generation, payload, written is not None
+
+        return await self._call("get contacts", get, fallback=(None, None, False))
+
+    async def set_contacts_result(
+        self,
+        user_id: int,
+        generation: int,
+        query_hash: str,
+        payload: bytes,
+        expire: int = 300,
+    ) -> bool:
+        """Cache a contact query result under the generation it was read at.
+
+        Args:
+            user_id (int): Owner of the contacts.
+            generation (int): Generation returned by :meth:`get_contacts_result`.
+            query_hash (str): Hash identifying the query and its parameters.
+            payload (bytes): Serialized result.
+            expire (int, optional): Expiration time in seconds. Defaults to 300.
+
+        Returns:
+            bool: True if caching was successful, False otherwise.
+        """
+        stored = await self._call(
+            "set contacts",
+            lambda: self.redis.setex(
+                contacts_key(user_id, f"{generation}:{query_hash}"), expire, payload
+            ),
+            fallback=False,
+        )
+        return bool(stored)
+
+    async def bump_contacts_generation(
+        self,
+        user_id: int,
+        written_seconds: float = settings.DB_READ_YOUR_WRITES_SECONDS,
+    ) -> bool:
+        """Make all cached contact results of a user stale.
+
+        Results are keyed by the generation, so incrementing it stops them
+        from being read; they expire on their own. For ``written_seconds``
+        afterwards :meth:`get_contacts_result` reports the write as recent,
+        while replicas may still lag behind it.
+
+        Args:
+            user_id (int): Owner of the contacts.
+            written_seconds (float): How long the write counts as recent.
+
+        Returns:
+            bool: True if the generation was bumped, False otherwise.
+        """
+
+        async def bump():
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.incr(contacts_key(user_id, "gen"))
+                if written_seconds > 0:
+                    pipe.set(
+                        contacts_key(user_id, "written"),
+                        1,
+                        px=max(1, int(written_seconds * 1000)),
+                    )
+                results = await pipe.execute()
+            return results[0]
+
+        bumped = await self._call("bump contacts", bump, fallback=False)
+        return bool(bumped)
+
+    async def revoke_token(
+        self, jti: str, expire: int, retention: int
+    ) -> Optional[bool]:
+        """Record a revoked token id.
+
+        Revoking is atomic: of several concurrent calls for the same id,
+        only one gets True.
+
+        Args:
+            jti (str): Token id.
+            expire (int): Seconds until the token expires.
+            retention (int): Seconds revocations stay in the log; at least
+                the longest token lifetime.
+
+        Returns:
+            Optional[bool]: True if the token id was revoked by this call,
+            False if it was already revoked, or None if Redis is unavailable.
+        """
+        stored = await self._call(
+            "revoke",
+            lambda: self.revoke_token_script(
+                keys=[f"revoked:{jti}", REVOKED_TOKENS_LOG],
+                args=[jti, expire, retention],
+                client=self.redis,
+            ),
+            fallback=None,
+        )
+        return None if stored is None else bool(stored)
+
+    async def is_token_revoked(self, jti: str) -> Optional[bool]:
+        """Check whether a token id was revoked.
+
+        Args:
+            jti (str): Token id.
+
+        Returns:
+            Optional[bool]: Whether the token was revoked, or None if Redis
+            is unavailable.
+        """
+        exists = await self._call(
+            "is revoked", lambda: self.redis.exists(f"revoked:{jti}")
+        )
+        return None if exists is None else bool(exists)
+
+    async def get_revoked_tokens(
+        self, since: int = 0
+    ) -> Optional[list[tuple[str, int]]]:
+        """Read revocations logged at or after a point in time.
+
+        Args:
+            since (int): Revocation time in milliseconds to start from.
+
+        Returns:
+            Optional[list[tuple[str, int]]]: Token ids with their revocation
+            times in milliseconds, oldest first, or None if Redis is
+            unavailable.
+        """
+        entries = await self._call(
+            "revocation log",
+            lambda: self.redis.zrangebyscore(
+                REVOKED_TOKENS_LOG, since, "+inf", withscores=True
+            ),
+        )
+        if entries is None:
+            return None
+        return [
+            (jti.decode() if isinstance(jti, bytes) else jti, int(score))
+            for jti, score in entries
+        ]
+
+    async def rate_limit(
+        self, key: str, limit: int, period: float
+    ) -> Optional[tuple[bool, float, int]]:
+        """Take a token from a rate limit bucket shared by all workers.
+
+        Args:
+            key (str): Bucket key, e.g. ``ratelimit:<policy>:<client>``.
+            limit (int): Bucket size: requests allowed per ``period``.
+            period (float): Seconds in which a full bucket refills.
+
+        Returns:
+            Optional[tuple[bool, float, int]]: Whether the request is
+            allowed, seconds until it would be, and the tokens left; None if
+            Redis is unavailable.
+        """
+        reply = await self._call(
+            "rate limit",
+            lambda: self.rate_limit_script(
+                keys=[key], args=[period * 1000 / limit, limit], client=self.redis
+            ),
+        )
+        if reply is None:
+            return None
+        allowed, retry_after, remaining = reply
+        return bool(allowed), int(retry_after) / 1000, int(remaining)
+
+    async def claim_once(self, key: str, expire: int) -> Optional[bool]:
+        """Claim a key for a while unless someone already has (SET NX EX).
+
+        Args:
+            key (str): Key to claim.
+            expire (int): Seconds the claim lasts.
+
+        Returns:
+            Optional[bool]: True if the key was claimed now, False if it was
+            already claimed, None if Redis is unavailable.
+        """
+
+        async def claim():
+            return bool(await self.redis.set(key, 1, nx=True, ex=expire))
+
+        return await self._call("claim", claim)
+
+    async def release_claim(self, key: str) -> bool:
+        """Release a key claimed with :meth:`claim_once` early.
+
+        Args:
+            key (str): Claimed key.
+
+        Returns:
+            bool: True if the claim was released, False otherwise.
+        """
+        deleted = await self._call(
+            "release claim", lambda: self.redis.delete(key), fallback=0
+        )
+        return bool(deleted)
+
+    async def mark_sticky(self, sticky_key: str, seconds: float) -> bool:
+        """Record that a client wrote, for read-your-writes routing.
+
+        Args:
+            sticky_key (str): Client identifier.
+            seconds (float): How long the client's reads stay on the primary.
+
+        Returns:
+            bool: True if the marker was stored, False otherwise.
+        """
+        stored = await self._call(
+            "sticky mark",
+            lambda: self.redis.set(
+                f"sticky:{sticky_key}", 1, px=max(1, int(seconds * 1000))
+            ),
+        )
+        return bool(stored)
+
+    async def is_sticky(self, sticky_key: str) -> Optional[bool]:
+        """Check whether a client wrote within its read-your-writes window.
+
+        Args:
+            sticky_key (str): Client identifier.
+
+        Returns:
+            Optional[bool]: Whether the client's marker is live, or None if
+            Redis is unavailable.
+        """
+        exists = await self._call(
+            "sticky check", lambda: self.redis.exists(f"sticky:{sticky_key}")
+        )
+        return None if exists is None else bool(exists)
+
+    def handle_invalidation(self, username: bytes) -> None:
+        """Apply a message received on the invalidation channel.
+
+        Args:
+            username (bytes): Username to evict; empty to evict all users
+                after the epoch was bumped.
+        """
+        self._invalidations += 1
+        if username:
+            self.local.pop(username.decode())
+        else:
+            self.local.clear()
+            self._user_epoch = None
+
+    async def listen_invalidations(self) -> None:
+        """Keep the in-process tier consistent with other workers.
+
+        Subscribes to the invalidation channel and evicts announced users
+        until cancelled. The in-process tier is enabled only while
+        subscribed; when the connection drops it is cleared and disabled
+        (lookups go to Redis), and the subscription is retried.
+        """
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(USER_INVALIDATION_CHANNEL)
+                # Messages sent before subscribing were missed
+                self.handle_invalidation(b"")
+                self.local_enabled = True
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=INVALIDATION_POLL_SECONDS,
+                    )
+                    if message is not None and message["type"] == "message":
+                        self.handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Redis invalidation listener error: {e}")
+            finally:
+                self.local_enabled = False
+                self.handle_invalidation(b"")
+                await pubsub.aclose()
+            await asyncio.sleep(INVALIDATION_RETRY_SECONDS)
 
     async def ping(self) -> bool:
         """Check if Redis is accessible.
 
-        Tests the Redis connection by sending a ping command.
+        Tests the Redis connection by sending a ping command. While the
+        circuit breaker is open, Redis is reported as inaccessible without
+        sending it.
 
         Returns:
             bool: True if Redis is accessible and responding, False otherwise.
         """
-        try:
-            return await self.redis.ping()
-        except Exception as e:
-            print(f"Redis ping error: {e}")
-            return False
+        return bool(await self._call("ping", self.redis.ping, fallback=False))
 
     async def close(self):
         """Close Redis connection.
@@ -1,13 +1,108 @@
-from typing import List, Optional
+import base64
+import calendar
+import json
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select, or_, extract, and_
+from sqlalchemy import Row, select, insert, update, delete, or_, case, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.models import Contact, User
+from src.database.db import get_dialect_name
+from src.database.models import Contact, User, birthday_ordinal
+from src.repository.search import get_contact_search
 from schemas import ContactCreate, ContactUpdate, ContactResponse
 from datetime import date, timedelta
 
 
+def birthday_window(start: date, days: int) -> Optional[Tuple[int, int]]:
+    """Translate a window of dates into a range of birthday ordinals.
+
+    Ordinals come from :func:`~src.database.models.birthday_ordinal`. The
+    returned range is inclusive and wraps around the end of the year when
+    ``first > last``. In common years a window ending on February 28 also
+    covers February 29 birthdays, so they are never skipped.
+
+    Args:
+        start (date): First day of the window.
+        days (int): Number of days in the window, ``start`` included.
+
+    Returns:
+        Optional[Tuple[int, int]]: ``(first, last)`` ordinals, or None if the
+        window covers the whole year.
+    """
+    if days >= 366:
+        return None
+    end = start + timedelta(days=days - 1)
+    first = birthday_ordinal(start)
+    last = birthday_ordinal(end)
+    if (end.month, end.day) == (2, 28) and not calendar.isleap(end.year):
+        last = birthday_ordinal(date(2000, 2, 29))
+    return first, last
+
+
+def encode_contact_cursor(contact: Contact) -> str:
+    """Build an opaque pagination cursor pointing just after a contact.
+
+    The cursor captures the contact's position in the stable
+    ``(user_id, last_name, first_name, id)`` ordering.
+
+    Args:
+        contact (Contact): The last contact of the current page.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    raw = json.dumps(
+        [contact.user_id, contact.last_name, contact.first_name, contact.id],
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_contact_cursor(cursor: str) -> Tuple[int, str, str, int]:
+    """Decode a cursor produced by :func:`encode_contact_cursor`.
+
+    Args:
+        cursor (str): The opaque cursor string.
+
+    Returns:
+        Tuple[int, str, str, int]: ``(user_id, last_name, first_name, id)``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        user_id, last_name, first_name, contact_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode("ascii"))
+        )
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not (
+        isinstance(user_id, int)
+        and isinstance(last_name, str)
+        and isinstance(first_name, str)
+        and isinstance(contact_id, int)
+    ):
+        raise ValueError("Invalid cursor")
+    return user_id, last_name, first_name, contact_id
+
+
+def next_page_cursor(contacts: Sequence[Contact], limit: int) -> Optional[str]:
+    """Return the cursor for the page following ``contacts``.
+
+    Args:
+        contacts (Sequence[Contact]): Contacts of the current page in keyset order.
+        limit (int): Requested page size.
+
+    Returns:
+        Optional[str]: Cursor for the next page, or None if this page is the last one.
+    """
+    if limit <= 0 or len(contacts) < limit:
+        return None
+    return encode_contact_cursor(contacts[-1])
+
+
 class ContactRepository:
     """Repository class for contact database operations.
 
@@ -38,23 +133,106 @@ class ContactRepository:
             search (Optional[str]): Search term to filter by name or email.
 
         Returns:
-            List[Contact]: List of contacts matching the criteria.
+            List[Contact]: List of contacts matching the criteria, best
+            search matches first when the database supports ranking.
         """
         stmt = select(Contact).filter_by(user_id=user.id)
+        order = list(self._keyset_order())
 
         if search:
-            search_filter = or_(
-                Contact.first_name.like(f"%{search}%"),
-                Contact.last_name.like(f"%{search}%"),
-                Contact.email.like(f"%{search}%"),
-            )
-            stmt = stmt.where(search_filter)
+            engine = get_contact_search(self.db)
+            stmt = engine.apply(stmt, search)
+            rank = engine.rank(search)
+            if rank is not None:
+                order.insert(0, rank)
 
-        stmt = stmt.offset(skip).limit(limit)
+        stmt = stmt.order_by(*order).offset(skip).limit(limit)
 
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_contacts_page(
+        self,
+        limit: int,
+        user: User,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Contact], Optional[str]]:
+        """Retrieve a page of contacts using keyset (cursor) pagination.
+
+        Unlike offset pagination, the cost of a page does not depend on how
+        deep it is: the query seeks directly into the
+        ``(user_id, last_name, first_name, id)`` index.
+
+        Args:
+            limit (int): Maximum number of records to return.
+            user (User): The user whose contacts to retrieve.
+            search (Optional[str]): Search term to filter by name or email.
+            cursor (Optional[str]): Cursor returned with the previous page,
+                or None/empty for the first page.
+
+        Returns:
+            Tuple[List[Contact], Optional[str]]: The page of contacts and the
+            cursor for the next page (None if there are no more contacts).
+
+        Raises:
+            ValueError: If the cursor is malformed or belongs to another user.
+        """
+        if limit <= 0:
+            return [], None
+
+        stmt = select(Contact).filter_by(user_id=user.id)
+
+        if cursor:
+            user_id, last_name, first_name, contact_id = decode_contact_cursor(cursor)
+            if user_id != user.id:
+                raise ValueError("Invalid cursor")
+            stmt = stmt.where(
+                tuple_(Contact.last_name, Contact.first_name, Contact.id)
+                > tuple_(last_name, first_name, contact_id)
+            )
+
+        if search:
+            stmt = get_contact_search(self.db).apply(stmt, search)
+
+        stmt = stmt.order_by(*self._keyset_order()).limit(limit)
+
+        result = await self.db.execute(stmt)
+        contacts = list(result.scalars().all())
+        return contacts, next_page_cursor(contacts, limit)
+
+    async def stream_contacts(
+        self, user: User, batch_size: int = 1000
+    ) -> AsyncIterator[List[Contact]]:
+        """Stream all contacts of a user in batches over a server-side cursor.
+
+        Only one batch of ORM objects is held in memory at a time, and each
+        batch is expunged from the session once the caller is done with it.
+
+        Args:
+            user (User): The user whose contacts to stream.
+            batch_size (int): Number of rows fetched per batch.
+
+        Yields:
+            List[Contact]: Consecutive batches of contacts in keyset order.
+        """
+        stmt = (
+            select(Contact)
+            .filter_by(user_id=user.id)
+            .order_by(*self._keyset_order())
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream_scalars(stmt)
+        async for batch in result.partitions():
+            yield batch
+            for contact in batch:
+                self.db.expunge(contact)
+
+    @staticmethod
+    def _keyset_order():
+        """Return the stable ordering used by both pagination modes."""
+        return Contact.last_name, Contact.first_name, Contact.id
+
     async def get_contact_by_id(self, contact_id: int, user: User) -> Contact | None:
         """Retrieve a specific contact by ID for a user.
 
@@ -72,6 +250,9 @@ class ContactRepository:
     async def create_contact(self, body: ContactCreate, user: User) -> Contact:
         """Create a new contact for a user.
 
+        Issues a single ``INSERT ... RETURNING`` statement, so the generated
+        ID comes back without a separate refresh.
+
         Args:
             body (ContactCreate): Contact data to create.
             user (User): The user who will own the contact.
@@ -79,17 +260,63 @@ class ContactRepository:
         Returns:
             Contact: The created contact object with assigned ID.
         """
-        contact = Contact(**body.model_dump(exclude_unset=True), user_id=user.id)
-        self.db.add(contact)
+        values = body.model_dump(exclude_unset=True)
+        values["birth_day_of_year"] = birthday_ordinal(body.birth_date)
+        stmt = insert(Contact).values(**values, user_id=user.id).returning(Contact)
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one()
         await self.db.commit()
-        await self.db.refresh(contact)
         return contact
 
+    async def bulk_create_contacts(self, rows: List[ContactCreate], user: User) -> int:
+        """Insert many contacts for a user in one batch and commit.
+
+        On PostgreSQL the rows are streamed with asyncpg's binary ``COPY``.
+        Other databases use an executemany ``INSERT``, which SQLAlchemy
+        batches into multi-row statements (insertmanyvalues).
+
+        Args:
+            rows (List[ContactCreate]): Validated contacts to create.
+            user (User): The user who will own the contacts.
+
+        Returns:
+            int: Number of contacts inserted.
+        """
+        if not rows:
+            return 0
+
+        records = [
+            {
+                **row.model_dump(),
+                "birth_day_of_year": birthday_ordinal(row.birth_date),
+                "user_id": user.id,
+            }
+            for row in rows
+        ]
+
+        if get_dialect_name(self.db) == "postgresql":
+            columns = list(records[0])
+            connection = await self.db.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                Contact.__tablename__,
+                records=[tuple(record[c] for c in columns) for record in records],
+                columns=columns,
+            )
+        else:
+            await self.db.execute(insert(Contact), records)
+
+        await self.db.commit()
+        return len(records)
+
     async def update_contact(
         self, contact_id: int, body: ContactUpdate, user: User
     ) -> Contact | None:
         """Update an existing contact for a user.
 
+        Issues a single ``UPDATE ... WHERE id AND user_id RETURNING``
+        statement instead of loading the contact first.
+
         Args:
             contact_id (int): The unique identifier of the contact to update.
             body (ContactUpdate): Partial contact data to update.
@@ -98,30 +325,33 @@ class ContactRepository:
         Returns:
             Contact | None: The updated contact if found and belongs to user, None otherwise.
         """
-        contact = await self.get_contact_by_id(contact_id, user)
+        values = body.model_dump(exclude_unset=True, exclude_none=True)
+        if not values:
+            return await self.get_contact_by_id(contact_id, user)
+        if "birth_date" in values:
+            values["birth_day_of_year"] = birthday_ordinal(values["birth_date"])
 
-        if contact:
-            if body.first_name is not None:
-                contact.first_name = body.first_name
-            if body.last_name is not None:
-                contact.last_name = body.last_name
-            if body.email is not None:
-                contact.email = body.email
-            if body.phone is not None:
-                contact.phone = body.phone
-            if body.birth_date is not None:
-                contact.birth_date = body.birth_date
-            if body.additional_data is not None:
-                contact.additional_data = body.additional_data
+        stmt = (
+            update(Contact)
+            .where(Contact.id == contact_id, Contact.user_id == user.id)
+            .values(**values)
+            .returning(Contact)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one_or_none()
 
+        if contact:
             await self.db.commit()
-            await self.db.refresh(contact)
 
         return contact
 
     async def remove_contact(self, contact_id: int, user: User) -> Contact | None:
         """Remove a contact for a user.
 
+        Issues a single ``DELETE ... RETURNING`` statement instead of loading
+        the contact first.
+
         Args:
             contact_id (int): The unique identifier of the contact to remove.
             user (User): The user who should own the contact.
@@ -129,9 +359,15 @@ class ContactRepository:
         Returns:
             Contact | None: The removed contact if found and belongs to user, None otherwise.
         """
-        contact = await self.get_contact_by_id(contact_id, user)
+        stmt = (
+            delete(Contact)
+            .where(Contact.id == contact_id, Contact.user_id == user.id)
+            .returning(Contact)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one_or_none()
         if contact:
-            await self.db.delete(contact)
             await self.db.commit()
         return contact
 
@@ -147,30 +383,98 @@ class ContactRepository:
         Returns:
             List[Contact]: List of contacts with upcoming birthdays.
         """
-        today = date.today()
-
-        upcoming_dates = []
-        for i in range(7):
-            next_date = today + timedelta(days=i)
-            upcoming_dates.append((next_date.month, next_date.day))
-
-        date_conditions = []
-        for month, day in upcoming_dates:
-            date_conditions.append(
-                and_(
-                    extract("month", Contact.birth_date) == month,
-                    extract("day", Contact.birth_date) == day,
-                )
-            )
+        return await self.get_upcoming_birthdays(user, 7)
+
+    async def get_upcoming_birthdays(self, user: User, days: int = 7) -> List[Contact]:
+        """Get contacts whose birthdays fall within the next ``days`` days.
+
+        The window starts today and is served by a range scan over the
+        ``(user_id, birth_day_of_year)`` index.
+
+        Args:
+            user (User): The user whose contacts to check for birthdays.
+            days (int): Length of the window in days, today included.
+
+        Returns:
+            List[Contact]: Contacts ordered by how soon their birthday comes.
+        """
+        if days <= 0:
+            return []
+
+        stmt = select(Contact).filter(Contact.user_id == user.id)
+        stmt, order = self._filter_birthday_window(stmt, date.today(), days)
+        stmt = stmt.order_by(*order, *self._keyset_order())
+
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def stream_upcoming_birthdays(
+        self, start: date, days: int, batch_size: int = 5000
+    ) -> AsyncIterator[List[Row]]:
+        """Stream upcoming birthdays of all confirmed users' contacts.
+
+        A single range scan over the ``(birth_day_of_year, user_id)`` index
+        selects the window, and rows come back grouped by owner over a
+        server-side cursor. Only the columns needed for a digest are
+        fetched, so no ORM objects are built.
+
+        Args:
+            start (date): First day of the window.
+            days (int): Length of the window in days, ``start`` included.
+            batch_size (int): Number of rows fetched per batch.
+
+        Yields:
+            List[Row]: Consecutive batches of rows with ``user_id``,
+            ``username``, ``user_email``, ``first_name``, ``last_name``,
+            ``email`` and ``birth_date``, ordered by ``user_id`` and then by
+            how soon the birthday comes.
+        """
+        if days <= 0:
+            return
 
         stmt = (
-            select(Contact)
-            .filter(Contact.user_id == user.id)
-            .filter(or_(*date_conditions))
-            .order_by(
-                extract("month", Contact.birth_date), extract("day", Contact.birth_date)
+            select(
+                Contact.user_id,
+                User.username,
+                User.email.label("user_email"),
+                Contact.first_name,
+                Contact.last_name,
+                Contact.email,
+                Contact.birth_date,
             )
+            .join(User, Contact.user_id == User.id)
+            .filter(User.confirmed.is_(True))
         )
+        stmt, order = self._filter_birthday_window(stmt, start, days)
+        stmt = stmt.order_by(
+            Contact.user_id, *order, Contact.last_name, Contact.first_name
+        ).execution_options(yield_per=batch_size)
 
-        result = await self.db.execute(stmt)
-        return list(result.scalars().all())
+        result = await self.db.stream(stmt)
+        async for batch in result.partitions():
+            yield batch
+
+    @staticmethod
+    def _filter_birthday_window(stmt, start: date, days: int):
+        """Restrict a contacts query to birthdays within a window of dates.
+
+        Returns:
+            The filtered statement and the ordering that sorts its rows by
+            how soon the birthday comes.
+        """
+        window = birthday_window(start, days)
+        if window is None:
+            return stmt, [Contact.birth_day_of_year]
+        first, last = window
+        if first <= last:
+            stmt = stmt.filter(Contact.birth_day_of_year.between(first, last))
+            return stmt, [Contact.birth_day_of_year]
+        # The window wraps around the end of the year
+        stmt = stmt.filter(
+            or_(
+                Contact.birth_day_of_year >= first,
+                Contact.birth_day_of_year <= last,
+            )
+        )
+        wrapped = case((Contact.birth_day_of_year >= first, 0), else_=1)
+        return stmt, [wrapped, Contact.birth_day_of_year]
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import EmailOutbox, EmailStatus
+
+
+def utcnow() -> datetime:
+    """Return the current time as a naive UTC datetime.
+
+    Returns:
+        datetime: Current UTC time without tzinfo, as stored in the outbox.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class EmailOutboxRepository:
+    """Repository class for email outbox database operations.
+
+    Attributes:
+        db (AsyncSession): SQLAlchemy async database session.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """Initialize EmailOutboxRepository with database session.
+
+        Args:
+            session (AsyncSession): SQLAlchemy async database session.
+        """
+        self.db = session
+
+    def add(self, kind: str, recipient: str, payload: dict) -> EmailOutbox:
+        """Queue a message in the session without committing.
+
+        The message is stored by the session's next commit, together with
+        the other changes of the same transaction.
+
+        Args:
+            kind (str): Template of the email.
+            recipient (str): Email address to send to.
+            payload (dict): Template parameters.
+
+        Returns:
+            EmailOutbox: The pending message.
+        """
+        message = EmailOutbox(
+            kind=kind,
+            recipient=recipient,
+            payload=payload,
+            status=EmailStatus.PENDING,
+            attempts=0,
+            next_attempt_at=utcnow(),
+        )
+        self.db.add(message)
+        return message
+
+    async def claim_due(self, limit: int, lease_seconds: float) -> list[EmailOutbox]:
+        """Claim due messages for sending.
+
+        Pending messages whose retry time has passed, and messages whose
+        previous claim expired because a worker died, are locked with
+        ``FOR UPDATE SKIP LOCKED``, so concurrent workers claim disjoint
+        batches. Each claim counts as an attempt and lasts ``lease_seconds``.
+
+        Args:
+            limit (int): Maximum number of messages to claim.
+            lease_seconds (float): How long the claim is held.
+
+        Returns:
+            list[EmailOutbox]: Claimed messages, oldest due first.
+        """
+        now = utcnow()
+        stmt = (
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status.in_((EmailStatus.PENDING, EmailStatus.SENDING)),
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        messages = list((await self.db.execute(stmt)).scalars().all())
+        for message in messages:
+            message.status = EmailStatus.SENDING
+            message.attempts += 1
+            message.next_attempt_at = now + timedelta(seconds=lease_seconds)
+        await self.db.commit()
+        return messages
+
+    async def mark_sent(self, message_id: int, attempt: int) -> bool:
+        """Record that a message was sent.
+
+        Args:
+            message_id (int): ID of the message.
+            attempt (int): ``attempts`` of the message when it was claimed.
+
+        Returns:
+            bool: False if the claim was lost, i.e. the lease expired and
+            another worker claimed the message; nothing is changed then.
+        """
+        result = await self.db.execute(
+            update(EmailOutbox)
+            .where(*self._claimed(message_id, attempt))
+            .values(status=EmailStatus.SENT, sent_at=utcnow(), last_error=None)
+        )
+        await self.db.commit()
+        return result.rowcount == 1
+
+    async def mark_failed(
+        self, message_id: int, attempt: int, error: str, retry_at: Optional[datetime]
+    ) -> bool:
+        """Record a failed attempt.
+
+        Args:
+            message_id (int): ID of the message.
+            attempt (int): ``attempts`` of the message when it was claimed.
+            error (str): Description of the failure.
+            retry_at (Optional[datetime]): When to try again (naive UTC), or
+                None to move the message to the dead letters.
+
+        Returns:
+            bool: False if the claim was lost, i.e. the lease expired and
+            another worker claimed the message; nothing is changed then.
+        """
+        if retry_at is None:
+            values = {"status": EmailStatus.DEAD}
+        else:
+            values = {"status": EmailStatus.PENDING, "next_attempt_at": retry_at}
+        result = await self.db.execute(
+            update(EmailOutbox)
+            .where(*self._claimed(message_id, attempt))
+            .values(last_error=error[:1000], **values)
+        )
+        await self.db.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def _claimed(message_id: int, attempt: int) -> tuple:
+        # Every claim increments attempts, so it identifies the claim holder
+        return (
+            EmailOutbox.id == message_id,
+            EmailOutbox.status == EmailStatus.SENDING,
+            EmailOutbox.attempts == attempt,
+        )
+
+    async def count_by_status(self) -> dict[str, int]:
+        """Count messages per delivery state.
+
+        Returns:
+            dict[str, int]: Number of messages keyed by status value.
+        """
+        stmt = select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status)
+        rows = (await self.db.execute(stmt)).all()
+        return {status.value: count for status, count in rows}
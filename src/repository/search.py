@@ -0,0 +1,128 @@
+from sqlalchemy import Select, column, func, literal_column, or_, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.db import get_dialect_name
+from src.database.models import Contact
+
+# Shortest term the trigram indexes can serve; shorter terms fall back to LIKE.
+MIN_TRIGRAM_TERM_LENGTH = 3
+
+contacts_fts = table("contacts_fts", column("rowid"))
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term is matched literally.
+
+    Args:
+        term (str): Raw search term.
+
+    Returns:
+        str: Term with ``\\``, ``%`` and ``_`` escaped with a backslash.
+    """
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class ContactSearch:
+    """Portable contact search based on ``LIKE`` predicates.
+
+    Used for databases without a dedicated search implementation. It matches
+    substrings of the first name, last name and email, but can't use an index
+    and does not rank results.
+    """
+
+    def apply(self, stmt: Select, term: str) -> Select:
+        """Restrict a contact query to rows matching the search term.
+
+        Args:
+            stmt (Select): Query selecting ``Contact`` rows.
+            term (str): Search term entered by the user.
+
+        Returns:
+            Select: The query with the search predicate applied.
+        """
+        pattern = f"%{escape_like(term)}%"
+        return stmt.where(
+            or_(
+                Contact.first_name.like(pattern, escape="\\"),
+                Contact.last_name.like(pattern, escape="\\"),
+                Contact.email.like(pattern, escape="\\"),
+            )
+        )
+
+    def rank(self, term: str):
+        """Return an expression ordering the best matches first, if supported.
+
+        Args:
+            term (str): Search term entered by the user.
+
+        Returns:
+            Optional[ColumnElement]: Ordering expression, or None.
+        """
+        return None
+
+
+class PostgresContactSearch(ContactSearch):
+    """Contact search backed by ``pg_trgm`` GIN indexes.
+
+    Case-insensitive substring matching with ``ILIKE`` is served by trigram
+    indexes on the first name, last name and email columns. Results are
+    ranked by trigram similarity to the term.
+    """
+
+    def apply(self, stmt: Select, term: str) -> Select:
+        pattern = f"%{escape_like(term)}%"
+        return stmt.where(
+            or_(
+                Contact.first_name.ilike(pattern, escape="\\"),
+                Contact.last_name.ilike(pattern, escape="\\"),
+                Contact.email.ilike(pattern, escape="\\"),
+            )
+        )
+
+    def rank(self, term: str):
+        return func.greatest(
+            func.word_similarity(term, Contact.first_name),
+            func.word_similarity(term, Contact.last_name),
+            func.word_similarity(term, Contact.email),
+        ).desc()
+
+
+class SQLiteContactSearch(ContactSearch):
+    """Contact search backed by an FTS5 trigram table.
+
+    The ``contacts_fts`` external-content table is kept in sync with
+    ``contacts`` by triggers (see :mod:`src.database.models`). Terms shorter
+    than a trigram fall back to ``LIKE``. Results are ranked with ``bm25``.
+    """
+
+    def apply(self, stmt: Select, term: str) -> Select:
+        if len(term) < MIN_TRIGRAM_TERM_LENGTH:
+            return super().apply(stmt, term)
+        query = '"' + term.replace('"', '""') + '"'
+        return stmt.join(contacts_fts, contacts_fts.c.rowid == Contact.id).where(
+            literal_column("contacts_fts").op("MATCH")(query)
+        )
+
+    def rank(self, term: str):
+        if len(term) < MIN_TRIGRAM_TERM_LENGTH:
+            return None
+        return func.bm25(literal_column("contacts_fts"))
+
+
+_search_engines = {
+    "postgresql": PostgresContactSearch(),
+    "sqlite": SQLiteContactSearch(),
+}
+_default_search = ContactSearch()
+
+
+def get_contact_search(session: AsyncSession) -> ContactSearch:
+    """Pick the search implementation for the session's database.
+
+    Args:
+        session (AsyncSession): Session the query will run on.
+
+    Returns:
+        ContactSearch: Search implementation for the bound dialect.
+    """
+    return _search_engines.get(get_dialect_name(session), _default_search)
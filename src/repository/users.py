@@ -123,7 +123,7 @@ class UserRepository:
         return user
 
     async def update_password(self, email: str, new_hashed_password: str) -> User:
-        """Update a user's password hash.
+        """Update a user's password hash and bump the token version.
 
         Args:
             email (str): The email address of the user.
@@ -140,6 +140,8 @@ class UserRepository:
             raise ValueError("User not found")
 
         user.hashed_password = new_hashed_password
+        # Refresh tokens issued with the old password stop working
+        user.token_version += 1
         await self.db.commit()
         await self.db.refresh(user)
         return user
@@ -148,7 +150,8 @@ class UserRepository:
         """Update a user's role in the system.
 
         Updates the user's role, typically used for admin operations
-        to promote/demote users.
+        to promote/demote users, and bumps the token version so existing
+        refresh tokens cannot issue access tokens with the old role.
 
         Args:
             email (str): The email address of the user.
@@ -165,6 +168,8 @@ class UserRepository:
             raise ValueError("User not found")
 
         user.role = role
+        # The role is a token claim; force clients to refresh and pick it up
+        user.token_version += 1
         await self.db.commit()
         await self.db.refresh(user)
         return user
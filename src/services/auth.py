@@ -1,53 +1,42 @@
+import asyncio
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta, UTC
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 
-from src.database.db import get_db
-from src.database.redis_db import get_redis_cache, RedisCache
+from src.database.db import get_read_db
+from src.database.redis_db import get_redis_cache, LocalTTLCache, RedisCache
+from src.services.hashing import Hash  # noqa: F401
+from src.services.revocation import token_revocations
+from src.services.singleflight import SingleFlight
 from src.services.users import UserService
 from src.conf.config import settings
-from src.database.models import UserRole
+from src.database.models import User, UserRole
+from schemas import TokenIdentity
 
 
-class Hash:
-    """Password hashing utility class using bcrypt.
-
-    Provides methods for hashing passwords and verifying password hashes
-    using the bcrypt algorithm for secure password storage.
-    """
-
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-    def verify_password(self, plain_password, hashed_password):
-        """Verify a plain password against its hash.
-
-        Args:
-            plain_password (str): The plain text password to verify.
-            hashed_password (str): The bcrypt hash to verify against.
-
-        Returns:
-            bool: True if password matches, False otherwise.
-        """
-        return self.pwd_context.verify(plain_password, hashed_password)
-
-    def get_password_hash(self, password: str):
-        """Generate a bcrypt hash for a plain password.
-
-        Args:
-            password (str): The plain text password to hash.
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-        Returns:
-            str: The bcrypt hash of the password.
-        """
-        return self.pwd_context.hash(password)
+# Payloads of verified access tokens, keyed by the SHA-256 of the token and
+# kept until the token expires
+verified_tokens = LocalTTLCache(
+    settings.JWT_CACHE_SIZE, settings.JWT_EXPIRATION_SECONDS
+)
 
+# Cache misses for the same username share one database load per worker
+user_loads = SingleFlight()
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+# Cross-worker lock taken while a user is loaded into the cache
+USER_LOAD_LOCK_TTL = 5.0
+# How long other workers wait for the lock holder to fill the cache
+USER_LOAD_WAIT_SECONDS = 1.0
+USER_LOAD_POLL_SECONDS = 0.05
 
 
 def create_access_token(data: dict, expires_delta: Optional[int] = None):
@@ -76,19 +65,128 @@ def create_access_token(data: dict, expires_delta: Optional[int] = None):
     return encoded_jwt
 
 
+def access_token_claims(user: User) -> dict:
+    """Build the claims of an access token for a user.
+
+    Besides the username the token carries everything role checks need, so
+    :func:`get_token_identity` can authorize requests without any I/O.
+
+    Args:
+        user (User): The user the token is issued to.
+
+    Returns:
+        dict: Token payload for :func:`create_access_token`.
+    """
+    return {
+        "sub": user.username,
+        "uid": user.id,
+        "role": user.role.value,
+        "confirmed": user.confirmed,
+        "ver": user.token_version,
+        "type": "access",
+        "jti": uuid.uuid4().hex,
+    }
+
+
+def create_refresh_token(user: User) -> str:
+    """Create a long-lived JWT refresh token.
+
+    The token records the user's token version; it can only be exchanged
+    for new tokens while the version is unchanged and it was not revoked.
+
+    Args:
+        user (User): The user the token is issued to.
+
+    Returns:
+        str: The encoded JWT refresh token.
+    """
+    now = datetime.now(UTC)
+    to_encode = {
+        "sub": user.username,
+        "uid": user.id,
+        "ver": user.token_version,
+        "type": "refresh",
+        "jti": uuid.uuid4().hex,
+        "iat": now,
+        "exp": now + timedelta(seconds=settings.JWT_REFRESH_EXPIRATION_SECONDS),
+    }
+    return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+
+
+def get_refresh_token_payload(token: str) -> dict:
+    """Verify a refresh token and return its payload.
+
+    Args:
+        token (str): JWT refresh token.
+
+    Returns:
+        dict: The verified token payload.
+
+    Raises:
+        HTTPException: 401 Unauthorized if the token is invalid, expired or
+            not a refresh token.
+    """
+    try:
+        payload = jwt.decode(
+            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
+        )
+    except JWTError:
+        payload = {}
+    if payload.get("type") != "refresh":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+def get_revocable_token_payload(token: str) -> dict:
+    """Verify an access or refresh token that is about to be revoked.
+
+    Args:
+        token (str): JWT access or refresh token.
+
+    Returns:
+        dict: The verified token payload.
+
+    Raises:
+        HTTPException: 400 Bad Request if the token is invalid, expired or
+            has no ``jti`` claim.
+    """
+    try:
+        payload = jwt.decode(
+            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
+        )
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token"
+        )
+    if "jti" not in payload:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token has no jti and can't be revoked",
+        )
+    return payload
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     cache: RedisCache = Depends(get_redis_cache),
 ):
     """Get the current authenticated user from JWT token.
 
-    Validates the JWT token, extracts the username, and retrieves the user
-    from cache or database. Caches the user for subsequent requests.
+    Validates the JWT token (once per token and worker, see
+    :func:`decode_access_token`), rejects revoked tokens, extracts the
+    username, and retrieves the user from cache or database. Caches the user for subsequent requests. After
+    a database lookup the session is closed, so its connection is not held
+    for the rest of the request. Concurrent cache misses for the same user
+    share a single database lookup.
 
     Args:
         token (str): JWT access token from Authorization header.
-        db (AsyncSession): Database session dependency.
+        db (AsyncSession): Read-only database session dependency.
         cache (RedisCache): Redis cache dependency.
 
     Returns:
@@ -104,29 +202,160 @@ async def get_current_user(
     )
 
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = decode_access_token(token)
+        if payload.get("type") == "refresh":
+            raise credentials_exception
         username = payload["sub"]
         if username is None:
             raise credentials_exception
     except JWTError as e:
-        raise credentials_exception  # Try to get user from cache first
+        raise credentials_exception
+    if await token_revocations.is_revoked(payload, cache):
+        raise credentials_exception
+    # Try to get user from cache first
     user = await cache.get_user(username)
 
     if user is None:
         # If not in cache, get from database and cache it
-        user_service = UserService(db, cache)
-        user = await user_service.get_user_by_username(username)
+        user = await user_loads.do(
+            username, lambda: load_user_into_cache(username, db, cache)
+        )
         if user is None:
             raise credentials_exception
 
-        # Cache the user for future requests
-        await cache.set_user(username, user, expire=settings.JWT_EXPIRATION_SECONDS)
-
     return user
 
 
+async def load_user_into_cache(username: str, db: AsyncSession, cache: RedisCache):
+    """Load a user missing from the cache and cache it.
+
+    Only one worker at a time loads a given user: the others wait briefly
+    for it to fill the cache and load the user themselves only if that
+    doesn't happen in time.
+
+    Args:
+        username (str): Username to load.
+        db (AsyncSession): Database session used for the lookup.
+        cache (RedisCache): Redis cache dependency.
+
+    Returns:
+        User | None: The user, or None if it doesn't exist.
+    """
+    lock_name = f"user-load:{username}"
+    token = await cache.acquire_lock(lock_name, USER_LOAD_LOCK_TTL)
+    if token is None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + USER_LOAD_WAIT_SECONDS
+        while loop.time() < deadline:
+            await asyncio.sleep(USER_LOAD_POLL_SECONDS)
+            user = await cache.get_user(username)
+            if user is not None:
+                return user
+
+    try:
+        user_service = UserService(db, cache)
+        user = await user_service.get_user_by_username(username)
+        # Give the connection back to the pool; the session is reopened on
+        # demand if the endpoint shares it
+        await db.close()
+        if user is not None:
+            # Cache the user for future requests
+            await cache.set_user(
+                username, user, expire=settings.USER_CACHE_TTL_SECONDS
+            )
+        return user
+    finally:
+        if token is not None:
+            await cache.release_lock(lock_name, token)
+
+
+def decode_access_token(token: str) -> dict:
+    """Verify an access token and return its payload.
+
+    Clients reuse a token for many requests, so verified payloads are kept
+    in :data:`verified_tokens` until the token expires and the signature is
+    only checked on the first use in this worker. Tokens are looked up by
+    their SHA-256 hash; the cached payload must not be modified.
+
+    Args:
+        token (str): JWT access token.
+
+    Returns:
+        dict: The verified token payload.
+
+    Raises:
+        JWTError: If the token is invalid or expired.
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    payload = verified_tokens.get(key)
+    if payload is None:
+        payload = jwt.decode(
+            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
+        )
+        expires_in = payload.get("exp", 0) - time.time()
+        if expires_in > 0:
+            verified_tokens.set(key, payload, ttl=expires_in)
+    return payload
+
+
+async def get_token_identity(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_read_db),
+    cache: RedisCache = Depends(get_redis_cache),
+) -> TokenIdentity:
+    """Get the identity and role of the caller from the access token.
+
+    Tokens issued by login and refresh carry these claims, so no Redis or
+    database lookup is needed; revocation is checked against the in-process
+    filter of :data:`token_revocations`. Role changes reach such tokens when they are
+    refreshed. Tokens issued before claims were added only carry the
+    username and fall back to :func:`get_current_user`.
+
+    Args:
+        token (str): JWT access token from Authorization header.
+        db (AsyncSession): Read-only database session dependency, used only
+            for tokens without claims.
+        cache (RedisCache): Redis cache dependency, used only for tokens
+            without claims.
+
+    Returns:
+        TokenIdentity: The caller's identity and authorization claims.
+
+    Raises:
+        HTTPException: 401 Unauthorized if the token is invalid.
+    """
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if payload.get("type") == "access":
+        if await token_revocations.is_revoked(payload, cache):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return TokenIdentity(
+            id=payload["uid"],
+            username=payload["sub"],
+            role=payload["role"],
+            confirmed=payload["confirmed"],
+            token_version=payload["ver"],
+        )
+
+    user = await get_current_user(token, db, cache)
+    return TokenIdentity(
+        id=user.id,
+        username=user.username,
+        role=user.role.value,
+        confirmed=user.confirmed,
+    )
+
+
 def create_email_token(data: dict):
     """Create a JWT token for email verification.
 
@@ -223,22 +452,23 @@ async def get_email_from_password_reset_token(token: str):
         )
 
 
-async def require_admin_role(current_user=Depends(get_current_user)):
+async def require_admin_role(current_user=Depends(get_token_identity)):
     """Dependency to ensure current user has admin role.
 
     FastAPI dependency that checks if the current authenticated user
-    has admin privileges. Used to protect admin-only endpoints.
+    has admin privileges. Used to protect admin-only endpoints. The role is
+    taken from the access token, so the check needs no I/O.
 
     Args:
-        current_user (User): The current authenticated user.
+        current_user (TokenIdentity): Identity of the current user.
 
     Returns:
-        User: The authenticated admin user.
+        TokenIdentity: Identity of the authenticated admin user.
 
     Raises:
         HTTPException: 403 Forbidden if user doesn't have admin role.
     """
-    if current_user.role != UserRole.ADMIN:
+    if current_user.role.value != UserRole.ADMIN.value:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
         )
@@ -258,19 +488,19 @@ def require_role(required_role: UserRole):
         function: A dependency function that validates user role.
     """
 
-    async def role_checker(current_user=Depends(get_current_user)):
+    async def role_checker(current_user=Depends(get_token_identity)):
         """Check if current user has the required role.
 
         Args:
-            current_user (User): The current authenticated user.
+            current_user (TokenIdentity): Identity of the current user.
 
         Returns:
-            User: The authenticated user with required role.
+            TokenIdentity: Identity of the user with required role.
 
         Raises:
             HTTPException: 403 Forbidden if user doesn't have required role.
         """
-        if current_user.role != required_role:
+        if current_user.role.value != required_role.value:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. {required_role.value.title()} role required",
@@ -1,9 +1,104 @@
-from typing import Optional
+import hashlib
+import time
+from datetime import date
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
 
+import orjson
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.repository.contacts import ContactRepository
+from src.repository.contacts import ContactRepository, next_page_cursor
+from src.database.db import sessionmanager
 from src.database.models import User
-from schemas import ContactCreate, ContactUpdate
+from src.database.redis_db import RedisCache
+from src.conf.config import settings
+from src.services.contacts_io import ParsedRow, format_csv, format_ndjson
+from schemas import (
+    ContactCreate,
+    ContactUpdate,
+    ContactImportError,
+    ContactImportResult,
+    ContactResponse,
+)
+
+
+class ResultCacheStats:
+    """Hit and timing counters of the contact result cache (per worker).
+
+    Attributes:
+        hits (int): Results served from the cache.
+        misses (int): Results loaded from the database.
+        db_seconds_spent (float): Database time of the misses.
+        db_seconds_saved (float): Database time the hits would have taken,
+            as measured when the served results were loaded.
+    """
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.hits = 0
+        self.misses = 0
+        self.db_seconds_spent = 0.0
+        self.db_seconds_saved = 0.0
+
+    def record_hit(self, db_seconds: float) -> None:
+        """Record a result served from the cache.
+
+        Args:
+            db_seconds (float): Time it took to load the result originally.
+        """
+        self.hits += 1
+        self.db_seconds_saved += db_seconds
+
+    def record_miss(self, db_seconds: float) -> None:
+        """Record a result loaded from the database.
+
+        Args:
+            db_seconds (float): Time the load took.
+        """
+        self.misses += 1
+        self.db_seconds_spent += db_seconds
+
+    def as_dict(self) -> dict:
+        """Return the counters as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Counters plus the hit ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "db_seconds_spent": round(self.db_seconds_spent, 6),
+            "db_seconds_saved": round(self.db_seconds_saved, 6),
+        }
+
+
+contacts_cache_stats = ResultCacheStats()
+
+
+def serialize_contacts(contacts) -> List[dict]:
+    """Convert contacts to JSON-compatible ``ContactResponse`` dicts.
+
+    Args:
+        contacts (Iterable[Contact]): Contacts to convert.
+
+    Returns:
+        List[dict]: One dictionary per contact.
+    """
+    return [
+        ContactResponse.model_validate(contact).model_dump(mode="json")
+        for contact in contacts
+    ]
+
+
+# Rows validated and written per batch during bulk import
+IMPORT_CHUNK_SIZE = 1000
+# Rows fetched from the server-side cursor per export chunk
+EXPORT_CHUNK_SIZE = 1000
+# Rejected rows listed in the import result; the rest are only counted
+MAX_REPORTED_IMPORT_ERRORS = 100
 
 
 class ContactService:
@@ -13,17 +108,78 @@ class ContactService:
     retrieval, updates, and deletion. Acts as a layer between API endpoints
     and repository operations.
 
+    With a cache, contact lists and upcoming birthdays are served from
+    Redis. Cached results are keyed by a per-user generation counter, which
+    every write bumps, so a write makes all of the user's cached results
+    unreachable at once. Results read from a replica shortly after a write
+    are not cached, since the replica may not have the write yet.
+
     Attributes:
         repository (ContactRepository): The contact repository for database operations.
+        cache (Optional[RedisCache]): Redis cache for query results.
     """
 
-    def __init__(self, db: AsyncSession):
-        """Initialize ContactService with database session.
+    def __init__(self, db: AsyncSession, cache: Optional[RedisCache] = None):
+        """Initialize ContactService with database session and optional cache.
 
         Args:
             db (AsyncSession): SQLAlchemy async database session.
+            cache (Optional[RedisCache]): Redis cache for query results.
         """
         self.repository = ContactRepository(db)
+        self.cache = cache
+
+    async def _cached(
+        self, user: User, query: str, load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Serve a query result from the cache, loading it on a miss.
+
+        A result loaded from a replica within ``DB_READ_YOUR_WRITES_SECONDS``
+        of the user's last write is returned but not cached, so it can't
+        outlive the replication lag.
+
+        Args:
+            user (User): The user whose contacts are queried.
+            query (str): Query name and parameters.
+            load (Callable[[], Awaitable[Any]]): Loads the JSON-compatible
+                result from the database.
+
+        Returns:
+            Any: The result.
+        """
+        query_hash = hashlib.sha256(query.encode()).hexdigest()[:32]
+        generation, payload, written = await self.cache.get_contacts_result(
+            user.id, query_hash
+        )
+        if payload is not None:
+            cached = orjson.loads(payload)
+            contacts_cache_stats.record_hit(cached["db_seconds"])
+            return cached["result"]
+
+        started = time.perf_counter()
+        result = await load()
+        elapsed = time.perf_counter() - started
+        contacts_cache_stats.record_miss(elapsed)
+        if generation is not None and not (
+            written and sessionmanager.is_replica(self.repository.db)
+        ):
+            await self.cache.set_contacts_result(
+                user.id,
+                generation,
+                query_hash,
+                orjson.dumps({"db_seconds": elapsed, "result": result}),
+                expire=settings.CONTACTS_CACHE_TTL,
+            )
+        return result
+
+    async def _invalidate(self, user: User) -> None:
+        """Make the user's cached query results stale after a write.
+
+        Args:
+            user (User): The user whose contacts changed.
+        """
+        if self.cache is not None:
+            await self.cache.bump_contacts_generation(user.id)
 
     async def create_contact(self, body: ContactCreate, user: User):
         """Create a new contact for the user.
@@ -35,7 +191,93 @@ class ContactService:
         Returns:
             Contact: The created contact object.
         """
-        return await self.repository.create_contact(body, user)
+        contact = await self.repository.create_contact(body, user)
+        await self._invalidate(user)
+        return contact
+
+    async def import_contacts(
+        self, rows: AsyncIterator[ParsedRow], user: User
+    ) -> ContactImportResult:
+        """Bulk-create contacts from parsed upload rows.
+
+        Rows are validated against ``ContactCreate`` and written in chunks of
+        ``IMPORT_CHUNK_SIZE``, so memory use does not grow with the upload.
+        Invalid rows are skipped and reported. Cached results are invalidated
+        after every committed chunk, so they stay correct if the import fails
+        midway.
+
+        Args:
+            rows (AsyncIterator[ParsedRow]): ``(row_number, data)`` pairs, where
+                data is a field mapping or a parse error message.
+            user (User): The user who will own the contacts.
+
+        Returns:
+            ContactImportResult: Counts, per-row errors and throughput.
+        """
+        started = time.perf_counter()
+        imported = failed = 0
+        errors: List[ContactImportError] = []
+        chunk: List[ContactCreate] = []
+
+        async for row_number, data in rows:
+            try:
+                if isinstance(data, str):
+                    raise ValueError(data)
+                chunk.append(ContactCreate.model_validate(data))
+            except ValidationError as e:
+                failed += 1
+                if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+                    messages = [
+                        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+                        for err in e.errors()
+                    ]
+                    errors.append(ContactImportError(row=row_number, errors=messages))
+            except ValueError as e:
+                failed += 1
+                if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+                    errors.append(ContactImportError(row=row_number, errors=[str(e)]))
+
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                imported += await self._import_chunk(chunk, user)
+                chunk = []
+
+        imported += await self._import_chunk(chunk, user)
+
+        elapsed = time.perf_counter() - started
+        return ContactImportResult(
+            imported=imported,
+            failed=failed,
+            errors=errors,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round((imported + failed) / elapsed, 1) if elapsed else 0.0,
+        )
+
+    async def _import_chunk(self, chunk: List[ContactCreate], user: User) -> int:
+        created = await self.repository.bulk_create_contacts(chunk, user)
+        if created:
+            await self._invalidate(user)
+        return created
+
+    async def export_contacts(
+        self, user: User, export_format: str = "ndjson"
+    ) -> AsyncIterator[str]:
+        """Render all contacts of the user as a stream of text chunks.
+
+        Args:
+            user (User): The user whose contacts to export.
+            export_format (str): "ndjson" or "csv".
+
+        Yields:
+            str: Consecutive chunks of the export, one per fetched batch. The
+            CSV header is emitted first, even if there are no contacts.
+        """
+        if export_format == "csv":
+            yield format_csv([], header=True)
+        async for batch in self.repository.stream_contacts(user, EXPORT_CHUNK_SIZE):
+            if export_format == "csv":
+                yield format_csv(batch)
+            else:
+                yield format_ndjson(batch)
 
     async def get_contacts(
         self, skip: int, limit: int, user: User, search: Optional[str] = None
@@ -53,6 +295,93 @@ class ContactService:
         """
         return await self.repository.get_contacts(skip, limit, user, search)
 
+    async def get_contacts_page(
+        self,
+        limit: int,
+        user: User,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ):
+        """Get a page of contacts for the user using cursor pagination.
+
+        Args:
+            limit (int): Maximum number of records to return.
+            user (User): The user whose contacts to retrieve.
+            search (Optional[str]): Search term to filter contacts.
+            cursor (Optional[str]): Cursor returned with the previous page.
+
+        Returns:
+            Tuple[List[Contact], Optional[str]]: The contacts and the cursor
+            for the next page, if any.
+
+        Raises:
+            HTTPException: 400 Bad Request if the cursor is invalid.
+        """
+        try:
+            return await self.repository.get_contacts_page(limit, user, search, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def list_contacts(
+        self,
+        skip: int,
+        limit: int,
+        user: User,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List, Optional[str]]:
+        """Get a page of contacts and the cursor of the following page.
+
+        Uses cursor pagination when ``cursor`` is given and offset pagination
+        otherwise. Ranked search results in offset mode are not in keyset
+        order, so they come without a cursor.
+
+        Args:
+            skip (int): Number of records to skip in offset mode.
+            limit (int): Maximum number of records to return.
+            user (User): The user whose contacts to retrieve.
+            search (Optional[str]): Search term to filter contacts.
+            cursor (Optional[str]): Cursor returned with the previous page.
+
+        Returns:
+            Tuple[List, Optional[str]]: The contacts and the cursor for the
+            next page, if any. With a cache, contacts are ``ContactResponse``
+            dicts.
+
+        Raises:
+            HTTPException: 400 Bad Request if the cursor is invalid.
+        """
+
+        async def load():
+            if cursor is not None:
+                return await self.get_contacts_page(limit, user, search, cursor)
+            contacts = await self.get_contacts(skip, limit, user, search)
+            return contacts, None if search else self.next_cursor(contacts, limit)
+
+        if self.cache is None:
+            return await load()
+
+        async def load_serialized():
+            contacts, next_cursor = await load()
+            return [serialize_contacts(contacts), next_cursor]
+
+        query = orjson.dumps(["list", skip, limit, search, cursor]).decode()
+        contacts, next_cursor = await self._cached(user, query, load_serialized)
+        return contacts, next_cursor
+
+    @staticmethod
+    def next_cursor(contacts: List, limit: int) -> Optional[str]:
+        """Get the cursor continuing after a page fetched in offset mode.
+
+        Args:
+            contacts (List[Contact]): Contacts of the current page.
+            limit (int): Requested page size.
+
+        Returns:
+            Optional[str]: Cursor for the next page, or None if this is the last one.
+        """
+        return next_page_cursor(contacts, limit)
+
     async def get_contact(self, contact_id: int, user: User):
         """Get a specific contact by ID for the user.
 
@@ -76,7 +405,10 @@ class ContactService:
         Returns:
             Contact | None: The updated contact if found and belongs to user, None otherwise.
         """
-        return await self.repository.update_contact(contact_id, body, user)
+        contact = await self.repository.update_contact(contact_id, body, user)
+        if contact is not None:
+            await self._invalidate(user)
+        return contact
 
     async def remove_contact(self, contact_id: int, user: User):
         """Remove a contact for the user.
@@ -88,7 +420,10 @@ class ContactService:
         Returns:
             Contact | None: The removed contact if found and belongs to user, None otherwise.
         """
-        return await self.repository.remove_contact(contact_id, user)
+        contact = await self.repository.remove_contact(contact_id, user)
+        if contact is not None:
+            await self._invalidate(user)
+        return contact
 
     async def get_contacts_birthday_in_7_days(self, user: User):
         """Get contacts with upcoming birthdays within 7 days.
@@ -100,3 +435,25 @@ class ContactService:
             List[Contact]: List of contacts with birthdays in the next 7 days.
         """
         return await self.repository.get_contacts_birthday_in_7_days(user)
+
+    async def get_upcoming_birthdays(self, user: User, days: int = 7):
+        """Get contacts with birthdays within the next ``days`` days.
+
+        Args:
+            user (User): The user whose contacts to check for birthdays.
+            days (int): Length of the window in days, today included.
+
+        Returns:
+            List: Contacts ordered by how soon their birthday comes. With a
+            cache, contacts are ``ContactResponse`` dicts.
+        """
+        if self.cache is None:
+            return await self.repository.get_upcoming_birthdays(user, days)
+
+        async def load():
+            contacts = await self.repository.get_upcoming_birthdays(user, days)
+            return serialize_contacts(contacts)
+
+        # The window moves every day, so results are only valid for today
+        query = f"birthdays:{date.today().isoformat()}:{days}"
+        return await self._cached(user, query, load)
@@ -0,0 +1,224 @@
+import codecs
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, Tuple, Union
+
+from schemas import ContactResponse
+
+# Columns of the CSV format, in order; NDJSON objects use the same keys.
+CONTACT_FIELDS = (
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "birth_date",
+    "additional_data",
+)
+
+# Columns written by CSV export
+EXPORT_FIELDS = ("id",) + CONTACT_FIELDS
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+CSV_MEDIA_TYPES = ("text/csv",)
+
+ParsedRow = Tuple[int, Union[Dict[str, Any], str]]
+
+# Longest line accepted by bulk import, in bytes
+MAX_LINE_BYTES = 64 * 1024
+
+
+def detect_format(content_type: str | None) -> str | None:
+    """Map a request Content-Type to an import format.
+
+    Args:
+        content_type (str | None): Value of the Content-Type header.
+
+    Returns:
+        str | None: "ndjson", "csv", or None if the type is not supported.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        return "ndjson"
+    if media_type in CSV_MEDIA_TYPES:
+        return "csv"
+    return None
+
+
+class LineError(ValueError):
+    """A line of an upload that could not be read as text."""
+
+
+def decode_line(raw: bytes, max_line_bytes: int) -> Union[str, LineError]:
+    """Decode one line of an upload.
+
+    Args:
+        raw (bytes): The line without its ``\\n`` terminator.
+        max_line_bytes (int): Longest accepted line.
+
+    Returns:
+        Union[str, LineError]: The line without a trailing ``\\r``, or the
+        reason it was rejected.
+    """
+    if len(raw) > max_line_bytes:
+        return LineError(f"Line is longer than {max_line_bytes} bytes")
+    try:
+        return raw.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError as e:
+        return LineError(f"Invalid UTF-8 at byte {e.start + 1}")
+
+
+async def iter_lines(
+    stream: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[Union[str, LineError]]:
+    """Split a stream of UTF-8 byte chunks into text lines.
+
+    Lines are split on raw bytes, which is safe because ``\\n`` never occurs
+    inside a multi-byte UTF-8 sequence, and each chunk is scanned once. Only
+    one chunk and at most ``max_line_bytes`` of a partial line are held in
+    memory; the rest of an overlong line is dropped. A line that is too long
+    or is not valid UTF-8 is yielded as a :class:`LineError`, so the line
+    count and the following rows stay intact.
+
+    Args:
+        stream (AsyncIterator[bytes]): Raw body chunks, e.g. ``request.stream()``.
+        max_line_bytes (int): Longest accepted line.
+
+    Yields:
+        Union[str, LineError]: Lines without their line terminator, or the
+        reason a line was rejected.
+    """
+    # Holds one byte more than allowed, enough to tell a line is too long
+    pending = bytearray()
+    first = True
+    async for chunk in stream:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            stop = len(chunk) if end == -1 else end
+            room = max_line_bytes + 1 - len(pending)
+            pending += chunk[start : min(stop, start + room)]
+            if end == -1:
+                break
+            yield decode_line(_take_line(pending, first), max_line_bytes)
+            first = False
+            start = end + 1
+    if pending:
+        yield decode_line(_take_line(pending, first), max_line_bytes)
+
+
+def _take_line(pending: bytearray, first: bool) -> bytes:
+    raw = bytes(pending)
+    pending.clear()
+    return raw.removeprefix(codecs.BOM_UTF8) if first else raw
+
+
+async def iter_ndjson_rows(
+    lines: AsyncIterator[Union[str, LineError]],
+) -> AsyncIterator[ParsedRow]:
+    """Parse newline-delimited JSON objects.
+
+    Blank lines are skipped but still counted, so row numbers match line
+    numbers in the uploaded file.
+
+    Args:
+        lines (AsyncIterator[Union[str, LineError]]): Lines of the body.
+
+    Yields:
+        ParsedRow: ``(row_number, object)`` or ``(row_number, error_message)``.
+    """
+    row_number = 0
+    async for line in lines:
+        row_number += 1
+        if isinstance(line, LineError):
+            yield row_number, str(line)
+            continue
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield row_number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(data, dict):
+            yield row_number, "Each line must be a JSON object"
+            continue
+        yield row_number, data
+
+
+async def iter_csv_rows(
+    lines: AsyncIterator[Union[str, LineError]],
+) -> AsyncIterator[ParsedRow]:
+    """Parse CSV rows using the first line as the header.
+
+    Quoted values may not contain line breaks. Empty cells are treated as
+    missing values.
+
+    Args:
+        lines (AsyncIterator[Union[str, LineError]]): Lines of the body.
+
+    Yields:
+        ParsedRow: ``(row_number, object)`` or ``(row_number, error_message)``,
+        where row 1 is the first line after the header.
+
+    Raises:
+        LineError: If the header line can't be read; no row is parsed then.
+    """
+    header = None
+    row_number = 0
+    async for line in lines:
+        if header is None:
+            if isinstance(line, LineError):
+                raise LineError(f"Invalid header: {line}")
+            header = [name.strip() for name in next(csv.reader([line]))]
+            continue
+        row_number += 1
+        if isinstance(line, LineError):
+            yield row_number, str(line)
+            continue
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if len(values) != len(header):
+            yield row_number, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row_number, {name: value for name, value in zip(header, values) if value}
+
+
+def format_ndjson(contacts: Iterable) -> str:
+    """Render contacts as NDJSON lines.
+
+    Args:
+        contacts (Iterable[Contact]): Contacts to render.
+
+    Returns:
+        str: One JSON object per contact, each terminated by a newline.
+    """
+    return "".join(
+        ContactResponse.model_validate(contact).model_dump_json() + "\n"
+        for contact in contacts
+    )
+
+
+def format_csv(contacts: Iterable, header: bool = False) -> str:
+    """Render contacts as CSV rows with the ``EXPORT_FIELDS`` columns.
+
+    Args:
+        contacts (Iterable[Contact]): Contacts to render.
+        header (bool): Whether to start with the header row.
+
+    Returns:
+        str: CSV text with ``\\r\\n`` line endings.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for contact in contacts:
+        writer.writerow(
+            "" if value is None else value
+            for value in (getattr(contact, name) for name in EXPORT_FIELDS)
+        )
+    return buffer.getvalue()
@@ -1,31 +1,54 @@
-from pathlib import Path
-import logging
+from email.message import Message
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formataddr, formatdate, make_msgid
+from collections import deque
+import asyncio
 from typing import Optional
 
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
+import aiosmtplib
+from fastapi_mail import ConnectionConfig
 from fastapi_mail.errors import ConnectionErrors
 from pydantic import EmailStr, SecretStr
 
 from src.services.auth import create_email_token, create_password_reset_token
+from src.services.email_templates import TEMPLATE_FOLDER, get_template
+from src.services.smtp_pool import SMTPConnectionPool
 from src.conf.config import settings
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+# Failures of a single message that leave the SMTP connection usable
+MESSAGE_ERRORS = (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused)
 
 
 class EmailService:
     """Service class for email operations.
 
-    Handles sending various types of emails including verification emails
-    and password reset emails using FastMail.
+    Renders verification, password reset and birthday digest emails and
+    sends batches of them. Messages are rendered from templates compiled
+    once per process and sent over a pool of persistent SMTP connections.
+    Only the workers create the service; the API process queues emails in
+    the outbox and opens no SMTP connections.
 
     Attributes:
         config (ConnectionConfig): FastMail connection configuration.
+        pool (SMTPConnectionPool): Connections used for sending.
+        sender (str): Formatted From address.
     """
 
-    def __init__(self):
-        """Initialize EmailService with mail configuration."""
+    def __init__(self, pool_size: int = settings.SMTP_POOL_SIZE):
+        """Initialize EmailService with mail configuration.
+
+        Args:
+            pool_size (int): Maximum number of SMTP connections, which is
+                also the number of messages sent at once.
+        """
         self.config = self._create_config()
+        self.pool = SMTPConnectionPool(
+            self.config, pool_size, settings.SMTP_IDLE_CHECK_SECONDS
+        )
+        self.sender = formataddr((self.config.MAIL_FROM_NAME, self.config.MAIL_FROM))
+        # Message-ID domain; make_msgid() would look up the host name each time
+        self._msgid_domain = self.config.MAIL_FROM.rpartition("@")[2]
 
     def _create_config(self) -> ConnectionConfig:
         """Create FastMail connection configuration.
@@ -44,16 +67,28 @@ class EmailService:
             MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
             USE_CREDENTIALS=settings.USE_CREDENTIALS,
             VALIDATE_CERTS=settings.VALIDATE_CERTS,
-            TEMPLATE_FOLDER=Path(__file__).parent / "templates",
+            TEMPLATE_FOLDER=TEMPLATE_FOLDER,
         )
 
-    async def send_verification_email(
+    def _message(
+        self, recipient: str, subject: str, template_name: str, **values
+    ) -> Message:
+        message = MIMEMultipart("mixed")
+        message.set_charset("utf-8")
+        message.attach(
+            MIMEText(get_template(template_name).render(**values), "html", "utf-8")
+        )
+        message["Date"] = formatdate(localtime=True)
+        message["Message-ID"] = make_msgid(domain=self._msgid_domain)
+        message["To"] = recipient
+        message["From"] = self.sender
+        message["Subject"] = subject
+        return message
+
+    async def build_verification_email(
         self, email: EmailStr, username: str, host: str
-    ) -> bool:
-        """Send email verification message to user.
-
-        Sends an HTML email with a verification link to confirm the user's
-        email address. Uses the verify_email.html template.
+    ) -> Message:
+        """Render an email verification message.
 
         Args:
             email (EmailStr): The recipient's email address.
@@ -61,40 +96,21 @@ class EmailService:
             host (str): The application host URL for building verification link.
 
         Returns:
-            bool: True if email was sent successfully, False otherwise.
+            Message: The MIME message, ready to send.
         """
-        try:
-            token_verification = create_email_token({"sub": email})
-            message = MessageSchema(
-                subject="Confirm your email - Contacts API",
-                recipients=[email],
-                template_body={
-                    "host": host,
-                    "username": username,
-                    "token": token_verification,
-                },
-                subtype=MessageType.html,
-            )
-
-            fm = FastMail(self.config)
-            await fm.send_message(message, template_name="verify_email.html")
-            logger.info(f"Email successfully sent to {email}")
-            return True
-
-        except ConnectionErrors as err:
-            logger.error(f"SMTP Connection error for {email}: {err}")
-            return False
-        except Exception as err:
-            logger.error(f"Unexpected error sending email to {email}: {err}")
-            return False
-
-    async def send_password_reset_email(
-        self, email: EmailStr, username: str, host: str
-    ) -> bool:
-        """Send password reset email to user.
+        return self._message(
+            email,
+            "Confirm your email - Contacts API",
+            "verify_email.html",
+            host=host,
+            username=username,
+            token=create_email_token({"sub": email}),
+        )
 
-        Sends an HTML email with a password reset link allowing the user
-        to reset their password. Uses the password_reset_email.html template.
+    async def build_password_reset_email(
+        self, email: EmailStr, username: str, host: str
+    ) -> Message:
+        """Render a password reset message.
 
         Args:
             email (EmailStr): The recipient's email address.
@@ -102,73 +118,93 @@ class EmailService:
             host (str): The application host URL for building reset link.
 
         Returns:
-            bool: True if email was sent successfully, False otherwise.
+            Message: The MIME message, ready to send.
         """
-        try:
-            token_reset = create_password_reset_token({"sub": email})
-            message = MessageSchema(
-                subject="Password Reset - Contacts API",
-                recipients=[email],
-                template_body={
-                    "host": host,
-                    "username": username,
-                    "email": email,
-                    "token": token_reset,
-                },
-                subtype=MessageType.html,
-            )
-
-            fm = FastMail(self.config)
-            await fm.send_message(message, template_name="password_reset_email.html")
-            logger.info(f"Password reset email successfully sent to {email}")
-            return True
-
-        except ConnectionErrors as err:
-            logger.error(f"SMTP Connection error for password reset {email}: {err}")
-            return False
-        except Exception as err:
-            logger.error(
-                f"Unexpected error sending password reset email to {email}: {err}"
-            )
-            return False
-
-
-email_service = EmailService()
-
-
-async def send_email(email: EmailStr, username: str, host: str):
-    """Send verification email to user.
-
-    Convenience function that uses the global email service instance
-    to send verification emails.
-
-    Args:
-        email (EmailStr): The recipient's email address.
-        username (str): The user's username for personalization.
-        host (str): The application host URL for building verification link.
-
-    Raises:
-        Exception: If email sending fails.
-    """
-    success = await email_service.send_verification_email(email, username, host)
-    if not success:
-        raise Exception(f"Failed to send verification email to {email}")
+        return self._message(
+            email,
+            "Password Reset - Contacts API",
+            "password_reset_email.html",
+            host=host,
+            username=username,
+            email=email,
+            token=create_password_reset_token({"sub": email}),
+        )
 
+    async def build_birthday_digest(
+        self, email: EmailStr, username: str, contacts: list[dict], days: int
+    ) -> Message:
+        """Render a digest of a user's contacts with upcoming birthdays.
 
-async def send_password_reset_email(email: EmailStr, username: str, host: str):
-    """Send password reset email to user.
+        Args:
+            email (EmailStr): The recipient's email address.
+            username (str): The user's username for personalization.
+            contacts (list[dict]): Contacts in order of their birthdays, each
+                with ``name``, ``email`` and ``date`` to display.
+            days (int): Length of the birthday window in days.
 
-    Convenience function that uses the global email service instance
-    to send password reset emails.
+        Returns:
+            Message: The MIME message, ready to send.
+        """
+        return self._message(
+            email,
+            "Upcoming birthdays - Contacts API",
+            "birthday_digest.html",
+            username=username,
+            contacts=contacts,
+            days=days,
+        )
 
-    Args:
-        email (EmailStr): The recipient's email address.
-        username (str): The user's username for personalization.
-        host (str): The application host URL for building reset link.
+    async def _send_share(
+        self, messages: list[Message], results: list, indexes: list[int]
+    ) -> None:
+        pending = deque(indexes)
+        while pending:
+            index = None
+            try:
+                async with self.pool.connection() as smtp:
+                    while pending:
+                        index = pending.popleft()
+                        try:
+                            await smtp.send_message(messages[index])
+                        except MESSAGE_ERRORS as error:
+                            results[index] = error
+                            index = None
+                            await smtp.rset()
+                        index = None
+            except (ConnectionErrors, aiosmtplib.SMTPException, OSError) as error:
+                # The message in flight fails and the rest continue on a new
+                # connection; if none can be opened, they fail one by one
+                if index is None and isinstance(error, ConnectionErrors):
+                    index = pending.popleft()
+                if index is not None:
+                    results[index] = error
+            except Exception as error:
+                # E.g. a malformed message rejected by send_message; the
+                # connection is discarded since its state is unknown
+                if index is None and pending:
+                    index = pending.popleft()
+                if index is not None:
+                    results[index] = error
+
+    async def send_batch(self, messages: list[Message]) -> list[Optional[Exception]]:
+        """Send messages over the pooled SMTP connections.
+
+        The messages are split between up to ``pool.size`` connections,
+        each sending its share one message after another. If a connection
+        breaks or sending a message raises an unexpected error, that message
+        fails and the others continue on a new connection.
 
-    Raises:
-        Exception: If email sending fails.
-    """
-    success = await email_service.send_password_reset_email(email, username, host)
-    if not success:
-        raise Exception(f"Failed to send password reset email to {email}")
+        Args:
+            messages (list[Message]): Rendered messages.
+
+        Returns:
+            list[Optional[Exception]]: For each message, None if it was sent,
+            otherwise the error.
+        """
+        results: list[Optional[Exception]] = [None] * len(messages)
+        count = min(self.pool.size, len(messages))
+        shares = [list(range(i, len(messages), count)) for i in range(count)]
+        await asyncio.gather(
+            *(self._send_share(messages, results, share) for share in shares)
+        )
+        return results
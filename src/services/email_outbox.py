@@ -0,0 +1,136 @@
+import logging
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.database.models import EmailOutbox
+from src.database.redis_db import RedisCache
+from src.repository.email_outbox import EmailOutboxRepository
+from src.services.rate_limit import parse_rate
+
+logger = logging.getLogger(__name__)
+
+# Templates the outbox worker knows how to send
+VERIFY_EMAIL = "verify_email"
+PASSWORD_RESET_EMAIL = "password_reset"
+EMAIL_KINDS = (VERIFY_EMAIL, PASSWORD_RESET_EMAIL)
+
+# Rate limit bucket shared by all on-demand emails, and its size and period
+EMAIL_BUDGET_KEY = "ratelimit:email-budget:global"
+EMAIL_BUDGET = parse_rate(settings.EMAIL_SEND_BUDGET)
+
+
+class EmailOutboxService:
+    """Service class queueing emails for the outbox worker.
+
+    Messages are written to the ``email_outbox`` table in the caller's
+    transaction and sent later by ``python -m src.workers.email_outbox``.
+
+    Attributes:
+        repository (EmailOutboxRepository): The outbox repository.
+        cache (Optional[RedisCache]): Redis cache used to deduplicate and
+            budget on-demand emails.
+    """
+
+    def __init__(self, db: AsyncSession, cache: Optional[RedisCache] = None):
+        """Initialize EmailOutboxService with database session and optional cache.
+
+        Args:
+            db (AsyncSession): SQLAlchemy async database session.
+            cache (Optional[RedisCache]): Redis cache for deduplication.
+        """
+        self.repository = EmailOutboxRepository(db)
+        self.cache = cache
+
+    def stage(self, kind: str, email: str, username: str, host: str) -> EmailOutbox:
+        """Queue an email in the session without committing.
+
+        Use this when the email must only be sent if other changes of the
+        same transaction are committed, e.g. a newly registered user.
+
+        Args:
+            kind (str): One of :data:`EMAIL_KINDS`.
+            email (str): The recipient's email address.
+            username (str): The user's username for personalization.
+            host (str): The application host URL for building links.
+
+        Returns:
+            EmailOutbox: The pending message.
+
+        Raises:
+            ValueError: If the kind is unknown.
+        """
+        if kind not in EMAIL_KINDS:
+            raise ValueError(f"Unknown email kind: {kind}")
+        return self.repository.add(kind, email, {"username": username, "host": host})
+
+    async def enqueue(
+        self, kind: str, email: str, username: str, host: str
+    ) -> EmailOutbox:
+        """Queue an email and commit.
+
+        Args:
+            kind (str): One of :data:`EMAIL_KINDS`.
+            email (str): The recipient's email address.
+            username (str): The user's username for personalization.
+            host (str): The application host URL for building links.
+
+        Returns:
+            EmailOutbox: The pending message.
+
+        Raises:
+            ValueError: If the kind is unknown.
+        """
+        message = self.stage(kind, email, username, host)
+        await self.repository.db.commit()
+        return message
+
+    async def enqueue_once(
+        self, kind: str, email: str, username: str, host: str
+    ) -> bool:
+        """Queue an email unless it was queued recently or the budget is spent.
+
+        An email of the same kind to the same address is queued at most
+        once per ``EMAIL_DEDUP_SECONDS``, and all emails queued this way
+        share the ``EMAIL_SEND_BUDGET`` rate. Both checks are skipped if
+        Redis is unavailable.
+
+        Args:
+            kind (str): One of :data:`EMAIL_KINDS`.
+            email (str): The recipient's email address.
+            username (str): The user's username for personalization.
+            host (str): The application host URL for building links.
+
+        Returns:
+            bool: True if the email was queued, False if it was dropped.
+
+        Raises:
+            ValueError: If the kind is unknown. Errors from queueing are
+                re-raised after the deduplication claim is released.
+        """
+        claimed = None
+        if self.cache is not None:
+            dedup_key = f"email:dedup:{kind}:{email.lower()}"
+            claimed = await self.cache.claim_once(
+                dedup_key, settings.EMAIL_DEDUP_SECONDS
+            )
+            if claimed is False:
+                logger.info(f"Duplicate {kind} email to {email} dropped")
+                return False
+            budget = await self.cache.rate_limit(EMAIL_BUDGET_KEY, *EMAIL_BUDGET)
+            if budget is not None and not budget[0]:
+                # Let the address try again once the budget refills
+                await self.cache.release_claim(dedup_key)
+                logger.warning(
+                    f"Email budget exhausted, {kind} email to {email} dropped"
+                )
+                return False
+        try:
+            await self.enqueue(kind, email, username, host)
+        except BaseException:
+            # Nothing was queued, so don't hold off the next request
+            if claimed:
+                await self.cache.release_claim(dedup_key)
+            raise
+        return True
@@ -0,0 +1,84 @@
+import functools
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, nodes
+from markupsafe import escape
+
+TEMPLATE_FOLDER = Path(__file__).parent / "templates"
+
+# One environment per process; values are HTML-escaped
+template_env = Environment(loader=FileSystemLoader(TEMPLATE_FOLDER), autoescape=True)
+
+
+class EmailTemplate:
+    """Jinja email template compiled once and rendered by substitution.
+
+    Templates made only of text and ``{{ name }}`` placeholders, like the
+    ones in ``templates/``, are split into their static segments when
+    loaded; rendering then joins those with the escaped values. Any other
+    template is rendered by Jinja.
+
+    Attributes:
+        name (str): Template file name.
+        template (jinja2.Template): The compiled Jinja template.
+        fields (tuple[str, ...]): Placeholder names in order of appearance,
+            or None if the template is rendered by Jinja.
+    """
+
+    def __init__(self, env: Environment, name: str):
+        """Load and compile a template.
+
+        Args:
+            env (Environment): Jinja environment loading the template.
+            name (str): Template file name.
+        """
+        self.name = name
+        self.template = env.get_template(name)
+        source, _, _ = env.loader.get_source(env, name)
+        self._segments = None
+        self.fields = None
+        segments = [""]
+        fields = []
+        for output in env.parse(source).body:
+            if not isinstance(output, nodes.Output):
+                return
+            for node in output.nodes:
+                if isinstance(node, nodes.TemplateData):
+                    segments[-1] += node.data
+                elif isinstance(node, nodes.Name):
+                    fields.append(node.name)
+                    segments.append("")
+                else:
+                    return
+        self._segments = segments
+        self.fields = tuple(fields)
+
+    def render(self, **values) -> str:
+        """Render the template.
+
+        Args:
+            **values: Placeholder values; missing ones render empty.
+
+        Returns:
+            str: The rendered template.
+        """
+        if self._segments is None:
+            return self.template.render(**values)
+        parts = [self._segments[0]]
+        for field, segment in zip(self.fields, self._segments[1:]):
+            parts.append(escape(values.get(field, "")))
+            parts.append(segment)
+        return "".join(parts)
+
+
+@functools.lru_cache(maxsize=None)
+def get_template(name: str) -> EmailTemplate:
+    """Return a template from ``templates/``, compiling it on first use.
+
+    Args:
+        name (str): Template file name.
+
+    Returns:
+        EmailTemplate: The compiled template.
+    """
+    return EmailTemplate(template_env, name)
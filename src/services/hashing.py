@@ -0,0 +1,174 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from src.conf.config import settings
+
+# One bcrypt context for the whole process
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class HashExecutor:
+    """Bounded thread pool for CPU-heavy password hashing.
+
+    bcrypt takes tens of milliseconds per call and would block the event
+    loop if called from a handler. The work runs in ``max_workers``
+    dedicated threads instead; at most ``queue_limit`` more calls may wait
+    for a thread, further calls are rejected with 503 Service Unavailable so
+    a login storm cannot queue unbounded work.
+
+    Attributes:
+        max_workers (int): Number of hashing threads.
+        queue_limit (int): Calls allowed to wait for a free thread.
+        rejected (int): Calls rejected because the executor was saturated.
+    """
+
+    def __init__(self, max_workers: int, queue_limit: int):
+        """Initialize the executor; threads are started on first use.
+
+        Args:
+            max_workers (int): Number of hashing threads.
+            queue_limit (int): Calls allowed to wait for a free thread.
+        """
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self.rejected = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+
+    @property
+    def pending(self) -> int:
+        """int: Calls running or waiting for a thread."""
+        return self._pending
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` in a hashing thread.
+
+        The slot is held until the thread finishes, even if the awaiting
+        request is cancelled meanwhile.
+
+        Args:
+            fn (Callable[..., Any]): Blocking function to run.
+            *args (Any): Arguments for ``fn``.
+
+        Returns:
+            Any: The result of ``fn``.
+
+        Raises:
+            HTTPException: 503 Service Unavailable if the executor is saturated.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Сервер перевантажений. Спробуйте пізніше.",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def as_dict(self) -> dict:
+        """Return executor usage as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Thread count, queue limit, pending and rejected calls.
+        """
+        return {
+            "workers": self.max_workers,
+            "queue_limit": self.queue_limit,
+            "pending": self._pending,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the hashing threads after running calls finish."""
+        self._executor.shutdown(wait=True)
+
+
+hash_executor = HashExecutor(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_LIMIT
+)
+
+
+class Hash:
+    """Password hashing utility class using bcrypt.
+
+    Provides methods for hashing passwords and verifying password hashes
+    using the bcrypt algorithm for secure password storage. Async handlers
+    should use the ``*_async`` variants, which run bcrypt in
+    :data:`hash_executor` instead of on the event loop.
+    """
+
+    pwd_context = pwd_context
+
+    def verify_password(self, plain_password, hashed_password):
+        """Verify a plain password against its hash.
+
+        Args:
+            plain_password (str): The plain text password to verify.
+            hashed_password (str): The bcrypt hash to verify against.
+
+        Returns:
+            bool: True if password matches, False otherwise.
+        """
+        return self.pwd_context.verify(plain_password, hashed_password)
+
+    def get_password_hash(self, password: str):
+        """Generate a bcrypt hash for a plain password.
+
+        Args:
+            password (str): The plain text password to hash.
+
+        Returns:
+            str: The bcrypt hash of the password.
+        """
+        return self.pwd_context.hash(password)
+
+    async def verify_password_async(self, plain_password, hashed_password):
+        """Verify a plain password against its hash off the event loop.
+
+        Args:
+            plain_password (str): The plain text password to verify.
+            hashed_password (str): The bcrypt hash to verify against.
+
+        Returns:
+            bool: True if password matches, False otherwise.
+
+        Raises:
+            HTTPException: 503 Service Unavailable if hashing is saturated.
+        """
+        return await hash_executor.run(
+            self.verify_password, plain_password, hashed_password
+        )
+
+    async def get_password_hash_async(self, password: str):
+        """Generate a bcrypt hash for a plain password off the event loop.
+
+        Args:
+            password (str): The plain text password to hash.
+
+        Returns:
+            str: The bcrypt hash of the password.
+
+        Raises:
+            HTTPException: 503 Service Unavailable if hashing is saturated.
+        """
+        return await hash_executor.run(self.get_password_hash, password)
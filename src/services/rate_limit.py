@@ -0,0 +1,155 @@
+import math
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from jose import JWTError
+
+from src.conf.config import settings
+from src.database.redis_db import RedisCache, get_redis_cache
+from src.services.auth import decode_access_token
+
+# Seconds per unit of a "<count>/<unit>" rate
+RATE_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Ways of identifying the client a limit applies to
+RATE_LIMIT_KEYS = ("ip", "user")
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """Parse a rate such as ``"5/minute"``.
+
+    Args:
+        rate (str): Requests per unit, the unit being second, minute, hour or day.
+
+    Returns:
+        tuple[int, int]: Allowed requests and the period in seconds.
+
+    Raises:
+        ValueError: If the rate can't be parsed.
+    """
+    count, _, unit = rate.partition("/")
+    if unit not in RATE_UNITS or not count.isdigit() or int(count) <= 0:
+        raise ValueError(f"Invalid rate: {rate}")
+    return int(count), RATE_UNITS[unit]
+
+
+def client_ip(request: Request) -> str:
+    """Return the address of the client that sent a request.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        str: Client IP address, or "unknown" if not available.
+    """
+    return request.client.host if request.client else "unknown"
+
+
+def token_subject(request: Request) -> Optional[str]:
+    """Return the username of a valid bearer token sent with a request.
+
+    Uses the verified token cache, so repeated requests need no signature
+    check; revocation is left to the authentication of the route.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        Optional[str]: The token's ``sub`` claim, or None without a valid token.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_access_token(token).get("sub")
+    except JWTError:
+        return None
+
+
+class RateLimiter:
+    """Rate limit policy shared by all workers and hosts.
+
+    Each client has a token bucket in Redis that holds ``limit`` requests
+    and refills over ``period`` seconds; one Lua script call per request
+    takes a token. Use an instance as a route dependency. Requests over the
+    limit get 429 Too Many Requests with ``Retry-After``. If Redis is
+    unavailable requests are let through.
+
+    Attributes:
+        name (str): Policy name, part of the Redis key.
+        limit (int): Requests allowed per period (bucket size).
+        period (int): Seconds in which a full bucket refills.
+        per (str): "ip" to limit per client address, "user" to limit per
+            authenticated user, falling back to the address.
+    """
+
+    def __init__(self, name: str, rate: str, per: str = "ip"):
+        """Initialize a policy.
+
+        Args:
+            name (str): Policy name, part of the Redis key.
+            rate (str): Allowed rate such as ``"5/minute"``.
+            per (str): "ip" or "user".
+
+        Raises:
+            ValueError: If the rate or key type is invalid.
+        """
+        if per not in RATE_LIMIT_KEYS:
+            raise ValueError(f"Unknown rate limit key: {per}")
+        self.name = name
+        self.limit, self.period = parse_rate(rate)
+        self.per = per
+
+    def client_key(self, request: Request) -> str:
+        """Return the key identifying the client of a request.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            str: "user:<username>" or "ip:<address>".
+        """
+        if self.per == "user":
+            username = token_subject(request)
+            if username is not None:
+                return f"user:{username}"
+        return f"ip:{client_ip(request)}"
+
+    async def hit(self, cache: RedisCache, client: str) -> None:
+        """Count a request of a client against the limit.
+
+        Args:
+            cache (RedisCache): Redis cache dependency.
+            client (str): Client key, e.g. from :meth:`client_key`.
+
+        Raises:
+            HTTPException: 429 Too Many Requests if the limit is exceeded.
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        result = await cache.rate_limit(
+            f"ratelimit:{self.name}:{client}", self.limit, self.period
+        )
+        if result is None:
+            return
+        allowed, retry_after, _ = result
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Перевищено ліміт запитів. Спробуйте пізніше.",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+    async def __call__(
+        self, request: Request, cache: RedisCache = Depends(get_redis_cache)
+    ) -> None:
+        """Check the limit for the client of a request.
+
+        Args:
+            request (Request): The incoming request.
+            cache (RedisCache): Redis cache dependency.
+
+        Raises:
+            HTTPException: 429 Too Many Requests if the limit is exceeded.
+        """
+        await self.hit(cache, self.client_key(request))
@@ -0,0 +1,203 @@
+import asyncio
+import hashlib
+import math
+import time
+from typing import Iterator, Optional
+
+from src.conf.config import settings
+from src.database.redis_db import RedisCache
+
+
+class BloomFilter:
+    """Compact set membership test with false positives but no false negatives.
+
+    Uses ``k`` bit positions per item derived from one BLAKE2b digest by
+    double hashing. Items can't be removed; rebuild the filter instead.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """Initialize an empty filter.
+
+        Args:
+            capacity (int): Number of items the filter is sized for.
+            error_rate (float): False positive rate at ``capacity`` items.
+        """
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        """Add an item.
+
+        Args:
+            item (str): Item to add.
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class TokenRevocations:
+    """Per-worker mirror of revoked token ids.
+
+    Revoked ``jti`` claims are stored in Redis until the token expires and
+    logged in a sorted set. Every worker copies the log into a Bloom filter
+    and polls it for new entries, so checking a token that was not revoked
+    (the common case) needs no network round trip. Only a filter hit is
+    confirmed in Redis. Revocations made by other workers take effect here
+    after at most ``refresh_interval`` seconds.
+
+    Attributes:
+        filter (BloomFilter): Revoked token ids known to this worker.
+        refresh_interval (float): Seconds between polls of the log.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, refresh_interval: float):
+        """Initialize with an empty filter.
+
+        Args:
+            capacity (int): Revocations the filter is sized for; it is
+                rebuilt from the log when more are added.
+            error_rate (float): Share of tokens needing a Redis check
+                although they were not revoked.
+            refresh_interval (float): Seconds between polls of the log.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.filter = BloomFilter(capacity, error_rate)
+        self._since = 0
+        self.filter_hits = 0
+        self.false_positives = 0
+        self.rebuilds = 0
+
+    async def revoke(self, payload: dict, cache: RedisCache) -> Optional[bool]:
+        """Revoke a token until it expires.
+
+        Args:
+            payload (dict): Verified token payload with ``jti`` and ``exp``.
+            cache (RedisCache): Redis cache dependency.
+
+        Returns:
+            Optional[bool]: True if this call revoked the token or it already
+            expired, False if it had been revoked before, or None if it has
+            no ``jti`` or Redis is unavailable.
+        """
+        jti = payload.get("jti")
+        if jti is None:
+            return None
+        expires_in = math.ceil(payload.get("exp", 0) - time.time())
+        if expires_in <= 0:
+            return True
+        if jti not in self.filter:
+            self.filter.add(jti)
+        return await cache.revoke_token(
+            jti, expires_in, settings.JWT_REFRESH_EXPIRATION_SECONDS
+        )
+
+    async def is_revoked(self, payload: dict, cache: RedisCache) -> bool:
+        """Check whether a token was revoked.
+
+        Tokens missing from the filter are accepted without I/O. A filter
+        hit is confirmed in Redis; if Redis is unavailable the token is
+        treated as revoked.
+
+        Args:
+            payload (dict): Verified token payload.
+            cache (RedisCache): Redis cache dependency.
+
+        Returns:
+            bool: True if the token was revoked.
+        """
+        jti = payload.get("jti")
+        if jti is None or jti not in self.filter:
+            return False
+        self.filter_hits += 1
+        revoked = await cache.is_token_revoked(jti)
+        if revoked is False:
+            self.false_positives += 1
+            return False
+        return True
+
+    async def refresh(self, cache: RedisCache) -> int:
+        """Copy revocations logged since the last refresh into the filter.
+
+        The filter is rebuilt from the whole log, which only holds
+        revocations of tokens that may not have expired yet, once it would
+        exceed its capacity.
+
+        Args:
+            cache (RedisCache): Redis cache dependency.
+
+        Returns:
+            int: Number of log entries read.
+        """
+        entries = await cache.get_revoked_tokens(self._since)
+        if entries is None:
+            return 0
+        if len(self.filter) + len(entries) > self.filter.capacity:
+            entries = await cache.get_revoked_tokens(0)
+            if entries is None:
+                return 0
+            self.filter = BloomFilter(
+                max(self.capacity, 2 * len(entries)), self.error_rate
+            )
+            self.rebuilds += 1
+        for jti, revoked_at in entries:
+            # The log is read from the last seen millisecond inclusive, so
+            # entries logged later in that millisecond are not missed
+            if jti not in self.filter:
+                self.filter.add(jti)
+            self._since = max(self._since, revoked_at)
+        return len(entries)
+
+    async def run(self, cache: RedisCache) -> None:
+        """Refresh the filter every ``refresh_interval`` seconds until cancelled.
+
+        Args:
+            cache (RedisCache): Redis cache dependency.
+        """
+        while True:
+            await self.refresh(cache)
+            await asyncio.sleep(self.refresh_interval)
+
+    def as_dict(self) -> dict:
+        """Return filter statistics as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Filter size and counters of Redis confirmations.
+        """
+        return {
+            "tokens": len(self.filter),
+            "capacity": self.filter.capacity,
+            "filter_bytes": (self.filter.size + 7) // 8,
+            "filter_hits": self.filter_hits,
+            "false_positives": self.false_positives,
+            "rebuilds": self.rebuilds,
+        }
+
+
+token_revocations = TokenRevocations(
+    settings.REVOCATION_FILTER_CAPACITY,
+    settings.REVOCATION_FILTER_ERROR_RATE,
+    settings.REVOCATION_REFRESH_SECONDS,
+)
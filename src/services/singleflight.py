@@ -0,0 +1,69 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution.
+
+    While a call for a key is in flight, later callers for that key wait for
+    it and share its result or exception instead of running their own.
+    Coalescing is per instance, i.e. per worker process.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call for the key is running.
+
+        Args:
+            key (Hashable): Call key.
+
+        Returns:
+            bool: True if a call for the key is in flight.
+        """
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` unless a call for the key is already in flight.
+
+        If the caller running the shared call is cancelled, one of the
+        waiters runs it again instead of failing.
+
+        Args:
+            key (Hashable): Call key, e.g. a username.
+            fn (Callable[[], Awaitable[Any]]): Coroutine function to run.
+
+        Returns:
+            Any: The result of the call.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        while key in self._calls:
+            future = self._calls[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The caller running it was cancelled; take over
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved when nobody waits for it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
@@ -0,0 +1,132 @@
+import asyncio
+import contextlib
+import time
+from collections import deque
+from typing import AsyncIterator
+
+import aiosmtplib
+from fastapi_mail import ConnectionConfig
+from fastapi_mail.errors import ConnectionErrors
+
+
+class SMTPConnectionPool:
+    """Pool of long-lived, authenticated SMTP connections.
+
+    Opening a connection costs a TCP and TLS handshake plus SMTP AUTH, which
+    dominates the time of sending a single message. Connections are opened
+    on demand, up to ``size`` at once, and kept open between messages. A
+    connection idle for more than ``idle_check_seconds`` is checked with
+    NOOP before reuse and replaced if the server has dropped it. A
+    connection on which a send failed at the connection level is closed.
+
+    Attributes:
+        config (ConnectionConfig): Mail server settings.
+        size (int): Maximum number of open connections.
+        idle_check_seconds (float): Idle time after which a connection is
+            checked before reuse.
+        connects (int): Connections opened.
+        stale (int): Idle connections found dropped by the server.
+        discarded (int): Connections closed after a failure.
+    """
+
+    def __init__(self, config: ConnectionConfig, size: int, idle_check_seconds: float):
+        """Initialize an empty pool; connections are opened on first use.
+
+        Args:
+            config (ConnectionConfig): Mail server settings.
+            size (int): Maximum number of open connections.
+            idle_check_seconds (float): Idle time after which a connection
+                is checked before reuse.
+        """
+        self.config = config
+        self.size = size
+        self.idle_check_seconds = idle_check_seconds
+        self.connects = 0
+        self.stale = 0
+        self.discarded = 0
+        self._idle: deque[tuple[aiosmtplib.SMTP, float]] = deque()
+        self._semaphore = asyncio.Semaphore(size)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            timeout=self.config.TIMEOUT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+        )
+        try:
+            await smtp.connect()
+            if self.config.USE_CREDENTIALS:
+                await smtp.login(
+                    self.config.MAIL_USERNAME,
+                    self.config.MAIL_PASSWORD.get_secret_value(),
+                )
+        except Exception as error:
+            smtp.close()
+            raise ConnectionErrors(f"Could not connect to the mail server: {error}")
+        self.connects += 1
+        return smtp
+
+    async def _checkout(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            smtp, last_used = self._idle.pop()
+            if not smtp.is_connected:
+                self.stale += 1
+                continue
+            if time.monotonic() - last_used < self.idle_check_seconds:
+                return smtp
+            try:
+                await smtp.noop()
+                return smtp
+            except (aiosmtplib.SMTPException, OSError):
+                smtp.close()
+                self.stale += 1
+        return await self._connect()
+
+    @contextlib.asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """Borrow a connection, waiting while all ``size`` are in use.
+
+        The connection goes back to the pool when the block exits normally
+        and is closed when it raises.
+
+        Yields:
+            aiosmtplib.SMTP: A connected, authenticated client.
+
+        Raises:
+            ConnectionErrors: If a new connection can't be opened.
+        """
+        async with self._semaphore:
+            smtp = await self._checkout()
+            try:
+                yield smtp
+            except BaseException:
+                smtp.close()
+                self.discarded += 1
+                raise
+            self._idle.append((smtp, time.monotonic()))
+
+    async def close(self) -> None:
+        """Log out of and close all idle connections."""
+        while self._idle:
+            smtp, _ = self._idle.pop()
+            try:
+                await smtp.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                smtp.close()
+
+    def as_dict(self) -> dict:
+        """Return pool usage as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Pool size, idle connections and connection counters.
+        """
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "connects": self.connects,
+            "stale": self.stale,
+            "discarded": self.discarded,
+        }
@@ -2,10 +2,10 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from libgravatar import Gravatar
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 
 from src.repository.users import UserRepository
 from src.database.redis_db import RedisCache
+from src.services.hashing import Hash
 from schemas import UserCreate
 from src.database.models import UserRole
 
@@ -143,11 +143,11 @@ class UserService:
             User: The updated user object.
 
         Raises:
-            HTTPException: 404 Not Found if user doesn't exist.
+            HTTPException: 404 Not Found if user doesn't exist, 503 Service
+                Unavailable if password hashing is saturated.
         """
         try:
-            pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-            hashed_password = pwd_context.hash(new_password)
+            hashed_password = await Hash().get_password_hash_async(new_password)
 
             user = await self.repository.update_password(email, hashed_password)
             if user and self.cache:
@@ -0,0 +1,258 @@
+"""Daily job emailing every user a digest of their contacts' upcoming birthdays.
+
+Run it once a day, e.g. from cron::
+
+    python -m src.workers.birthday_digest [--days 7] [--date 2026-10-17]
+
+All contacts with a birthday in the window are read in one range scan over
+the ``(birth_day_of_year, user_id)`` index, ordered by owner, from a read
+replica. While rows stream in, each user's contacts are grouped into one
+digest and the digests are sent in batches over the email service's pool
+of SMTP connections, so reading and sending overlap. Users with no
+upcoming birthdays get no email. Progress and throughput are logged as the
+job runs.
+"""
+
+import argparse
+import asyncio
+import calendar
+import logging
+import time
+from datetime import date
+from email.message import Message
+from typing import AsyncIterator, Callable, Optional
+
+from sqlalchemy import Row
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.repository.contacts import ContactRepository
+from src.services.email import EmailService
+
+logger = logging.getLogger(__name__)
+
+
+def digest_entry(row: Row) -> dict:
+    """Return the values the digest template shows for one contact.
+
+    Args:
+        row (Row): A row from ``ContactRepository.stream_upcoming_birthdays``.
+
+    Returns:
+        dict: The contact's ``name``, ``email`` and birthday ``date``.
+    """
+    birth_date = row.birth_date
+    return {
+        "name": f"{row.first_name} {row.last_name}",
+        "email": row.email,
+        "date": f"{calendar.month_name[birth_date.month]} {birth_date.day}",
+    }
+
+
+class BirthdayDigestJob:
+    """Sends one birthday digest email per user with upcoming birthdays.
+
+    At most ``email_service.pool.size`` emails are sent at once, one per
+    SMTP connection. Failed digests are logged and not retried; the next
+    day's run includes the same contacts while their birthdays are still
+    ahead.
+
+    Attributes:
+        email_service (EmailService): Service sending the emails.
+        days (int): Length of the birthday window in days, today included.
+        batch_size (int): Digests sent per batch.
+        fetch_size (int): Contact rows fetched from the database at a time.
+        progress_seconds (float): Minimum interval between progress logs.
+        users (int): Users with upcoming birthdays seen so far.
+        contacts (int): Contacts with upcoming birthdays seen so far.
+        sent (int): Digests sent.
+        failed (int): Digests that could not be sent.
+    """
+
+    def __init__(
+        self,
+        email_service: EmailService,
+        session_factory: Callable = sessionmanager.read_session,
+        days: int = settings.BIRTHDAY_DIGEST_DAYS,
+        batch_size: int = settings.BIRTHDAY_DIGEST_BATCH_SIZE,
+        fetch_size: int = settings.BIRTHDAY_DIGEST_FETCH_SIZE,
+        progress_seconds: float = 10.0,
+    ):
+        """Initialize the job.
+
+        Args:
+            email_service (EmailService): Service sending the emails.
+            session_factory (Callable): No-argument callable returning an
+                async context manager that yields an AsyncSession.
+            days (int): Length of the birthday window in days.
+            batch_size (int): Digests sent per batch.
+            fetch_size (int): Contact rows fetched from the database at a time.
+            progress_seconds (float): Minimum interval between progress logs.
+        """
+        self.email_service = email_service
+        self.session_factory = session_factory
+        self.days = days
+        self.batch_size = batch_size
+        self.fetch_size = fetch_size
+        self.progress_seconds = progress_seconds
+        self.users = 0
+        self.contacts = 0
+        self.sent = 0
+        self.failed = 0
+        self._started = time.perf_counter()
+        self._logged = self._started
+
+    async def digests(self, start: date) -> AsyncIterator[Message]:
+        """Render the digests for a window of dates, one per user.
+
+        Args:
+            start (date): First day of the window.
+
+        Yields:
+            Message: Each user's digest, ready to send.
+        """
+        owner: Optional[Row] = None
+        entries: list[dict] = []
+        async with self.session_factory() as session:
+            batches = ContactRepository(session).stream_upcoming_birthdays(
+                start, self.days, self.fetch_size
+            )
+            async for batch in batches:
+                for row in batch:
+                    if owner is not None and row.user_id != owner.user_id:
+                        yield await self._digest(owner, entries)
+                        entries = []
+                    owner = row
+                    entries.append(digest_entry(row))
+                self.contacts += len(batch)
+        if owner is not None:
+            yield await self._digest(owner, entries)
+
+    async def _digest(self, owner: Row, entries: list[dict]) -> Message:
+        self.users += 1
+        return await self.email_service.build_birthday_digest(
+            owner.user_email, owner.username, entries, self.days
+        )
+
+    async def send(self, messages: list[Message]) -> None:
+        """Send a batch of digests and count the outcome.
+
+        Args:
+            messages (list[Message]): Rendered digests.
+        """
+        results = await self.email_service.send_batch(messages)
+        for message, error in zip(messages, results):
+            if error is None:
+                self.sent += 1
+            else:
+                self.failed += 1
+                logger.warning(
+                    f"Birthday digest to {message['To']} failed: "
+                    f"{type(error).__name__}: {error}"
+                )
+
+    async def run(self, start: Optional[date] = None) -> dict:
+        """Send the digests for the window starting on ``start``.
+
+        Digests are rendered while the previous batch is being sent; at
+        most two rendered batches wait to be sent.
+
+        Args:
+            start (Optional[date]): First day of the window, today by default.
+
+        Returns:
+            dict: Counters and throughput of the run, see :meth:`as_dict`.
+        """
+        start = start or date.today()
+        self._started = self._logged = time.perf_counter()
+        queue: asyncio.Queue[Optional[list[Message]]] = asyncio.Queue(maxsize=2)
+
+        async def produce() -> None:
+            try:
+                batch: list[Message] = []
+                async for message in self.digests(start):
+                    batch.append(message)
+                    if len(batch) >= self.batch_size:
+                        await queue.put(batch)
+                        batch = []
+                if batch:
+                    await queue.put(batch)
+            finally:
+                await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while (batch := await queue.get()) is not None:
+                await self.send(batch)
+                self._log_progress()
+            await producer
+        except BaseException:
+            producer.cancel()
+            raise
+        return self.as_dict()
+
+    def _log_progress(self) -> None:
+        now = time.perf_counter()
+        if now - self._logged < self.progress_seconds:
+            return
+        self._logged = now
+        stats = self.as_dict()
+        logger.info(
+            f"Birthday digest: {stats['users']} users, {stats['contacts']} "
+            f"contacts, sent {stats['sent']}, failed {stats['failed']} "
+            f"({stats['emails_per_second']} emails/s, "
+            f"{stats['contacts_per_second']} contacts/s)"
+        )
+
+    def as_dict(self) -> dict:
+        """Return job counters as a JSON-serializable dictionary.
+
+        Returns:
+            dict: User, contact, sent and failed counts, seconds elapsed and
+            the rates of contacts read and emails sent per second.
+        """
+        elapsed = max(time.perf_counter() - self._started, 1e-9)
+        return {
+            "users": self.users,
+            "contacts": self.contacts,
+            "sent": self.sent,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 2),
+            "contacts_per_second": round(self.contacts / elapsed, 1),
+            "emails_per_second": round((self.sent + self.failed) / elapsed, 1),
+        }
+
+
+async def main() -> None:
+    """Run the job once from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=settings.BIRTHDAY_DIGEST_DAYS)
+    parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=None,
+        help="first day of the window (default: today)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.SMTP_POOL_SIZE,
+        help="SMTP connections sending at once",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    job = BirthdayDigestJob(EmailService(pool_size=args.concurrency), days=args.days)
+    logger.info(
+        f"Birthday digest started ({args.days} days, "
+        f"{job.email_service.pool.size} SMTP connections, batch {job.batch_size})"
+    )
+    try:
+        stats = await job.run(args.date)
+    finally:
+        await job.email_service.pool.close()
+    logger.info(f"Birthday digest finished: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,252 @@
+"""Worker process sending the emails queued in the outbox.
+
+Run one or more instances next to the API::
+
+    python -m src.workers.email_outbox
+
+Workers claim due messages with ``FOR UPDATE SKIP LOCKED``, so several can
+run at once, and send each batch over the email service's pool of SMTP
+connections. Failed sends are retried with exponential backoff; after
+``EMAIL_MAX_ATTEMPTS`` attempts the message is marked dead and kept for
+inspection.
+"""
+
+import asyncio
+import logging
+import random
+import signal
+import time
+from datetime import timedelta
+from email.message import Message
+from typing import Awaitable, Callable, Optional
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.database.models import EmailOutbox
+from src.repository.email_outbox import EmailOutboxRepository, utcnow
+from src.services.email import EmailService
+from src.services.email_outbox import PASSWORD_RESET_EMAIL, VERIFY_EMAIL
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxWorker:
+    """Drains the email outbox in batches.
+
+    At most ``email_service.pool.size`` emails are sent at once, one per
+    SMTP connection. An outcome is only recorded while the worker still
+    holds the message's claim; if the lease expired and another worker
+    claimed the message, that worker's outcome stands.
+
+    Attributes:
+        email_service (EmailService): Service sending the emails.
+        batch_size (int): Messages claimed per poll.
+        max_attempts (int): Attempts before a message is marked dead.
+        retry_base (float): Delay in seconds before the first retry; it
+            doubles with every further attempt.
+        retry_max (float): Upper bound of the retry delay in seconds.
+        lease_seconds (float): How long a claimed message stays reserved.
+        poll_interval (float): Seconds to wait when nothing is due.
+        sent (int): Messages sent.
+        retried (int): Failed attempts scheduled for a retry.
+        dead (int): Messages given up on.
+    """
+
+    def __init__(
+        self,
+        email_service: EmailService,
+        session_factory: Callable = sessionmanager.session,
+        batch_size: int = settings.EMAIL_WORKER_BATCH_SIZE,
+        max_attempts: int = settings.EMAIL_MAX_ATTEMPTS,
+        retry_base: float = settings.EMAIL_RETRY_BASE_SECONDS,
+        retry_max: float = settings.EMAIL_RETRY_MAX_SECONDS,
+        lease_seconds: float = settings.EMAIL_WORKER_LEASE_SECONDS,
+        poll_interval: float = settings.EMAIL_WORKER_POLL_SECONDS,
+    ):
+        """Initialize the worker.
+
+        Args:
+            email_service (EmailService): Service sending the emails.
+            session_factory (Callable): No-argument callable returning an
+                async context manager that yields an AsyncSession.
+            batch_size (int): Messages claimed per poll.
+            max_attempts (int): Attempts before a message is marked dead.
+            retry_base (float): Delay in seconds before the first retry.
+            retry_max (float): Upper bound of the retry delay in seconds.
+            lease_seconds (float): How long a claimed message stays reserved.
+            poll_interval (float): Seconds to wait when nothing is due.
+        """
+        self.email_service = email_service
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        self._builders: dict[str, Callable[..., Awaitable[Message]]] = {
+            VERIFY_EMAIL: email_service.build_verification_email,
+            PASSWORD_RESET_EMAIL: email_service.build_password_reset_email,
+        }
+
+    def retry_delay(self, attempts: int) -> float:
+        """Return the delay before retrying a message.
+
+        The delay doubles with every attempt up to ``retry_max``; a random
+        part of up to half of it spreads out retries of messages that
+        failed together.
+
+        Args:
+            attempts (int): Attempts made so far, at least 1.
+
+        Returns:
+            float: Delay in seconds.
+        """
+        delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _build(self, message: EmailOutbox) -> Message:
+        builder = self._builders.get(message.kind)
+        if builder is None:
+            raise ValueError(f"Unknown email kind: {message.kind}")
+        return await builder(
+            message.recipient, message.payload["username"], message.payload["host"]
+        )
+
+    async def record(
+        self,
+        repository: EmailOutboxRepository,
+        message: EmailOutbox,
+        error: Optional[str],
+    ) -> None:
+        """Record the outcome of sending a claimed message.
+
+        Args:
+            repository (EmailOutboxRepository): Outbox repository.
+            message (EmailOutbox): A message returned by ``claim_due``.
+            error (Optional[str]): Why sending failed, or None if it was sent.
+        """
+        if error is None:
+            if await repository.mark_sent(message.id, message.attempts):
+                self.sent += 1
+            else:
+                self._lease_lost(message, "sent")
+            return
+        if message.kind in self._builders and message.attempts < self.max_attempts:
+            delay = self.retry_delay(message.attempts)
+            retry_at = utcnow() + timedelta(seconds=delay)
+            if not await repository.mark_failed(
+                message.id, message.attempts, error, retry_at
+            ):
+                self._lease_lost(message, f"failed: {error}")
+                return
+            self.retried += 1
+            logger.warning(
+                f"Email {message.id} to {message.recipient} failed "
+                f"(attempt {message.attempts}), retrying in {delay:.0f}s: {error}"
+            )
+        else:
+            if not await repository.mark_failed(
+                message.id, message.attempts, error, None
+            ):
+                self._lease_lost(message, f"failed: {error}")
+                return
+            self.dead += 1
+            logger.error(
+                f"Email {message.id} to {message.recipient} dead-lettered "
+                f"after {message.attempts} attempts: {error}"
+            )
+
+    @staticmethod
+    def _lease_lost(message: EmailOutbox, outcome: str) -> None:
+        logger.warning(
+            f"Email {message.id} to {message.recipient} {outcome}, but its "
+            "lease expired and another worker claimed it; outcome not recorded"
+        )
+
+    async def drain_once(self) -> int:
+        """Claim one batch of due messages, send it and record the outcome.
+
+        Returns:
+            int: Number of messages claimed.
+        """
+        async with self.session_factory() as session:
+            repository = EmailOutboxRepository(session)
+            messages = await repository.claim_due(self.batch_size, self.lease_seconds)
+            errors: dict[int, str] = {}
+            rendered: dict[int, Message] = {}
+            for message in messages:
+                try:
+                    rendered[message.id] = await self._build(message)
+                except Exception as e:
+                    errors[message.id] = f"{type(e).__name__}: {e}"
+            results = await self.email_service.send_batch(list(rendered.values()))
+            for message_id, error in zip(rendered, results):
+                if error is not None:
+                    errors[message_id] = f"{type(error).__name__}: {error}"
+            for message in messages:
+                await self.record(repository, message, errors.get(message.id))
+        return len(messages)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Drain the outbox until ``stop`` is set.
+
+        Full batches are followed by the next one at once; otherwise the
+        worker waits ``poll_interval`` seconds. A batch in progress is
+        finished before returning.
+
+        Args:
+            stop (asyncio.Event): Event ending the loop.
+        """
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                claimed = await self.drain_once()
+            except Exception as e:
+                logger.error(f"Email outbox poll failed: {e}")
+                claimed = 0
+            if claimed:
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    f"Processed {claimed} emails in {elapsed:.2f}s "
+                    f"(sent {self.sent}, retried {self.retried}, dead {self.dead})"
+                )
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def as_dict(self) -> dict:
+        """Return worker counters as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Sent, retried and dead-lettered message counts.
+        """
+        return {"sent": self.sent, "retried": self.retried, "dead": self.dead}
+
+
+async def main() -> None:
+    """Run a worker until SIGINT or SIGTERM."""
+    logging.basicConfig(level=logging.INFO)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    worker = OutboxWorker(EmailService())
+    logger.info(
+        f"Email outbox worker started ({worker.email_service.pool.size} SMTP "
+        f"connections, batch {worker.batch_size})"
+    )
+    try:
+        await worker.run(stop)
+    finally:
+        await worker.email_service.pool.close()
+    logger.info(f"Email outbox worker stopped: {worker.as_dict()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
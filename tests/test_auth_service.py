@@ -1,13 +1,21 @@
+import asyncio
+import time
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta, UTC
 from fastapi import HTTPException
-from jose import JWTError
+from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.services.auth import (
     Hash,
+    access_token_claims,
     create_access_token,
+    create_refresh_token,
+    get_token_identity,
+    decode_access_token,
+    verified_tokens,
     get_current_user,
     create_email_token,
     get_email_from_token,
@@ -161,6 +169,87 @@ class TestTokenOperations:
         assert exc_info.value.status_code == 422
 
 
+class TestDecodeAccessToken:
+
+    def test_verified_payload_cached(self):
+        token = create_access_token(data={"sub": "cacheduser"})
+
+        with patch("src.services.auth.jwt.decode", wraps=jwt.decode) as mock_decode:
+            first = decode_access_token(token)
+            second = decode_access_token(token)
+
+        assert first["sub"] == second["sub"] == "cacheduser"
+        mock_decode.assert_called_once()
+
+    def test_cached_until_expiration(self):
+        token = create_access_token(data={"sub": "shortlived"}, expires_delta=30)
+
+        with patch.object(verified_tokens, "set") as mock_set:
+            decode_access_token(token)
+
+        ttl = mock_set.call_args.kwargs["ttl"]
+        assert 0 < ttl <= 30
+
+    def test_expired_payload_not_cached(self):
+        token = create_access_token(data={"sub": "expiring"}, expires_delta=30)
+
+        with patch("src.services.auth.time.time", return_value=time.time() + 60):
+            with patch("src.services.auth.jwt.decode", wraps=jwt.decode) as mock_decode:
+                decode_access_token(token)
+                decode_access_token(token)
+
+        assert mock_decode.call_count == 2
+
+    def test_invalid_token_not_cached(self):
+        size = len(verified_tokens)
+
+        with pytest.raises(JWTError):
+            decode_access_token("invalid.token.string")
+
+        assert len(verified_tokens) == size
+
+
+class TestGetTokenIdentity:
+
+    @pytest.mark.asyncio
+    async def test_claims_need_no_lookup(self, mock_db, mock_cache, mock_admin_user):
+        mock_admin_user.token_version = 3
+        token = create_access_token(data=access_token_claims(mock_admin_user))
+
+        identity = await get_token_identity(token=token, db=mock_db, cache=mock_cache)
+
+        assert identity.id == mock_admin_user.id
+        assert identity.username == "adminuser"
+        assert identity.role.value == "admin"
+        assert identity.confirmed is True
+        assert identity.token_version == 3
+        mock_cache.get_user.assert_not_called()
+        await require_admin_role(identity)
+
+    @pytest.mark.asyncio
+    async def test_legacy_token_loads_user(self, mock_db, mock_cache, mock_user):
+        token = create_access_token(data={"sub": "testuser"})
+        mock_cache.get_user.return_value = mock_user
+
+        identity = await get_token_identity(token=token, db=mock_db, cache=mock_cache)
+
+        assert identity.username == "testuser"
+        assert identity.role.value == "user"
+        assert identity.token_version is None
+        mock_cache.get_user.assert_called_once_with("testuser")
+
+    @pytest.mark.asyncio
+    async def test_refresh_token_rejected(self, mock_db, mock_cache, mock_user):
+        mock_user.token_version = 0
+        token = create_refresh_token(mock_user)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_token_identity(token=token, db=mock_db, cache=mock_cache)
+
+        assert exc_info.value.status_code == 401
+        mock_cache.get_user.assert_not_called()
+
+
 class TestGetCurrentUser:
 
     @pytest.mark.asyncio
@@ -172,6 +261,7 @@ class TestGetCurrentUser:
 
         assert result == mock_user
         mock_cache.get_user.assert_called_once_with("testuser")
+        mock_db.close.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_get_current_user_from_database(self, mock_db, mock_cache, mock_user):
@@ -188,8 +278,9 @@ class TestGetCurrentUser:
             assert result == mock_user
             mock_cache.get_user.assert_called_once_with("testuser")
             mock_cache.set_user.assert_called_once_with(
-                "testuser", mock_user, expire=settings.JWT_EXPIRATION_SECONDS
+                "testuser", mock_user, expire=settings.USER_CACHE_TTL_SECONDS
             )
+            mock_db.close.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_get_current_user_invalid_token(self, mock_db, mock_cache):
@@ -223,6 +314,51 @@ class TestGetCurrentUser:
         with pytest.raises(KeyError):
             await get_current_user(token=token, db=mock_db, cache=mock_cache)
 
+    @pytest.mark.asyncio
+    async def test_get_current_user_coalesces_misses(
+        self, mock_db, mock_cache, mock_user
+    ):
+        token = create_access_token(data={"sub": "testuser"})
+        mock_cache.get_user.return_value = None
+
+        async def slow_lookup(username):
+            await asyncio.sleep(0.01)
+            return mock_user
+
+        with patch.object(
+            UserService, "get_user_by_username", side_effect=slow_lookup
+        ) as mock_get_user:
+            results = await asyncio.gather(
+                *(
+                    get_current_user(token=token, db=mock_db, cache=mock_cache)
+                    for _ in range(5)
+                )
+            )
+
+        assert results == [mock_user] * 5
+        mock_get_user.assert_called_once_with("testuser")
+        mock_cache.set_user.assert_awaited_once()
+        mock_cache.acquire_lock.assert_awaited_once()
+        mock_cache.release_lock.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_waits_for_other_worker(
+        self, mock_db, mock_cache, mock_user
+    ):
+        token = create_access_token(data={"sub": "testuser"})
+        mock_cache.get_user.side_effect = [None, None, mock_user]
+        mock_cache.acquire_lock.return_value = None
+
+        with patch.object(
+            UserService, "get_user_by_username", new_callable=AsyncMock
+        ) as mock_get_user:
+            result = await get_current_user(token=token, db=mock_db, cache=mock_cache)
+
+        assert result == mock_user
+        mock_get_user.assert_not_called()
+        mock_cache.set_user.assert_not_awaited()
+        mock_cache.release_lock.assert_not_awaited()
+
 
 class TestRoleBasedAccess:
 
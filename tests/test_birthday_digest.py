@@ -0,0 +1,167 @@
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database.models import Base, Contact, User
+from src.repository.contacts import ContactRepository
+from src.workers.birthday_digest import BirthdayDigestJob
+
+START = date(2026, 12, 29)
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with factory() as session:
+        users = [
+            User(id=1, username="alice", email="alice@example.com", confirmed=True),
+            User(id=2, username="bob", email="bob@example.com", confirmed=True),
+            User(id=3, username="carol", email="carol@example.com", confirmed=False),
+        ]
+        for user in users:
+            user.hashed_password = "hashed_password"
+        session.add_all(users)
+        session.add_all(
+            [
+                contact(1, "Jan", date(1990, 1, 2)),
+                contact(1, "Dec", date(1985, 12, 30)),
+                contact(1, "June", date(1990, 6, 1)),
+                contact(2, "Leap", date(1992, 2, 29)),
+                contact(2, "Eve", date(1991, 12, 31)),
+                contact(3, "Hidden", date(1990, 12, 30)),
+            ]
+        )
+        await session.commit()
+    yield factory
+    await engine.dispose()
+
+
+def contact(user_id, first_name, birth_date):
+    return Contact(
+        first_name=first_name,
+        last_name="Doe",
+        email=f"{first_name.lower()}@example.com",
+        phone="+1234567890",
+        birth_date=birth_date,
+        user_id=user_id,
+    )
+
+
+@pytest.fixture
+def email_service():
+    service = AsyncMock()
+    service.build_birthday_digest.side_effect = lambda email, *_: {"To": email}
+    service.send_batch.side_effect = lambda messages: [None] * len(messages)
+    return service
+
+
+@pytest.fixture
+def job(email_service, session_factory):
+    return BirthdayDigestJob(
+        email_service,
+        session_factory=session_factory,
+        days=7,
+        batch_size=10,
+        fetch_size=2,
+        progress_seconds=0,
+    )
+
+
+class TestStreamUpcomingBirthdays:
+    async def test_groups_rows_by_user_across_year_end(self, session_factory):
+        async with session_factory() as session:
+            batches = ContactRepository(session).stream_upcoming_birthdays(
+                START, 7, batch_size=2
+            )
+            rows = [row async for batch in batches for row in batch]
+
+        assert [(row.user_id, row.first_name) for row in rows] == [
+            (1, "Dec"),
+            (1, "Jan"),
+            (2, "Eve"),
+        ]
+        assert rows[0].user_email == "alice@example.com"
+        assert rows[0].username == "alice"
+
+    async def test_empty_window(self, session_factory):
+        async with session_factory() as session:
+            batches = ContactRepository(session).stream_upcoming_birthdays(START, 0)
+            assert [batch async for batch in batches] == []
+
+
+class TestBirthdayDigestJob:
+    async def test_sends_one_digest_per_user(self, job, email_service):
+        stats = await job.run(START)
+
+        assert email_service.build_birthday_digest.await_count == 2
+        alice, bob = email_service.build_birthday_digest.await_args_list
+        assert alice.args == (
+            "alice@example.com",
+            "alice",
+            [
+                {"name": "Dec Doe", "email": "dec@example.com", "date": "December 30"},
+                {"name": "Jan Doe", "email": "jan@example.com", "date": "January 2"},
+            ],
+            7,
+        )
+        assert bob.args[0] == "bob@example.com"
+        assert [entry["name"] for entry in bob.args[2]] == ["Eve Doe"]
+        email_service.send_batch.assert_awaited_once_with(
+            [{"To": "alice@example.com"}, {"To": "bob@example.com"}]
+        )
+        assert {k: stats[k] for k in ("users", "contacts", "sent", "failed")} == {
+            "users": 2,
+            "contacts": 3,
+            "sent": 2,
+            "failed": 0,
+        }
+
+    async def test_sends_in_batches(self, job, email_service):
+        job.batch_size = 1
+
+        await job.run(START)
+
+        assert email_service.send_batch.await_count == 2
+
+    async def test_counts_failed_digests(self, job, email_service):
+        email_service.send_batch.side_effect = None
+        email_service.send_batch.return_value = [None, ConnectionError("down")]
+
+        stats = await job.run(START)
+
+        assert stats["sent"] == 1
+        assert stats["failed"] == 1
+
+    async def test_leap_day_in_common_year(self, job, email_service):
+        await job.run(date(2027, 2, 22))
+
+        [call] = email_service.build_birthday_digest.await_args_list
+        assert call.args[0] == "bob@example.com"
+        assert call.args[2][0]["date"] == "February 29"
+
+    async def test_no_birthdays_sends_nothing(self, job, email_service):
+        stats = await job.run(date(2026, 3, 1))
+
+        email_service.send_batch.assert_not_awaited()
+        assert stats["users"] == 0
+
+    async def test_read_error_propagates(self, job, email_service):
+        async def broken(*args, **kwargs):
+            raise RuntimeError("replica down")
+            yield
+
+        job.digests = broken
+
+        with pytest.raises(RuntimeError):
+            await job.run(START)
+
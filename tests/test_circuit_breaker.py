@@ -0,0 +1,93 @@
+import pytest
+
+from src.database.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker(failure_threshold=3, reset_timeout=60, half_open_max_calls=1)
+
+
+class TestCircuitBreaker:
+    def test_closed_allows_calls(self, breaker):
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow()
+
+    def test_opens_after_threshold(self, breaker):
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        assert breaker.rejected_calls == 1
+        assert breaker.times_opened == 1
+
+    def test_success_resets_failures(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_limits_probes(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.reset_timeout = 0
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+    def test_released_probe_frees_slot(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.reset_timeout = 0
+        assert breaker.allow()
+
+        breaker.release()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+
+    def test_lost_probe_expires(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.reset_timeout = 0
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.probe_timeout = 0
+
+        assert breaker.allow()
+
+    def test_failed_probe_reopens(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.reset_timeout = 0
+        assert breaker.allow()
+        breaker.reset_timeout = 60
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.times_opened == 2
+
+    def test_successful_probe_closes(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.reset_timeout = 0
+        assert breaker.allow()
+
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.as_dict() == {
+            "state": "closed",
+            "consecutive_failures": 0,
+            "rejected_calls": 0,
+            "times_opened": 1,
+        }
@@ -3,8 +3,17 @@ from unittest.mock import AsyncMock, MagicMock
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta, date
 
-from src.database.models import Contact, User, UserRole
-from src.repository.contacts import ContactRepository
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.database.models import Contact, User, UserRole, birthday_ordinal
+from src.repository.search import PostgresContactSearch, escape_like
+from src.repository.contacts import (
+    ContactRepository,
+    birthday_window,
+    encode_contact_cursor,
+    decode_contact_cursor,
+)
 from schemas import ContactCreate, ContactUpdate
 
 
@@ -143,21 +152,24 @@ class TestContactRepository:
             birth_date=date(1992, 3, 10),
             additional_data="New contact",
         )
+        created = Contact(id=5, **contact_data.model_dump(), user_id=user.id)
+        mock_result = MagicMock()
+        mock_result.scalar_one.return_value = created
+        mock_session.execute = AsyncMock(return_value=mock_result)
 
         result = await contact_repository.create_contact(body=contact_data, user=user)
 
-        assert isinstance(result, Contact)
-        assert result.first_name == "Alice"
-        assert result.last_name == "Johnson"
-        assert result.email == "alice.johnson@example.com"
-        assert result.phone == "+5555555555"
-        assert result.birth_date == date(1992, 3, 10)
-        assert result.additional_data == "New contact"
-        assert result.user_id == user.id
+        assert result is created
+        stmt = mock_session.execute.call_args.args[0]
+        params = stmt.compile().params
+        assert stmt.is_insert
+        assert params["first_name"] == "Alice"
+        assert params["birth_day_of_year"] == 70
+        assert params["user_id"] == user.id
 
-        mock_session.add.assert_called_once()
+        mock_session.execute.assert_awaited_once()
         mock_session.commit.assert_awaited_once()
-        mock_session.refresh.assert_awaited_once_with(result)
+        mock_session.refresh.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_update_contact(
@@ -168,50 +180,73 @@ class TestContactRepository:
                 "first_name": "John Updated",
                 "last_name": "Doe Updated",
                 "email": "john.updated@example.com",
+                "birth_date": "1990-02-01",
             }
         )
-
-        contact_repository.get_contact_by_id = AsyncMock(return_value=sample_contact)
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = sample_contact
+        mock_session.execute = AsyncMock(return_value=mock_result)
 
         result = await contact_repository.update_contact(
             contact_id=1, body=contact_data, user=user
         )
 
-        assert result is not None
-        assert sample_contact.first_name == "John Updated"
-        assert sample_contact.last_name == "Doe Updated"
-        assert sample_contact.email == "john.updated@example.com"
+        assert result is sample_contact
+        stmt = mock_session.execute.call_args.args[0]
+        params = stmt.compile().params
+        assert stmt.is_update
+        assert params["first_name"] == "John Updated"
+        assert params["last_name"] == "Doe Updated"
+        assert params["email"] == "john.updated@example.com"
+        assert params["birth_day_of_year"] == 32
 
+        mock_session.execute.assert_awaited_once()
         mock_session.commit.assert_awaited_once()
-        mock_session.refresh.assert_awaited_once_with(sample_contact)
+        mock_session.refresh.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_update_contact_partial(
         self, contact_repository, mock_session, user, sample_contact
     ):
-        original_email = sample_contact.email
         contact_data = ContactUpdate.model_validate({"first_name": "John Updated"})
-
-        contact_repository.get_contact_by_id = AsyncMock(return_value=sample_contact)
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = sample_contact
+        mock_session.execute = AsyncMock(return_value=mock_result)
 
         result = await contact_repository.update_contact(
             contact_id=1, body=contact_data, user=user
         )
 
         assert result is not None
-        assert sample_contact.first_name == "John Updated"
-        assert sample_contact.email == original_email
+        params = mock_session.execute.call_args.args[0].compile().params
+        assert params["first_name"] == "John Updated"
+        assert "email" not in params
+        assert "birth_day_of_year" not in params
 
         mock_session.commit.assert_awaited_once()
-        mock_session.refresh.assert_awaited_once_with(sample_contact)
+
+    @pytest.mark.asyncio
+    async def test_update_contact_without_changes(
+        self, contact_repository, mock_session, user, sample_contact
+    ):
+        contact_repository.get_contact_by_id = AsyncMock(return_value=sample_contact)
+
+        result = await contact_repository.update_contact(
+            contact_id=1, body=ContactUpdate(), user=user
+        )
+
+        assert result is sample_contact
+        mock_session.execute.assert_not_awaited()
+        mock_session.commit.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_update_contact_not_found(
         self, contact_repository, mock_session, user
     ):
         contact_data = ContactUpdate.model_validate({"first_name": "Updated Name"})
-
-        contact_repository.get_contact_by_id = AsyncMock(return_value=None)
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_session.execute = AsyncMock(return_value=mock_result)
 
         result = await contact_repository.update_contact(
             contact_id=999, body=contact_data, user=user
@@ -224,7 +259,9 @@ class TestContactRepository:
     async def test_remove_contact(
         self, contact_repository, mock_session, user, sample_contact
     ):
-        contact_repository.get_contact_by_id = AsyncMock(return_value=sample_contact)
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = sample_contact
+        mock_session.execute = AsyncMock(return_value=mock_result)
 
         result = await contact_repository.remove_contact(contact_id=1, user=user)
 
@@ -232,19 +269,22 @@ class TestContactRepository:
         assert result.first_name == "John"
         assert result.last_name == "Doe"
 
-        mock_session.delete.assert_awaited_once_with(sample_contact)
+        assert mock_session.execute.call_args.args[0].is_delete
+        mock_session.execute.assert_awaited_once()
+        mock_session.delete.assert_not_awaited()
         mock_session.commit.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_remove_contact_not_found(
         self, contact_repository, mock_session, user
     ):
-        contact_repository.get_contact_by_id = AsyncMock(return_value=None)
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_session.execute = AsyncMock(return_value=mock_result)
 
         result = await contact_repository.remove_contact(contact_id=999, user=user)
 
         assert result is None
-        mock_session.delete.assert_not_awaited()
         mock_session.commit.assert_not_awaited()
 
     @pytest.mark.asyncio
@@ -302,3 +342,112 @@ class TestContactRepository:
 
         assert len(contacts) == 0
         assert isinstance(contacts, list)
+
+    @pytest.mark.asyncio
+    async def test_get_contacts_page_returns_next_cursor(
+        self, contact_repository, mock_session, user, sample_contacts
+    ):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = sample_contacts
+        mock_session.execute = AsyncMock(return_value=mock_result)
+
+        contacts, next_cursor = await contact_repository.get_contacts_page(
+            limit=2, user=user
+        )
+
+        assert len(contacts) == 2
+        assert decode_contact_cursor(next_cursor) == (user.id, "Smith", "Jane", 2)
+
+    @pytest.mark.asyncio
+    async def test_get_contacts_page_last_page(
+        self, contact_repository, mock_session, user, sample_contacts
+    ):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = sample_contacts
+        mock_session.execute = AsyncMock(return_value=mock_result)
+
+        cursor = encode_contact_cursor(sample_contacts[0])
+        contacts, next_cursor = await contact_repository.get_contacts_page(
+            limit=10, user=user, cursor=cursor
+        )
+
+        assert len(contacts) == 2
+        assert next_cursor is None
+        mock_session.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_contacts_page_invalid_cursor(
+        self, contact_repository, mock_session, user
+    ):
+        with pytest.raises(ValueError):
+            await contact_repository.get_contacts_page(
+                limit=10, user=user, cursor="not-a-cursor"
+            )
+        mock_session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_contacts_page_rejects_foreign_cursor(
+        self, contact_repository, mock_session, user, sample_contact
+    ):
+        sample_contact.user_id = 2
+        cursor = encode_contact_cursor(sample_contact)
+
+        with pytest.raises(ValueError):
+            await contact_repository.get_contacts_page(
+                limit=10, user=user, cursor=cursor
+            )
+
+
+class TestContactSearch:
+
+    def test_escape_like(self):
+        assert escape_like("100%_a\\b") == "100\\%\\_a\\\\b"
+
+    def test_postgres_search_uses_ilike_and_similarity(self):
+        engine = PostgresContactSearch()
+        stmt = engine.apply(select(Contact), "john").order_by(engine.rank("john"))
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "ILIKE" in sql
+        assert "word_similarity" in sql
+
+
+class TestBirthdayWindow:
+
+    def test_birthday_ordinal_ignores_leap_years(self):
+        assert birthday_ordinal(date(1990, 3, 1)) == 61
+        assert birthday_ordinal(date(1992, 2, 29)) == 60
+        assert birthday_ordinal(date(1992, 3, 1)) == 61
+        assert birthday_ordinal(date(1991, 12, 31)) == 366
+
+    def test_contact_sets_birth_day_of_year(self, sample_contact):
+        assert sample_contact.birth_day_of_year == 15
+
+        sample_contact.birth_date = date(1990, 2, 1)
+
+        assert sample_contact.birth_day_of_year == 32
+
+    def test_window_within_year(self):
+        assert birthday_window(date(2025, 5, 10), 7) == (131, 137)
+
+    def test_window_wraps_year_end(self):
+        first, last = birthday_window(date(2025, 12, 28), 7)
+
+        assert first == birthday_ordinal(date(2000, 12, 28))
+        assert last == birthday_ordinal(date(2000, 1, 3))
+        assert first > last
+
+    def test_window_ending_feb_28_includes_feb_29_in_common_year(self):
+        assert birthday_window(date(2025, 2, 26), 3) == (57, 60)
+
+    def test_window_ending_feb_28_in_leap_year(self):
+        assert birthday_window(date(2024, 2, 26), 3) == (57, 59)
+
+    def test_window_spanning_feb_29_in_common_year(self):
+        first, last = birthday_window(date(2025, 2, 27), 3)
+
+        assert first <= 60 <= last
+
+    def test_window_full_year(self):
+        assert birthday_window(date(2025, 6, 1), 366) is None
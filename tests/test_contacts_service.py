@@ -1,11 +1,14 @@
+import orjson
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from datetime import date, datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.services.contacts import ContactService
+from src.services.contacts import ContactService, ResultCacheStats
+from src.database.db import sessionmanager
 from src.repository.contacts import ContactRepository
 from src.database.models import User, Contact, UserRole
+from src.database.redis_db import RedisCache
 from schemas import ContactCreate, ContactUpdate
 from datetime import datetime, timedelta
 
@@ -540,3 +543,208 @@ class TestContactServiceEdgeCases:
         contact_service.repository.get_contacts.assert_called_once_with(
             1000, 10, sample_user, None
         )
+
+
+class TestContactImport:
+
+    @staticmethod
+    async def _rows(items):
+        for item in items:
+            yield item
+
+    @pytest.mark.asyncio
+    async def test_import_contacts_in_chunks(
+        self, contact_service, sample_user, monkeypatch
+    ):
+        monkeypatch.setattr("src.services.contacts.IMPORT_CHUNK_SIZE", 2)
+        contact_service.repository.bulk_create_contacts = AsyncMock(
+            side_effect=lambda rows, user: len(rows)
+        )
+        valid = {
+            "first_name": "A",
+            "last_name": "B",
+            "email": "a@example.com",
+            "phone": "1",
+            "birth_date": "1990-01-01",
+        }
+        rows = [(1, valid), (2, valid), (3, "Invalid JSON"), (4, valid)]
+
+        result = await contact_service.import_contacts(self._rows(rows), sample_user)
+
+        assert result.imported == 3
+        assert result.failed == 1
+        assert result.errors[0].row == 3
+        chunk_sizes = [
+            len(call.args[0])
+            for call in contact_service.repository.bulk_create_contacts.call_args_list
+        ]
+        assert chunk_sizes == [2, 1]
+
+
+class TestContactResultCache:
+
+    @pytest.fixture
+    def mock_cache(self):
+        cache = AsyncMock(spec=RedisCache)
+        cache.get_contacts_result.return_value = (3, None, False)
+        return cache
+
+    @pytest.fixture
+    def cached_service(self, mock_db, mock_cache):
+        return ContactService(mock_db, mock_cache)
+
+    @pytest.fixture
+    def stats(self, monkeypatch):
+        stats = ResultCacheStats()
+        monkeypatch.setattr("src.services.contacts.contacts_cache_stats", stats)
+        return stats
+
+    @pytest.mark.asyncio
+    async def test_miss_loads_and_stores(
+        self, cached_service, mock_cache, sample_user, sample_contact, stats
+    ):
+        cached_service.repository.get_contacts = AsyncMock(
+            return_value=[sample_contact]
+        )
+
+        contacts, next_cursor = await cached_service.list_contacts(
+            0, 10, sample_user
+        )
+
+        assert contacts[0]["email"] == "john.doe@example.com"
+        assert contacts[0]["birth_date"] == "1990-01-15"
+        assert next_cursor is None
+        user_id, generation, query_hash, payload = (
+            mock_cache.set_contacts_result.await_args.args
+        )
+        assert (user_id, generation) == (1, 3)
+        assert orjson.loads(payload)["result"] == [contacts, None]
+        assert stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_database(
+        self, cached_service, mock_cache, sample_user, stats
+    ):
+        cached = {"db_seconds": 0.25, "result": [[{"id": 7}], "cursor"]}
+        mock_cache.get_contacts_result.return_value = (
+            3,
+            orjson.dumps(cached),
+            False,
+        )
+        cached_service.repository.get_contacts = AsyncMock()
+
+        contacts, next_cursor = await cached_service.list_contacts(
+            0, 10, sample_user
+        )
+
+        assert contacts == [{"id": 7}]
+        assert next_cursor == "cursor"
+        cached_service.repository.get_contacts.assert_not_called()
+        mock_cache.set_contacts_result.assert_not_awaited()
+        assert stats.as_dict()["hit_ratio"] == 1.0
+        assert stats.db_seconds_saved == 0.25
+
+    @pytest.mark.asyncio
+    async def test_query_parameters_in_key(
+        self, cached_service, mock_cache, sample_user, stats
+    ):
+        cached_service.repository.get_contacts = AsyncMock(return_value=[])
+
+        await cached_service.list_contacts(0, 10, sample_user)
+        await cached_service.list_contacts(0, 10, sample_user, search="john")
+
+        first, second = mock_cache.get_contacts_result.await_args_list
+        assert first.args[1] != second.args[1]
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_not_stored(
+        self, cached_service, mock_cache, sample_user, stats
+    ):
+        mock_cache.get_contacts_result.return_value = (None, None, False)
+        cached_service.repository.get_upcoming_birthdays = AsyncMock(return_value=[])
+
+        assert await cached_service.get_upcoming_birthdays(sample_user, 7) == []
+        mock_cache.set_contacts_result.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_birthdays_keyed_by_date(
+        self, cached_service, mock_cache, sample_user, stats, monkeypatch
+    ):
+        cached_service.repository.get_upcoming_birthdays = AsyncMock(return_value=[])
+
+        class FakeDate(date):
+            current = date(2025, 3, 1)
+
+            @classmethod
+            def today(cls):
+                return cls.current
+
+        monkeypatch.setattr("src.services.contacts.date", FakeDate)
+        await cached_service.get_upcoming_birthdays(sample_user, 7)
+        FakeDate.current = date(2025, 3, 2)
+        await cached_service.get_upcoming_birthdays(sample_user, 7)
+
+        first, second = mock_cache.get_contacts_result.await_args_list
+        assert first.args[1] != second.args[1]
+
+    @pytest.mark.asyncio
+    async def test_replica_read_after_write_not_stored(
+        self, cached_service, mock_cache, sample_user, stats, monkeypatch
+    ):
+        mock_cache.get_contacts_result.return_value = (4, None, True)
+        cached_service.repository.get_contacts = AsyncMock(return_value=[])
+        monkeypatch.setattr(sessionmanager, "is_replica", lambda session: True)
+
+        assert await cached_service.list_contacts(0, 10, sample_user) == ([], None)
+        mock_cache.set_contacts_result.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_primary_read_after_write_stored(
+        self, cached_service, mock_cache, sample_user, stats, monkeypatch
+    ):
+        mock_cache.get_contacts_result.return_value = (4, None, True)
+        cached_service.repository.get_contacts = AsyncMock(return_value=[])
+        monkeypatch.setattr(sessionmanager, "is_replica", lambda session: False)
+
+        await cached_service.list_contacts(0, 10, sample_user)
+
+        mock_cache.set_contacts_result.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_import_invalidates_committed_chunks(
+        self, cached_service, mock_cache, sample_user, monkeypatch
+    ):
+        monkeypatch.setattr("src.services.contacts.IMPORT_CHUNK_SIZE", 1)
+        cached_service.repository.bulk_create_contacts = AsyncMock(return_value=1)
+
+        async def rows():
+            yield 1, {
+                "first_name": "A",
+                "last_name": "B",
+                "email": "a@example.com",
+                "phone": "1",
+                "birth_date": "1990-01-01",
+            }
+            yield 2, {"first_name": "C"}
+            raise ConnectionError("client went away")
+
+        with pytest.raises(ConnectionError):
+            await cached_service.import_contacts(rows(), sample_user)
+
+        mock_cache.bump_contacts_generation.assert_awaited_once_with(sample_user.id)
+
+    @pytest.mark.asyncio
+    async def test_writes_bump_generation(
+        self, cached_service, mock_cache, sample_user, sample_contact
+    ):
+        repository = cached_service.repository
+        repository.create_contact = AsyncMock(return_value=sample_contact)
+        repository.update_contact = AsyncMock(return_value=sample_contact)
+        repository.remove_contact = AsyncMock(return_value=None)
+
+        await cached_service.create_contact(MagicMock(), sample_user)
+        await cached_service.update_contact(1, MagicMock(), sample_user)
+        await cached_service.remove_contact(1, sample_user)
+
+        assert mock_cache.bump_contacts_generation.await_count == 2
+        mock_cache.bump_contacts_generation.assert_awaited_with(sample_user.id)
@@ -0,0 +1,335 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database.models import Base, EmailOutbox, EmailStatus
+from src.database.redis_db import RedisCache
+from src.repository.email_outbox import EmailOutboxRepository, utcnow
+from src.services.email_outbox import (
+    EMAIL_BUDGET_KEY,
+    PASSWORD_RESET_EMAIL,
+    VERIFY_EMAIL,
+    EmailOutboxService,
+)
+from src.workers.email_outbox import OutboxWorker
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(bind=engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def email_service():
+    service = AsyncMock()
+    service.build_verification_email.side_effect = lambda email, *_: f"verify {email}"
+    service.build_password_reset_email.side_effect = lambda email, *_: f"reset {email}"
+    service.send_batch.side_effect = lambda messages: [None] * len(messages)
+    return service
+
+
+@pytest.fixture
+def worker(email_service, session_factory):
+    return OutboxWorker(
+        email_service,
+        session_factory=session_factory,
+        batch_size=10,
+        max_attempts=3,
+        retry_base=30,
+        retry_max=3600,
+        lease_seconds=300,
+        poll_interval=0.01,
+    )
+
+
+async def enqueue(session_factory, kind=VERIFY_EMAIL, email="user@example.com"):
+    async with session_factory() as session:
+        return await EmailOutboxService(session).enqueue(
+            kind, email, "testuser", "http://testserver/"
+        )
+
+
+@pytest.fixture
+def cache():
+    cache = AsyncMock(spec=RedisCache)
+    cache.claim_once.return_value = True
+    cache.rate_limit.return_value = (True, 0.0, 10)
+    return cache
+
+
+async def count_messages(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(select(EmailOutbox))
+        return len(result.scalars().all())
+
+
+async def get_message(session_factory, message_id):
+    async with session_factory() as session:
+        return await session.get(EmailOutbox, message_id)
+
+
+class TestEmailOutboxService:
+    async def test_stage_rejects_unknown_kind(self, session_factory):
+        async with session_factory() as session:
+            with pytest.raises(ValueError):
+                EmailOutboxService(session).stage(
+                    "newsletter", "user@example.com", "testuser", "http://host/"
+                )
+
+    async def test_stage_is_committed_with_transaction(self, session_factory):
+        async with session_factory() as session:
+            EmailOutboxService(session).stage(
+                VERIFY_EMAIL, "user@example.com", "testuser", "http://host/"
+            )
+            await session.rollback()
+
+        async with session_factory() as session:
+            result = await session.execute(select(EmailOutbox))
+            assert result.scalars().all() == []
+
+    async def test_enqueue_stores_pending_message(self, session_factory):
+        message = await enqueue(session_factory, PASSWORD_RESET_EMAIL)
+
+        stored = await get_message(session_factory, message.id)
+        assert stored.kind == PASSWORD_RESET_EMAIL
+        assert stored.recipient == "user@example.com"
+        assert stored.payload == {"username": "testuser", "host": "http://testserver/"}
+        assert stored.status == EmailStatus.PENDING
+        assert stored.attempts == 0
+
+
+class TestEnqueueOnce:
+    async def enqueue_once(self, session_factory, cache, email="User@Example.com"):
+        async with session_factory() as session:
+            return await EmailOutboxService(session, cache).enqueue_once(
+                VERIFY_EMAIL, email, "testuser", "http://testserver/"
+            )
+
+    async def test_queues_first_email(self, session_factory, cache):
+        assert await self.enqueue_once(session_factory, cache) is True
+
+        assert await count_messages(session_factory) == 1
+        cache.claim_once.assert_awaited_once_with(
+            "email:dedup:verify_email:user@example.com", 600
+        )
+        assert cache.rate_limit.await_args.args[0] == EMAIL_BUDGET_KEY
+
+    async def test_drops_duplicate(self, session_factory, cache):
+        cache.claim_once.return_value = False
+
+        assert await self.enqueue_once(session_factory, cache) is False
+
+        assert await count_messages(session_factory) == 0
+        cache.rate_limit.assert_not_awaited()
+
+    async def test_drops_over_budget(self, session_factory, cache):
+        cache.rate_limit.return_value = (False, 7.2, 0)
+
+        assert await self.enqueue_once(session_factory, cache) is False
+
+        assert await count_messages(session_factory) == 0
+        cache.release_claim.assert_awaited_once_with(
+            "email:dedup:verify_email:user@example.com"
+        )
+
+    async def test_releases_claim_when_queueing_fails(self, session_factory, cache):
+        with pytest.raises(ValueError):
+            async with session_factory() as session:
+                await EmailOutboxService(session, cache).enqueue_once(
+                    "unknown", "user@example.com", "testuser", "http://testserver/"
+                )
+
+        cache.release_claim.assert_awaited_once_with(
+            "email:dedup:unknown:user@example.com"
+        )
+
+    async def test_queues_while_redis_down(self, session_factory, cache):
+        cache.claim_once.return_value = None
+        cache.rate_limit.return_value = None
+
+        assert await self.enqueue_once(session_factory, cache) is True
+
+        assert await count_messages(session_factory) == 1
+
+    async def test_queues_without_cache(self, session_factory):
+        assert await self.enqueue_once(session_factory, None) is True
+
+
+class TestEmailOutboxRepository:
+    async def test_claim_due_leases_messages(self, session_factory):
+        message = await enqueue(session_factory)
+
+        async with session_factory() as session:
+            claimed = await EmailOutboxRepository(session).claim_due(10, 300)
+        async with session_factory() as session:
+            again = await EmailOutboxRepository(session).claim_due(10, 300)
+
+        assert [m.id for m in claimed] == [message.id]
+        assert claimed[0].status == EmailStatus.SENDING
+        assert claimed[0].attempts == 1
+        assert claimed[0].next_attempt_at > utcnow() + timedelta(seconds=290)
+        assert again == []
+
+    async def test_claim_due_reclaims_expired_lease(self, session_factory):
+        message = await enqueue(session_factory)
+        async with session_factory() as session:
+            await EmailOutboxRepository(session).claim_due(10, 300)
+            await session.execute(
+                update(EmailOutbox).values(next_attempt_at=utcnow() - timedelta(1))
+            )
+            await session.commit()
+
+        async with session_factory() as session:
+            claimed = await EmailOutboxRepository(session).claim_due(10, 300)
+
+        assert [m.id for m in claimed] == [message.id]
+        assert claimed[0].attempts == 2
+
+    async def test_claim_due_skips_future_messages(self, session_factory):
+        await enqueue(session_factory)
+        async with session_factory() as session:
+            await session.execute(
+                update(EmailOutbox).values(next_attempt_at=utcnow() + timedelta(1))
+            )
+            await session.commit()
+
+        async with session_factory() as session:
+            assert await EmailOutboxRepository(session).claim_due(10, 300) == []
+
+    async def test_outcome_of_lost_lease_is_ignored(self, session_factory):
+        message = await enqueue(session_factory)
+        async with session_factory() as session:
+            [stale] = await EmailOutboxRepository(session).claim_due(10, 300)
+            await session.execute(
+                update(EmailOutbox).values(next_attempt_at=utcnow() - timedelta(1))
+            )
+            await session.commit()
+        async with session_factory() as session:
+            [current] = await EmailOutboxRepository(session).claim_due(10, 300)
+
+        async with session_factory() as session:
+            repository = EmailOutboxRepository(session)
+            assert not await repository.mark_failed(
+                message.id, stale.attempts, "late", None
+            )
+            assert not await repository.mark_sent(message.id, stale.attempts)
+            assert await repository.mark_sent(message.id, current.attempts)
+
+        stored = await get_message(session_factory, message.id)
+        assert stored.status == EmailStatus.SENT
+        assert stored.last_error is None
+
+    async def test_count_by_status(self, session_factory):
+        await enqueue(session_factory)
+        await enqueue(session_factory)
+        async with session_factory() as session:
+            await EmailOutboxRepository(session).claim_due(1, 300)
+
+        async with session_factory() as session:
+            counts = await EmailOutboxRepository(session).count_by_status()
+
+        assert counts == {"pending": 1, "sending": 1}
+
+
+class TestOutboxWorker:
+    async def test_batch_with_failures(self, worker, email_service, session_factory):
+        first = await enqueue(session_factory, VERIFY_EMAIL, "a@example.com")
+        second = await enqueue(session_factory, VERIFY_EMAIL, "b@example.com")
+        email_service.send_batch.side_effect = None
+        email_service.send_batch.return_value = [None, ConnectionError("down")]
+
+        await worker.drain_once()
+
+        sent = await get_message(session_factory, first.id)
+        failed = await get_message(session_factory, second.id)
+        assert sent.status == EmailStatus.SENT
+        assert failed.status == EmailStatus.PENDING
+        assert failed.last_error == "ConnectionError: down"
+
+    async def test_sends_due_messages(self, worker, email_service, session_factory):
+        verify = await enqueue(session_factory, VERIFY_EMAIL, "a@example.com")
+        reset = await enqueue(session_factory, PASSWORD_RESET_EMAIL, "b@example.com")
+
+        assert await worker.drain_once() == 2
+
+        email_service.build_verification_email.assert_awaited_once_with(
+            "a@example.com", "testuser", "http://testserver/"
+        )
+        email_service.build_password_reset_email.assert_awaited_once_with(
+            "b@example.com", "testuser", "http://testserver/"
+        )
+        email_service.send_batch.assert_awaited_once_with(
+            ["verify a@example.com", "reset b@example.com"]
+        )
+        for message_id in (verify.id, reset.id):
+            stored = await get_message(session_factory, message_id)
+            assert stored.status == EmailStatus.SENT
+            assert stored.sent_at is not None
+        assert worker.as_dict() == {"sent": 2, "retried": 0, "dead": 0}
+
+    async def test_failed_send_is_retried_later(
+        self, worker, email_service, session_factory
+    ):
+        email_service.send_batch.side_effect = None
+        email_service.send_batch.return_value = [ConnectionError("down")]
+        message = await enqueue(session_factory)
+
+        await worker.drain_once()
+
+        stored = await get_message(session_factory, message.id)
+        assert stored.status == EmailStatus.PENDING
+        assert stored.last_error == "ConnectionError: down"
+        assert stored.next_attempt_at > utcnow() + timedelta(seconds=10)
+        assert worker.retried == 1
+        assert await worker.drain_once() == 0
+
+    async def test_dead_letters_after_max_attempts(
+        self, worker, email_service, session_factory
+    ):
+        email_service.send_batch.side_effect = None
+        email_service.send_batch.return_value = [ValueError("Sending failed")]
+        message = await enqueue(session_factory)
+
+        for _ in range(worker.max_attempts):
+            async with session_factory() as session:
+                await session.execute(
+                    update(EmailOutbox).values(next_attempt_at=utcnow())
+                )
+                await session.commit()
+            await worker.drain_once()
+
+        stored = await get_message(session_factory, message.id)
+        assert stored.status == EmailStatus.DEAD
+        assert stored.attempts == worker.max_attempts
+        assert stored.last_error == "ValueError: Sending failed"
+        assert worker.as_dict() == {"sent": 0, "retried": 2, "dead": 1}
+
+    async def test_unknown_kind_is_dead_lettered(self, worker, session_factory):
+        async with session_factory() as session:
+            message = EmailOutboxRepository(session).add(
+                "newsletter", "user@example.com", {}
+            )
+            await session.commit()
+
+        await worker.drain_once()
+
+        stored = await get_message(session_factory, message.id)
+        assert stored.status == EmailStatus.DEAD
+        assert stored.attempts == 1
+        assert stored.last_error == "ValueError: Unknown email kind: newsletter"
+
+    def test_retry_delay_backs_off_exponentially(self, worker):
+        for attempts, delay in ((1, 30), (2, 60), (3, 120), (10, 3600)):
+            assert delay / 2 <= worker.retry_delay(attempts) <= delay
@@ -1,9 +1,12 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
 from pathlib import Path
+
+import aiosmtplib
 from fastapi_mail.errors import ConnectionErrors
 
-from src.services.email import EmailService, send_email, send_password_reset_email
+from src.services.email import EmailService
 
 
 @pytest.fixture
@@ -32,170 +35,138 @@ class TestEmailService:
         assert hasattr(config, "MAIL_SERVER")
 
     @pytest.mark.asyncio
-    async def test_send_verification_email_success(self, email_service):
-        email = "test@example.com"
-        username = "testuser"
-        host = "http://localhost:8000"
-
-        with patch("src.services.email.FastMail") as mock_fastmail_class:
-            mock_fastmail = AsyncMock()
-            mock_fastmail_class.return_value = mock_fastmail
-            mock_fastmail.send_message = AsyncMock()
-
-            result = await email_service.send_verification_email(email, username, host)
+    async def test_build_verification_email(self, email_service):
+        message = await email_service.build_verification_email(
+            "test@example.com", "testuser", "http://localhost:8000/"
+        )
 
-            assert result is True
-            mock_fastmail.send_message.assert_called_once()
+        assert message["To"] == "test@example.com"
+        assert message["Subject"] == "Confirm your email - Contacts API"
+        html = message.get_payload()[0].get_payload(decode=True).decode()
+        assert "testuser" in html
+        assert "http://localhost:8000/" in html
 
     @pytest.mark.asyncio
-    async def test_send_verification_email_connection_error(self, email_service):
-        email = "test@example.com"
-        username = "testuser"
-        host = "http://localhost:8000"
+    async def test_build_password_reset_email(self, email_service):
+        message = await email_service.build_password_reset_email(
+            "test@example.com", "testuser", "http://localhost:8000/"
+        )
 
-        with patch("src.services.email.FastMail") as mock_fastmail_class:
-            mock_fastmail = AsyncMock()
-            mock_fastmail_class.return_value = mock_fastmail
-            mock_fastmail.send_message.side_effect = ConnectionErrors(
-                "Connection failed"
-            )
-
-            result = await email_service.send_verification_email(email, username, host)
-
-            assert result is False
+        assert message["To"] == "test@example.com"
+        assert message["Subject"] == "Password Reset - Contacts API"
 
     @pytest.mark.asyncio
-    async def test_send_verification_email_unexpected_error(self, email_service):
-        email = "test@example.com"
-        username = "testuser"
-        host = "http://localhost:8000"
-
-        with patch("src.services.email.FastMail") as mock_fastmail_class:
-            mock_fastmail = AsyncMock()
-            mock_fastmail_class.return_value = mock_fastmail
-            mock_fastmail.send_message.side_effect = Exception("Unexpected error")
+    async def test_build_escapes_username(self, email_service):
+        message = await email_service.build_verification_email(
+            "test@example.com", "<script>", "http://localhost:8000/"
+        )
 
-            result = await email_service.send_verification_email(email, username, host)
-
-            assert result is False
+        html = message.get_payload()[0].get_payload(decode=True).decode()
+        assert "<script>" not in html
+        assert "&lt;script&gt;" in html
+        domain = email_service.config.MAIL_FROM.rpartition("@")[2]
+        assert message["Message-ID"].endswith(f"@{domain}>")
 
     @pytest.mark.asyncio
-    async def test_send_password_reset_email_success(self, email_service):
-        email = "test@example.com"
-        username = "testuser"
-        host = "http://localhost:8000"
-
-        with patch("src.services.email.FastMail") as mock_fastmail_class:
-            mock_fastmail = AsyncMock()
-            mock_fastmail_class.return_value = mock_fastmail
-            mock_fastmail.send_message = AsyncMock()
-
-            result = await email_service.send_password_reset_email(
-                email, username, host
-            )
-
-            assert result is True
-            mock_fastmail.send_message.assert_called_once()
-
+    async def test_build_birthday_digest(self, email_service):
+        message = await email_service.build_birthday_digest(
+            "test@example.com",
+            "testuser",
+            [{"name": "<i>Eve</i>", "email": "eve@example.com", "date": "May 1"}],
+            7,
+        )
+
+        html = message.get_payload()[0].get_payload(decode=True).decode()
+        assert message["To"] == "test@example.com"
+        assert message["Subject"] == "Upcoming birthdays - Contacts API"
+        assert "One of your contacts has a birthday in the" in html
+        assert "&lt;i&gt;Eve&lt;/i&gt;" in html
+        assert "May 1" in html
+
+
+class FakeConnection:
+    def __init__(self, fail_on=()):
+        self.fail_on = fail_on
+        self.sent = []
+        self.rset = AsyncMock()
+
+    async def send_message(self, message):
+        if message in self.fail_on:
+            raise self.fail_on[message]
+        self.sent.append(message)
+
+
+class FakePool:
+    def __init__(self, size, fail_on=None, connect_errors=0):
+        self.size = size
+        self.fail_on = fail_on or {}
+        self.connect_errors = connect_errors
+        self.connections = []
+
+    @asynccontextmanager
+    async def connection(self):
+        if self.connect_errors:
+            self.connect_errors -= 1
+            raise ConnectionErrors("Connection refused")
+        connection = FakeConnection(self.fail_on)
+        self.connections.append(connection)
+        yield connection
+
+
+class TestSendBatch:
     @pytest.mark.asyncio
-    async def test_send_password_reset_email_connection_error(self, email_service):
-        email = "test@example.com"
-        username = "testuser"
-        host = "http://localhost:8000"
+    async def test_splits_batch_between_connections(self, email_service):
+        email_service.pool = FakePool(size=2)
 
-        with patch("src.services.email.FastMail") as mock_fastmail_class:
-            mock_fastmail = AsyncMock()
-            mock_fastmail_class.return_value = mock_fastmail
-            mock_fastmail.send_message.side_effect = ConnectionErrors(
-                "Connection failed"
-            )
+        results = await email_service.send_batch(["a", "b", "c", "d", "e"])
 
-            result = await email_service.send_password_reset_email(
-                email, username, host
-            )
-
-            assert result is False
+        assert results == [None] * 5
+        assert [c.sent for c in email_service.pool.connections] == [
+            ["a", "c", "e"],
+            ["b", "d"],
+        ]
 
     @pytest.mark.asyncio
-    async def test_send_password_reset_email_unexpected_error(self, email_service):
-        email = "test@example.com"
-        username = "testuser"
-        host = "http://localhost:8000"
-
-        with patch("src.services.email.FastMail") as mock_fastmail_class:
-            mock_fastmail = AsyncMock()
-            mock_fastmail_class.return_value = mock_fastmail
-            mock_fastmail.send_message.side_effect = Exception("Unexpected error")
-
-            result = await email_service.send_password_reset_email(
-                email, username, host
-            )
+    async def test_rejected_message_keeps_connection(self, email_service):
+        refused = aiosmtplib.SMTPRecipientRefused(550, "No such user", "b")
+        email_service.pool = FakePool(size=1, fail_on={"b": refused})
 
-            assert result is False
+        results = await email_service.send_batch(["a", "b", "c"])
 
-
-class TestEmailConvenienceFunctions:
+        assert results == [None, refused, None]
+        [connection] = email_service.pool.connections
+        assert connection.sent == ["a", "c"]
+        connection.rset.assert_awaited_once()
 
     @pytest.mark.asyncio
-    async def test_send_email_success(self):
-        email = "test@example.com"
-        username = "testuser"
-        host = "http://localhost:8000"
-
-        with patch(
-            "src.services.email.email_service.send_verification_email"
-        ) as mock_send:
-            mock_send.return_value = True
+    async def test_broken_connection_is_replaced(self, email_service):
+        disconnected = aiosmtplib.SMTPServerDisconnected("Connection lost")
+        email_service.pool = FakePool(size=1, fail_on={"b": disconnected})
 
-            await send_email(email, username, host)
+        results = await email_service.send_batch(["a", "b", "c"])
 
-            mock_send.assert_called_once_with(email, username, host)
+        assert results == [None, disconnected, None]
+        assert [c.sent for c in email_service.pool.connections] == [["a"], ["c"]]
 
     @pytest.mark.asyncio
-    async def test_send_email_failure(self):
-        email = "test@example.com"
-        username = "testuser"
-        host = "http://localhost:8000"
+    async def test_unexpected_error_fails_one_message(self, email_service):
+        invalid = ValueError("Message has no recipients")
+        email_service.pool = FakePool(size=1, fail_on={"b": invalid})
 
-        with patch(
-            "src.services.email.email_service.send_verification_email"
-        ) as mock_send:
-            mock_send.return_value = False
+        results = await email_service.send_batch(["a", "b", "c"])
 
-            with pytest.raises(Exception) as exc_info:
-                await send_email(email, username, host)
-
-            assert "Failed to send verification email" in str(exc_info.value)
-            mock_send.assert_called_once_with(email, username, host)
+        assert results == [None, invalid, None]
+        assert [c.sent for c in email_service.pool.connections] == [["a"], ["c"]]
 
     @pytest.mark.asyncio
-    async def test_send_password_reset_email_success(self):
-        email = "test@example.com"
-        username = "testuser"
-        host = "http://localhost:8000"
-
-        with patch(
-            "src.services.email.email_service.send_password_reset_email"
-        ) as mock_send:
-            mock_send.return_value = True
+    async def test_connect_failure_fails_one_message(self, email_service):
+        email_service.pool = FakePool(size=1, connect_errors=1)
 
-            await send_password_reset_email(email, username, host)
+        results = await email_service.send_batch(["a", "b"])
 
-            mock_send.assert_called_once_with(email, username, host)
+        assert isinstance(results[0], ConnectionErrors)
+        assert results[1] is None
 
     @pytest.mark.asyncio
-    async def test_send_password_reset_email_failure(self):
-        email = "test@example.com"
-        username = "testuser"
-        host = "http://localhost:8000"
-
-        with patch(
-            "src.services.email.email_service.send_password_reset_email"
-        ) as mock_send:
-            mock_send.return_value = False
-
-            with pytest.raises(Exception) as exc_info:
-                await send_password_reset_email(email, username, host)
-
-            assert "Failed to send password reset email" in str(exc_info.value)
-            mock_send.assert_called_once_with(email, username, host)
+    async def test_empty_batch(self, email_service):
+        assert await email_service.send_batch([]) == []
@@ -0,0 +1,78 @@
+import pytest
+from jinja2 import DictLoader, Environment
+
+from src.services.email_templates import (
+    EmailTemplate,
+    get_template,
+    template_env,
+)
+
+
+@pytest.fixture
+def env():
+    return Environment(
+        loader=DictLoader(
+            {
+                "plain.html": "<p>Hello {{ username }}</p><a href='{{ host }}'>x</a>",
+                "logic.html": "{% if username %}Hi {{ username }}{% endif %}",
+                "filter.html": "Hi {{ username | upper }}",
+            }
+        ),
+        autoescape=True,
+    )
+
+
+class TestEmailTemplate:
+    def test_substitutes_fields(self, env):
+        template = EmailTemplate(env, "plain.html")
+
+        assert template.fields == ("username", "host")
+        assert (
+            template.render(username="bob", host="http://h/")
+            == "<p>Hello bob</p><a href='http://h/'>x</a>"
+        )
+
+    def test_escapes_values(self, env):
+        template = EmailTemplate(env, "plain.html")
+
+        rendered = template.render(username="<b>bob</b>", host="x")
+
+        assert "&lt;b&gt;bob&lt;/b&gt;" in rendered
+        assert rendered == env.get_template("plain.html").render(
+            username="<b>bob</b>", host="x"
+        )
+
+    def test_missing_value_renders_empty(self, env):
+        template = EmailTemplate(env, "plain.html")
+
+        assert template.render(username="bob") == "<p>Hello bob</p><a href=''>x</a>"
+
+    @pytest.mark.parametrize("name", ["logic.html", "filter.html"])
+    def test_falls_back_to_jinja(self, env, name):
+        template = EmailTemplate(env, name)
+
+        assert template.fields is None
+        assert template.render(username="bob") == env.get_template(name).render(
+            username="bob"
+        )
+
+
+class TestGetTemplate:
+    def test_cached_per_process(self):
+        assert get_template("verify_email.html") is get_template("verify_email.html")
+
+    @pytest.mark.parametrize("name", ["verify_email.html", "password_reset_email.html"])
+    def test_matches_jinja_rendering(self, name):
+        values = {
+            "host": "http://localhost:8000/",
+            "username": "testuser",
+            "email": "test@example.com",
+            "token": "header.payload.signature",
+        }
+
+        template = get_template(name)
+
+        assert template.fields
+        assert template.render(**values) == template_env.get_template(name).render(
+            **values
+        )
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from src.services.hashing import Hash, HashExecutor, pwd_context
+
+
+@pytest.fixture
+def executor():
+    executor = HashExecutor(max_workers=1, queue_limit=1)
+    yield executor
+    executor.shutdown()
+
+
+class TestHashExecutor:
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_thread(self, executor):
+        name = await executor.run(lambda: threading.current_thread().name)
+
+        assert name.startswith("password-hash")
+        assert executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self, executor):
+        release = threading.Event()
+        running = asyncio.gather(
+            executor.run(release.wait), executor.run(release.wait)
+        )
+        await asyncio.sleep(0)
+        assert executor.pending == 2
+
+        with pytest.raises(HTTPException) as exc_info:
+            await executor.run(release.wait)
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "1"}
+        assert executor.as_dict()["rejected"] == 1
+
+        release.set()
+        assert await running == [True, True]
+        assert executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_slot_held_until_thread_finishes(self, executor):
+        release = threading.Event()
+        task = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert executor.pending == 1
+        release.set()
+        await asyncio.sleep(0.05)
+        assert executor.pending == 0
+
+
+class TestHashAsync:
+    def test_shares_crypt_context(self):
+        assert Hash().pwd_context is pwd_context
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self):
+        hash_util = Hash()
+
+        hashed_password = await hash_util.get_password_hash_async("secret123")
+
+        assert await hash_util.verify_password_async("secret123", hashed_password)
+        assert not await hash_util.verify_password_async("wrong", hashed_password)
@@ -6,12 +6,13 @@ from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 from unittest.mock import AsyncMock, patch
+from sqlalchemy import select
 from typing import Union
 
 from main import app
-from src.database.db import get_db
+from src.database.db import get_db, get_read_db
 from src.database.redis_db import get_redis_cache
-from src.database.models import Base, User, UserRole
+from src.database.models import Base, EmailOutbox, EmailStatus, User, UserRole
 from src.services.auth import (
     Hash,
     create_access_token,
@@ -56,9 +57,16 @@ async def get_test_redis():
     mock_redis.delete.return_value = None
     mock_redis.get_user.return_value = None
     mock_redis.set_user.return_value = None
+    mock_redis.rate_limit.return_value = (True, 0.0, 10)
     return mock_redis
 
 
+async def get_outbox() -> list[EmailOutbox]:
+    async with async_session_factory() as session:
+        result = await session.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+        return list(result.scalars().all())
+
+
 @pytest.fixture(scope="function")
 async def test_db_session():
     async with test_engine.begin() as conn:
@@ -142,6 +150,7 @@ def admin_auth_headers(admin_user: User):
 @pytest.fixture
 async def client(test_db_session):
     app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_read_db] = get_test_db
     app.dependency_overrides[get_redis_cache] = get_test_redis
 
     async with AsyncClient(
@@ -161,8 +170,7 @@ class TestAuthIntegration:
             "password": "newpassword123",
         }
 
-        with patch("src.api.auth.send_email") as mock_send_email:
-            response = await client.post("/api/auth/register", json=user_data)
+        response = await client.post("/api/auth/register", json=user_data)
 
         assert response.status_code == status.HTTP_201_CREATED
         data = response.json()
@@ -174,6 +182,15 @@ class TestAuthIntegration:
         assert "password" not in data
         assert "hashed_password" not in data
 
+        [message] = await get_outbox()
+        assert message.kind == "verify_email"
+        assert message.recipient == user_data["email"]
+        assert message.payload == {
+            "username": user_data["username"],
+            "host": "http://test/",
+        }
+        assert message.status == EmailStatus.PENDING
+
     async def test_register_user_duplicate_email(
         self, client: AsyncClient, confirmed_user: User
     ):
@@ -186,6 +203,7 @@ class TestAuthIntegration:
         response = await client.post("/api/auth/register", json=user_data)
 
         assert response.status_code == status.HTTP_409_CONFLICT
+        assert await get_outbox() == []
 
     async def test_register_user_duplicate_username(
         self, client: AsyncClient, confirmed_user: User
@@ -199,6 +217,7 @@ class TestAuthIntegration:
         response = await client.post("/api/auth/register", json=user_data)
 
         assert response.status_code == status.HTTP_409_CONFLICT
+        assert await get_outbox() == []
 
     async def test_register_user_invalid_email(self, client: AsyncClient):
         user_data = {
@@ -229,10 +248,9 @@ class TestAuthIntegration:
             "password": "adminpassword123",
         }
 
-        with patch("src.api.auth.send_email") as mock_send_email:
-            response = await client.post(
-                "/api/auth/register-admin", json=user_data, headers=admin_auth_headers
-            )
+        response = await client.post(
+            "/api/auth/register-admin", json=user_data, headers=admin_auth_headers
+        )
 
         assert response.status_code == status.HTTP_201_CREATED
         data = response.json()
@@ -240,6 +258,7 @@ class TestAuthIntegration:
         assert data["email"] == user_data["email"]
         assert data["confirmed"] is False
         assert data["role"] == "admin"
+        assert [m.recipient for m in await get_outbox()] == [user_data["email"]]
 
     async def test_register_admin_unauthorized(
         self, client: AsyncClient, auth_headers: dict
@@ -284,6 +303,7 @@ class TestAuthIntegration:
         assert "access_token" in data
         assert data["token_type"] == "bearer"
         assert len(data["access_token"]) > 0
+        assert len(data["refresh_token"]) > 0
 
     async def test_login_wrong_password(
         self, client: AsyncClient, confirmed_user: User
@@ -331,6 +351,26 @@ class TestAuthIntegration:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    async def test_login_rate_limited_before_password_check(
+        self, client: AsyncClient, confirmed_user: User
+    ):
+        redis = await get_test_redis()
+        redis.rate_limit.return_value = (False, 30.0, 0)
+        app.dependency_overrides[get_redis_cache] = lambda: redis
+
+        with patch.object(Hash, "verify_password") as mock_verify:
+            response = await client.post(
+                "/api/auth/login",
+                data={"username": confirmed_user.username, "password": "guess"},
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers["Retry-After"] == "30"
+        mock_verify.assert_not_called()
+        key = redis.rate_limit.await_args.args[0]
+        assert key.startswith("ratelimit:auth-login-ip:")
+
     async def test_login_missing_credentials(self, client: AsyncClient):
         response = await client.post(
             "/api/auth/login",
@@ -340,6 +380,169 @@ class TestAuthIntegration:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    async def _login(self, client: AsyncClient, username: str, password: str):
+        response = await client.post(
+            "/api/auth/login",
+            data={"username": username, "password": password},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+
+    async def test_refresh_tokens(self, client: AsyncClient, confirmed_user: User):
+        tokens = await self._login(client, confirmed_user.username, "testpassword123")
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["token_type"] == "bearer"
+        me = await client.get(
+            "/api/users/me",
+            headers={"Authorization": f"Bearer {data['access_token']}"},
+        )
+        assert me.status_code == status.HTTP_200_OK
+
+    async def test_refresh_token_claimed_concurrently(
+        self, client: AsyncClient, confirmed_user: User
+    ):
+        tokens = await self._login(client, confirmed_user.username, "testpassword123")
+        redis = await get_test_redis()
+        redis.is_token_revoked.return_value = False
+        # Another request revoked the token between the check and the claim
+        redis.revoke_token.return_value = False
+        app.dependency_overrides[get_redis_cache] = lambda: redis
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_refresh_fails_when_token_cannot_be_revoked(
+        self, client: AsyncClient, confirmed_user: User
+    ):
+        tokens = await self._login(client, confirmed_user.username, "testpassword123")
+        redis = await get_test_redis()
+        redis.is_token_revoked.return_value = False
+        redis.revoke_token.return_value = None
+        app.dependency_overrides[get_redis_cache] = lambda: redis
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert "access_token" not in response.json()
+
+    async def test_refresh_rejects_access_token(
+        self, client: AsyncClient, confirmed_user: User
+    ):
+        tokens = await self._login(client, confirmed_user.username, "testpassword123")
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["access_token"]}
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_refresh_token_not_accepted_as_access_token(
+        self, client: AsyncClient, confirmed_user: User
+    ):
+        tokens = await self._login(client, confirmed_user.username, "testpassword123")
+
+        response = await client.get(
+            "/api/users/me",
+            headers={"Authorization": f"Bearer {tokens['refresh_token']}"},
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_role_change_revokes_refresh_token(
+        self, client: AsyncClient, confirmed_user: User, admin_user: User
+    ):
+        user_tokens = await self._login(
+            client, confirmed_user.username, "testpassword123"
+        )
+        admin_tokens = await self._login(
+            client, admin_user.username, "adminpassword123"
+        )
+
+        response = await client.patch(
+            "/api/users/role",
+            json={"email": confirmed_user.email, "role": "admin"},
+            headers={"Authorization": f"Bearer {admin_tokens['access_token']}"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": user_tokens["refresh_token"]}
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_logout_revokes_tokens(
+        self, client: AsyncClient, confirmed_user: User
+    ):
+        tokens = await self._login(client, confirmed_user.username, "testpassword123")
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        response = await client.post(
+            "/api/auth/logout",
+            json={"refresh_token": tokens["refresh_token"]},
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.get("/api/users/me", headers=headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_logout_requires_token(self, client: AsyncClient):
+        response = await client.post("/api/auth/logout")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_admin_revokes_token(
+        self, client: AsyncClient, confirmed_user: User, admin_user: User
+    ):
+        user_tokens = await self._login(
+            client, confirmed_user.username, "testpassword123"
+        )
+        admin_tokens = await self._login(
+            client, admin_user.username, "adminpassword123"
+        )
+
+        response = await client.post(
+            "/api/auth/revoke",
+            json={"token": user_tokens["access_token"]},
+            headers={"Authorization": f"Bearer {admin_tokens['access_token']}"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.get(
+            "/api/users/me",
+            headers={"Authorization": f"Bearer {user_tokens['access_token']}"},
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_revoke_requires_admin(
+        self, client: AsyncClient, confirmed_user: User
+    ):
+        tokens = await self._login(client, confirmed_user.username, "testpassword123")
+
+        response = await client.post(
+            "/api/auth/revoke",
+            json={"token": tokens["refresh_token"]},
+            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
     async def test_confirmed_email_success(
         self, client: AsyncClient, unconfirmed_user: User
     ):
@@ -372,10 +575,12 @@ class TestAuthIntegration:
     ):
         email_data = {"email": unconfirmed_user.email}
 
-        with patch("src.api.auth.send_email") as mock_send_email:
-            response = await client.post("/api/auth/request_email", json=email_data)
+        response = await client.post("/api/auth/request_email", json=email_data)
 
         assert response.status_code == status.HTTP_200_OK
+        [message] = await get_outbox()
+        assert message.kind == "verify_email"
+        assert message.recipient == unconfirmed_user.email
 
     async def test_request_email_nonexistent_user(self, client: AsyncClient):
         email_data = {"email": "nonexistent@example.com"}
@@ -383,6 +588,21 @@ class TestAuthIntegration:
         response = await client.post("/api/auth/request_email", json=email_data)
 
         assert response.status_code == status.HTTP_200_OK
+        assert await get_outbox() == []
+
+    async def test_request_email_duplicate_not_queued(
+        self, client: AsyncClient, unconfirmed_user: User
+    ):
+        redis = await get_test_redis()
+        redis.claim_once.return_value = False
+        app.dependency_overrides[get_redis_cache] = lambda: redis
+
+        response = await client.post(
+            "/api/auth/request_email", json={"email": unconfirmed_user.email}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert await get_outbox() == []
 
     async def test_request_email_already_confirmed(
         self, client: AsyncClient, confirmed_user: User
@@ -405,12 +625,14 @@ class TestAuthIntegration:
     ):
         reset_data = {"email": confirmed_user.email}
 
-        with patch("src.api.auth.send_password_reset_email") as mock_send_email:
-            response = await client.post(
-                "/api/auth/request-password-reset", json=reset_data
-            )
+        response = await client.post(
+            "/api/auth/request-password-reset", json=reset_data
+        )
 
         assert response.status_code == status.HTTP_200_OK
+        [message] = await get_outbox()
+        assert message.kind == "password_reset"
+        assert message.recipient == confirmed_user.email
 
     async def test_request_password_reset_nonexistent_user(self, client: AsyncClient):
         reset_data = {"email": "nonexistent@example.com"}
@@ -420,6 +642,7 @@ class TestAuthIntegration:
         )
 
         assert response.status_code == status.HTTP_200_OK
+        assert await get_outbox() == []
 
     async def test_request_password_reset_invalid_email(self, client: AsyncClient):
         reset_data = {"email": "invalid-email-format"}
@@ -1,5 +1,7 @@
 import pytest
 import asyncio
+import json
+from contextlib import asynccontextmanager
 from datetime import date, datetime, timedelta
 from httpx import AsyncClient, ASGITransport, Response
 from fastapi import status
@@ -9,7 +11,7 @@ from unittest.mock import AsyncMock
 from typing import Union
 
 from main import app
-from src.database.db import get_db
+from src.database.db import get_db, get_read_db, get_read_session_factory
 from src.database.redis_db import get_redis_cache
 from src.database.models import Base, User, Contact, UserRole
 from src.services.auth import Hash, create_access_token
@@ -44,6 +46,16 @@ async def get_test_db():
             await session.close()
 
 
+@asynccontextmanager
+async def open_test_session():
+    async with async_session_factory() as session:
+        yield session
+
+
+def get_test_session_factory():
+    return open_test_session
+
+
 async def get_test_redis():
     mock_redis = AsyncMock()
     mock_redis.get.return_value = None
@@ -51,6 +63,8 @@ async def get_test_redis():
     mock_redis.delete.return_value = None
     mock_redis.get_user.return_value = None
     mock_redis.set_user.return_value = None
+    mock_redis.rate_limit.return_value = (True, 0.0, 10)
+    mock_redis.get_contacts_result.return_value = (None, None, False)
     return mock_redis
 
 
@@ -233,6 +247,8 @@ def admin_auth_headers(admin_user: User):
 @pytest.fixture
 async def client(test_db_session):
     app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_read_db] = get_test_db
+    app.dependency_overrides[get_read_session_factory] = get_test_session_factory
     app.dependency_overrides[get_redis_cache] = get_test_redis
 
     async with AsyncClient(
@@ -399,6 +415,39 @@ class TestContactsIntegration:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    async def test_search_substring_case_insensitive(
+        self, client: AsyncClient, auth_headers: dict, multiple_test_contacts: list
+    ):
+        response = await client.get("/api/contacts/?search=OHNS", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [c["last_name"] for c in data] == ["Johnson"]
+
+    async def test_search_short_term(
+        self, client: AsyncClient, auth_headers: dict, multiple_test_contacts: list
+    ):
+        response = await client.get("/api/contacts/?search=Bo", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [c["first_name"] for c in data] == ["Bob"]
+
+    async def test_search_after_update(
+        self, client: AsyncClient, auth_headers: dict, test_contact: Contact
+    ):
+        await client.patch(
+            f"/api/contacts/{test_contact.id}",
+            json={"last_name": "Zimmerman"},
+            headers=auth_headers,
+        )
+
+        response = await client.get("/api/contacts/?search=doe", headers=auth_headers)
+        assert response.json()[0]["last_name"] == "Zimmerman"  # email still matches
+
+        response = await client.get("/api/contacts/?search=zimmer", headers=auth_headers)
+        assert [c["id"] for c in response.json()] == [test_contact.id]
+
     async def test_search_no_results(
         self, client: AsyncClient, auth_headers: dict, multiple_test_contacts: list
     ):
@@ -410,6 +459,216 @@ class TestContactsIntegration:
         data = response.json()
         assert len(data) == 0
 
+    async def test_cursor_pagination(
+        self, client: AsyncClient, auth_headers: dict, multiple_test_contacts: list
+    ):
+        response = await client.get("/api/contacts/?limit=2", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.json()
+        assert [c["last_name"] for c in first_page] == ["Brown", "Johnson"]
+        cursor = response.headers["X-Next-Cursor"]
+
+        response = await client.get(
+            f"/api/contacts/?limit=2&cursor={cursor}", headers=auth_headers
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        second_page = response.json()
+        assert [c["last_name"] for c in second_page] == ["Smith"]
+        assert "X-Next-Cursor" not in response.headers
+
+    async def test_cursor_pagination_invalid_cursor(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        response = await client.get(
+            "/api/contacts/?cursor=garbage", headers=auth_headers
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_upcoming_birthdays_default_window(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        upcoming_birthday_contacts: list,
+    ):
+        response = await client.get(
+            "/api/contacts/upcoming-birthdays", headers=auth_headers
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        last_names = {c["last_name"] for c in response.json()}
+        assert {"Tomorrow", "NextWeek"} <= last_names
+        assert "TooFar" not in last_names
+
+    async def test_upcoming_birthdays_custom_window(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        upcoming_birthday_contacts: list,
+    ):
+        response = await client.get(
+            "/api/contacts/upcoming-birthdays?days=11", headers=auth_headers
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        last_names = [c["last_name"] for c in response.json()]
+        assert last_names[-2:] == ["NextWeek", "TooFar"]
+
+    async def test_upcoming_birthdays_invalid_window(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        response = await client.get(
+            "/api/contacts/upcoming-birthdays?days=0", headers=auth_headers
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_bulk_import_ndjson(self, client: AsyncClient, auth_headers: dict):
+        body = "\n".join(
+            [
+                '{"first_name": "Ann", "last_name": "Lee", "email": "ann@example.com",'
+                ' "phone": "+1-555-1001", "birth_date": "1991-04-02"}',
+                '{"first_name": "Bad", "last_name": "Row", "email": "not-an-email",'
+                ' "phone": "+1-555-1002", "birth_date": "1991-04-03"}',
+                "",
+                "{broken json",
+                '{"first_name": "Ben", "last_name": "Ray", "email": "ben@example.com",'
+                ' "phone": "+1-555-1003", "birth_date": "1988-11-30"}',
+            ]
+        )
+
+        response = await client.post(
+            "/api/contacts/bulk",
+            content=body.encode(),
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["failed"] == 2
+        assert [e["row"] for e in data["errors"]] == [2, 4]
+        assert data["errors"][0]["errors"][0].startswith("email:")
+        assert data["rows_per_second"] >= 0
+
+        contacts = (await client.get("/api/contacts/", headers=auth_headers)).json()
+        assert [c["first_name"] for c in contacts] == ["Ann", "Ben"]
+
+    async def test_bulk_import_csv(self, client: AsyncClient, auth_headers: dict):
+        body = (
+            "first_name,last_name,email,phone,birth_date,additional_data\r\n"
+            'Cat,Stone,cat@example.com,+1-555-2001,1979-02-28,"Met at work, 2019"\r\n'
+            "Dan,Moss,dan@example.com,+1-555-2002,1980-13-01,\r\n"
+        )
+
+        response = await client.post(
+            "/api/contacts/bulk",
+            content=body.encode(),
+            headers={**auth_headers, "Content-Type": "text/csv"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["imported"] == 1
+        assert data["failed"] == 1
+        assert data["errors"][0]["row"] == 2
+
+        contacts = (await client.get("/api/contacts/", headers=auth_headers)).json()
+        assert contacts[0]["additional_data"] == "Met at work, 2019"
+
+    async def test_bulk_import_reports_unreadable_lines(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        body = b"\n".join(
+            [
+                '{"first_name": "Zoë", "last_name": "Lee", "email": "zoe@example.com",'
+                ' "phone": "+1-555-1004", "birth_date": "1991-04-02"}'.encode(),
+                b'{"first_name": "\xff"}',
+                b"x" * (64 * 1024 + 1),
+                b'{"first_name": "Ben", "last_name": "Ray", "email": "ben@example.com",'
+                b' "phone": "+1-555-1003", "birth_date": "1988-11-30"}',
+            ]
+        )
+
+        async def chunks():
+            # Small chunks split the two-byte "ë" and the long line
+            for i in range(0, len(body), 7):
+                yield body[i : i + 7]
+
+        response = await client.post(
+            "/api/contacts/bulk",
+            content=chunks(),
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["errors"] == [
+            {"row": 2, "errors": ["Invalid UTF-8 at byte 17"]},
+            {"row": 3, "errors": ["Line is longer than 65536 bytes"]},
+        ]
+
+        contacts = (await client.get("/api/contacts/", headers=auth_headers)).json()
+        assert [c["first_name"] for c in contacts] == ["Zoë", "Ben"]
+
+    async def test_bulk_import_csv_unreadable_header(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        response = await client.post(
+            "/api/contacts/bulk",
+            content=b"first_name,\xe9mail\r\nAnn,ann@example.com\r\n",
+            headers={**auth_headers, "Content-Type": "text/csv"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Invalid header: Invalid UTF-8 at byte 12"
+
+    async def test_bulk_import_unsupported_media_type(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        response = await client.post(
+            "/api/contacts/bulk",
+            content=b"<contacts/>",
+            headers={**auth_headers, "Content-Type": "application/xml"},
+        )
+
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+    async def test_export_ndjson(
+        self, client: AsyncClient, auth_headers: dict, multiple_test_contacts: list
+    ):
+        response = await client.get("/api/contacts/export", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["last_name"] for r in rows] == ["Brown", "Johnson", "Smith"]
+        assert rows[0]["birth_date"] == "1988-12-25"
+
+    async def test_export_csv(
+        self, client: AsyncClient, auth_headers: dict, multiple_test_contacts: list
+    ):
+        response = await client.get(
+            "/api/contacts/export?format=csv", headers=auth_headers
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        lines = response.text.splitlines()
+        assert lines[0] == "id,first_name,last_name,email,phone,birth_date,additional_data"
+        assert len(lines) == 4
+        assert lines[1].split(",")[1:3] == ["Charlie", "Brown"]
+
+    async def test_export_invalid_format(self, client: AsyncClient, auth_headers: dict):
+        response = await client.get(
+            "/api/contacts/export?format=xml", headers=auth_headers
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
     async def test_update_contact_empty_fields(
         self, client: AsyncClient, auth_headers: dict, test_contact: Contact
     ):
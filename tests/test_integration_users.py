@@ -9,7 +9,7 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from io import BytesIO
 
 from main import app
-from src.database.db import get_db
+from src.database.db import get_db, get_read_db
 from src.database.redis_db import get_redis_cache
 from src.database.models import Base, User, UserRole
 from src.services.auth import Hash, create_access_token
@@ -52,6 +52,7 @@ async def get_test_redis():
     mock_redis.delete.return_value = None
     mock_redis.get_user.return_value = None
     mock_redis.set_user.return_value = None
+    mock_redis.rate_limit.return_value = (True, 0.0, 10)
     return mock_redis
 
 
@@ -163,6 +164,7 @@ def unconfirmed_admin_auth_headers(unconfirmed_admin_user: User):
 @pytest.fixture
 async def client(test_db_session):
     app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_read_db] = get_test_db
     app.dependency_overrides[get_redis_cache] = get_test_redis
 
     async with AsyncClient(
@@ -363,6 +365,29 @@ class TestUsersIntegration:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    async def test_metrics_admin_only(
+        self, client: AsyncClient, admin_auth_headers: dict
+    ):
+        cache = await get_test_redis()
+        cache.breaker = MagicMock()
+        cache.breaker.as_dict.return_value = {"state": "closed"}
+        app.dependency_overrides[get_redis_cache] = lambda: cache
+
+        response = await client.get("/api/metrics", headers=admin_auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["redis"] == {"circuit": {"state": "closed"}}
+
+    async def test_metrics_non_admin(self, client: AsyncClient, auth_headers: dict):
+        response = await client.get("/api/metrics", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_metrics_unauthorized(self, client: AsyncClient):
+        response = await client.get("/api/metrics")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
     async def test_malformed_auth_token(self, client: AsyncClient):
         headers = {"Authorization": "InvalidFormat token"}
 
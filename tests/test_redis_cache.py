@@ -0,0 +1,540 @@
+import asyncio
+import pickle
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
+
+from src.database.models import User, UserRole
+from src.database.redis_db import (
+    USER_CACHE_VERSION,
+    REVOKED_TOKENS_LOG,
+    USER_INVALIDATION_CHANNEL,
+    LocalTTLCache,
+    RedisCache,
+    decode_user,
+    encode_user,
+)
+
+
+@pytest.fixture
+def user():
+    return User(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        hashed_password="hashed_password",
+        avatar="http://example.com/avatar.png",
+        confirmed=True,
+        role=UserRole.ADMIN,
+    )
+
+
+def mock_pipeline(cache, results):
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=results)
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=None)
+    cache.redis.pipeline = MagicMock(return_value=pipe)
+    return pipe
+
+
+def user_reads(cache):
+    return [
+        call.args
+        for call in cache.redis.get.await_args_list
+        if call.args[0].startswith("user:")
+    ]
+
+
+@pytest.fixture
+def cache():
+    cache = RedisCache()
+    cache.redis = AsyncMock()
+    cache.redis.get.return_value = None
+    return cache
+
+
+class TestUserEncoding:
+    def test_round_trip(self, user):
+        decoded = decode_user(encode_user(user))
+
+        assert isinstance(decoded, User)
+        assert decoded.id == 1
+        assert decoded.username == "testuser"
+        assert decoded.email == "test@example.com"
+        assert decoded.avatar == "http://example.com/avatar.png"
+        assert decoded.confirmed is True
+        assert decoded.role is UserRole.ADMIN
+
+    def test_only_public_fields_stored(self, user):
+        data = orjson.loads(encode_user(user))
+
+        assert data["v"] == USER_CACHE_VERSION
+        assert "hashed_password" not in data
+        assert "contacts" not in data
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            orjson.dumps({"v": USER_CACHE_VERSION + 1, "id": 1}),
+            orjson.dumps({"v": USER_CACHE_VERSION, "id": 1}),
+            orjson.dumps([1, 2]),
+            b"not json",
+        ],
+    )
+    def test_unknown_payload_is_miss(self, payload):
+        assert decode_user(payload) is None
+
+
+class TestRedisCacheUsers:
+    @pytest.mark.asyncio
+    async def test_set_user(self, cache, user):
+        cache.redis.get.return_value = b"3"
+        cache.redis.setex.return_value = True
+
+        assert await cache.set_user("testuser", user, expire=60) is True
+
+        cache.redis.get.assert_awaited_once_with("epoch:user")
+        key, expire, payload = cache.redis.setex.await_args.args
+        assert (key, expire) == ("user:3:testuser", 60)
+        assert decode_user(payload).username == "testuser"
+
+    @pytest.mark.asyncio
+    async def test_get_user(self, cache, user):
+        values = {"epoch:user": b"3", "user:3:testuser": encode_user(user)}
+        cache.redis.get.side_effect = values.get
+
+        result = await cache.get_user("testuser")
+
+        assert result.id == user.id
+        assert [call.args for call in cache.redis.get.await_args_list] == [
+            ("epoch:user",),
+            ("user:3:testuser",),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_delete_user_publishes_in_pipeline(self, cache):
+        pipe = mock_pipeline(cache, [1, 0])
+
+        assert await cache.delete_user("testuser") is True
+        pipe.unlink.assert_called_once_with("user:0:testuser")
+        pipe.publish.assert_called_once_with(USER_INVALIDATION_CHANNEL, "testuser")
+
+    @pytest.mark.asyncio
+    async def test_clear_all_users_bumps_epoch(self, cache):
+        assert await cache.clear_all_users() is True
+
+        cache.redis.incr.assert_awaited_once_with("epoch:user")
+        cache.redis.publish.assert_awaited_once_with(USER_INVALIDATION_CHANNEL, "")
+        cache.redis.keys.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_purge_stale_keys(self, cache):
+        keys = [b"user:2:alice", b"user:1:bob", b"user:carol", b"user:2:dave"]
+
+        async def scan_iter(match, count):
+            assert (match, count) == ("user:*", 2)
+            for key in keys:
+                yield key
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(side_effect=lambda: [1] * len(pipe.unlink.mock_calls))
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=None)
+        cache.redis.get.return_value = b"2"
+        cache.redis.scan_iter = scan_iter
+        cache.redis.pipeline = MagicMock(return_value=pipe)
+
+        assert await cache.purge_stale_keys(batch_size=2) == 2
+
+        unlinked = [call.args[0] for call in pipe.unlink.mock_calls]
+        assert unlinked == [b"user:1:bob", b"user:carol"]
+        cache.redis.pipeline.assert_called_once_with(transaction=False)
+
+    @pytest.mark.asyncio
+    async def test_acquire_lock(self, cache):
+        cache.redis.set.return_value = True
+
+        token = await cache.acquire_lock("user-load:testuser", 5)
+
+        assert token
+        cache.redis.set.assert_awaited_once_with(
+            "lock:user-load:testuser", token, nx=True, px=5000
+        )
+
+    @pytest.mark.asyncio
+    async def test_acquire_lock_held_elsewhere(self, cache):
+        cache.redis.set.return_value = None
+
+        assert await cache.acquire_lock("user-load:testuser", 5) is None
+
+    @pytest.mark.asyncio
+    async def test_acquire_lock_fails_open(self, cache):
+        cache.redis.set.side_effect = ConnectionError("redis down")
+
+        assert await cache.acquire_lock("user-load:testuser", 5)
+
+    @pytest.mark.asyncio
+    async def test_release_lock_checks_token(self, cache):
+        cache.redis.evalsha.return_value = 1
+
+        assert await cache.release_lock("user-load:testuser", "token") is True
+        cache.redis.evalsha.assert_awaited_once_with(
+            cache.release_lock_script.sha, 1, "lock:user-load:testuser", "token"
+        )
+        cache.redis.eval.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_contacts_result(self, cache):
+        cache.redis.mget.return_value = [b"4", b"1"]
+        cache.redis.get.return_value = b"payload"
+
+        assert await cache.get_contacts_result(1, "abc") == (4, b"payload", True)
+        cache.redis.mget.assert_awaited_once_with(
+            "contacts:{1}:gen", "contacts:{1}:written"
+        )
+        cache.redis.get.assert_awaited_once_with("contacts:{1}:4:abc")
+
+    @pytest.mark.asyncio
+    async def test_get_contacts_result_first_generation(self, cache):
+        cache.redis.mget.return_value = [None, None]
+
+        assert await cache.get_contacts_result(1, "abc") == (0, None, False)
+        cache.redis.get.assert_awaited_once_with("contacts:{1}:0:abc")
+
+    @pytest.mark.asyncio
+    async def test_get_contacts_result_while_redis_down(self, cache):
+        cache.redis.mget.side_effect = ConnectionError("redis down")
+
+        assert await cache.get_contacts_result(1, "abc") == (None, None, False)
+
+    @pytest.mark.asyncio
+    async def test_set_contacts_result_uses_generation(self, cache):
+        cache.redis.setex.return_value = True
+
+        assert await cache.set_contacts_result(1, 4, "abc", b"payload", expire=60)
+        cache.redis.setex.assert_awaited_once_with(
+            "contacts:{1}:4:abc", 60, b"payload"
+        )
+
+    @pytest.mark.asyncio
+    async def test_bump_contacts_generation_marks_write(self, cache):
+        pipe = mock_pipeline(cache, [5, True])
+
+        assert await cache.bump_contacts_generation(1, written_seconds=5) is True
+
+        pipe.incr.assert_called_once_with("contacts:{1}:gen")
+        pipe.set.assert_called_once_with("contacts:{1}:written", 1, px=5000)
+        cache.redis.pipeline.assert_called_once_with(transaction=True)
+
+    @pytest.mark.asyncio
+    async def test_revoke_token(self, cache):
+        cache.redis.evalsha.return_value = 1700000000000
+
+        assert await cache.revoke_token("abc", 60, 3600) is True
+        cache.redis.evalsha.assert_awaited_once_with(
+            cache.revoke_token_script.sha,
+            2,
+            "revoked:abc",
+            REVOKED_TOKENS_LOG,
+            "abc",
+            60,
+            3600,
+        )
+
+    @pytest.mark.asyncio
+    async def test_revoke_token_already_revoked(self, cache):
+        cache.redis.evalsha.return_value = 0
+
+        assert await cache.revoke_token("abc", 60, 3600) is False
+
+    @pytest.mark.asyncio
+    async def test_revocation_unknown_while_redis_down(self, cache):
+        cache.redis.exists.side_effect = ConnectionError("redis down")
+        cache.redis.evalsha.side_effect = ConnectionError("redis down")
+
+        assert await cache.is_token_revoked("abc") is None
+        assert await cache.revoke_token("abc", 60, 3600) is None
+
+    @pytest.mark.asyncio
+    async def test_get_revoked_tokens(self, cache):
+        cache.redis.zrangebyscore.return_value = [(b"abc", 10.0), (b"def", 12.0)]
+
+        assert await cache.get_revoked_tokens(10) == [("abc", 10), ("def", 12)]
+        cache.redis.zrangebyscore.assert_awaited_once_with(
+            REVOKED_TOKENS_LOG, 10, "+inf", withscores=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_rate_limit(self, cache):
+        cache.redis.evalsha.return_value = [0, 1500, 0]
+
+        assert await cache.rate_limit("ratelimit:test:ip:1", 5, 60) == (False, 1.5, 0)
+        cache.redis.evalsha.assert_awaited_once_with(
+            cache.rate_limit_script.sha, 1, "ratelimit:test:ip:1", 12000, 5
+        )
+
+    @pytest.mark.asyncio
+    async def test_claim_once(self, cache):
+        cache.redis.set.return_value = True
+
+        assert await cache.claim_once("email:dedup:x", 600) is True
+        cache.redis.set.assert_awaited_once_with("email:dedup:x", 1, nx=True, ex=600)
+
+    @pytest.mark.asyncio
+    async def test_claim_once_already_claimed(self, cache):
+        cache.redis.set.return_value = None
+
+        assert await cache.claim_once("email:dedup:x", 600) is False
+
+    @pytest.mark.asyncio
+    async def test_claim_once_unknown_while_redis_down(self, cache):
+        cache.redis.set.side_effect = ConnectionError("redis down")
+
+        assert await cache.claim_once("email:dedup:x", 600) is None
+
+    @pytest.mark.asyncio
+    async def test_mark_sticky(self, cache):
+        cache.redis.set.return_value = True
+        cache.redis.exists.return_value = 1
+
+        assert await cache.mark_sticky("abc", 5.0) is True
+        cache.redis.set.assert_awaited_once_with("sticky:abc", 1, px=5000)
+        assert await cache.is_sticky("abc") is True
+
+    @pytest.mark.asyncio
+    async def test_sticky_unknown_while_redis_down(self, cache):
+        cache.redis.set.side_effect = ConnectionError("redis down")
+        cache.redis.exists.side_effect = ConnectionError("redis down")
+
+        assert await cache.mark_sticky("abc", 5.0) is False
+        assert await cache.is_sticky("abc") is None
+
+    @pytest.mark.asyncio
+    async def test_release_claim(self, cache):
+        cache.redis.delete.return_value = 1
+
+        assert await cache.release_claim("email:dedup:x") is True
+        cache.redis.delete.assert_awaited_once_with("email:dedup:x")
+
+    @pytest.mark.asyncio
+    async def test_legacy_pickle_entry_is_miss(self, cache, user):
+        cache.redis.get.side_effect = [None, pickle.dumps({"username": "testuser"})]
+
+        assert await cache.get_user("testuser") is None
+
+
+class TestLocalTTLCache:
+    def test_evicts_least_recently_used(self):
+        local = LocalTTLCache(maxsize=2, ttl=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        assert local.get("a") == 1
+        assert local.get("b") is None
+        assert local.get("c") == 3
+
+    def test_expires_entries(self):
+        local = LocalTTLCache(maxsize=2, ttl=60)
+        local.set("a", 1, ttl=0)
+
+        assert local.get("a") is None
+        assert len(local) == 0
+
+
+class TestLocalUserTier:
+    @pytest.fixture
+    def cache(self, cache):
+        cache.local_enabled = True
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_redis(self, cache, user):
+        await cache.set_user("testuser", user, expire=60)
+
+        first = await cache.get_user("testuser")
+        second = await cache.get_user("testuser")
+
+        assert user_reads(cache) == []
+        assert first.username == "testuser"
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_fills_local_tier(self, cache, user):
+        cache.redis.get.side_effect = [None, encode_user(user)]
+
+        await cache.get_user("testuser")
+        await cache.get_user("testuser")
+
+        assert cache.redis.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_local_tier_unused_while_not_subscribed(self, cache, user):
+        cache.local_enabled = False
+        await cache.set_user("testuser", user, expire=60)
+
+        await cache.get_user("testuser")
+
+        assert user_reads(cache) == [("user:0:testuser",)]
+
+    @pytest.mark.asyncio
+    async def test_delete_publishes_invalidation(self, cache, user):
+        await cache.set_user("testuser", user, expire=60)
+        pipe = mock_pipeline(cache, [1, 0])
+
+        await cache.delete_user("testuser")
+
+        assert cache.local.get("testuser") is None
+        pipe.publish.assert_called_once_with(USER_INVALIDATION_CHANNEL, "testuser")
+
+    @pytest.mark.asyncio
+    async def test_epoch_kept_in_process(self, cache, user):
+        cache.redis.get.return_value = b"3"
+        mock_pipeline(cache, [1, 0])
+
+        await cache.set_user("testuser", user, expire=60)
+        await cache.delete_user("testuser")
+        await cache.get_user("other")
+
+        assert [call.args for call in cache.redis.get.await_args_list] == [
+            ("epoch:user",),
+            ("user:3:other",),
+        ]
+        assert cache.redis.setex.await_args.args[0] == "user:3:testuser"
+
+    @pytest.mark.asyncio
+    async def test_clear_all_message_rereads_epoch(self, cache):
+        cache.redis.get.return_value = b"3"
+        await cache.get_user("testuser")
+
+        cache.handle_invalidation(b"")
+        cache.redis.get.return_value = b"4"
+        await cache.get_user("testuser")
+
+        assert user_reads(cache) == [("user:3:testuser",), ("user:4:testuser",)]
+
+    @pytest.mark.asyncio
+    async def test_epoch_read_during_invalidation_not_kept(self, cache):
+        async def get(key):
+            cache.handle_invalidation(b"")
+            return b"3"
+
+        cache.redis.get.side_effect = get
+        await cache.get_user("testuser")
+
+        assert cache._user_epoch is None
+
+    @pytest.mark.asyncio
+    async def test_read_racing_invalidation_not_kept(self, cache, user):
+        async def get(key):
+            if key.startswith("user:"):
+                # Another worker deletes the user while the reply is in flight
+                cache.handle_invalidation(b"testuser")
+                return encode_user(user)
+            return b"0"
+
+        cache.redis.get.side_effect = get
+
+        assert (await cache.get_user("testuser")).username == "testuser"
+        assert cache.local.get("testuser") is None
+
+    def test_handle_invalidation(self, cache):
+        cache.local.set("testuser", {})
+        cache.local.set("other", {})
+
+        cache.handle_invalidation(b"testuser")
+        assert cache.local.get("testuser") is None
+        assert cache.local.get("other") == {}
+
+        cache.handle_invalidation(b"")
+        assert len(cache.local) == 0
+
+    @pytest.mark.asyncio
+    async def test_listener_applies_messages(self, cache):
+        cache.local_enabled = False
+        messages = asyncio.Queue()
+
+        async def get_message(ignore_subscribe_messages, timeout):
+            return await messages.get()
+
+        pubsub = MagicMock()
+        pubsub.subscribe = AsyncMock()
+        pubsub.aclose = AsyncMock()
+        pubsub.get_message = get_message
+        cache.redis.pubsub = MagicMock(return_value=pubsub)
+
+        listener = asyncio.create_task(cache.listen_invalidations())
+        await asyncio.sleep(0)
+        assert cache.local_enabled
+        pubsub.subscribe.assert_awaited_once_with(USER_INVALIDATION_CHANNEL)
+
+        cache.local.set("testuser", {})
+        cache.local.set("other", {})
+        await messages.put({"type": "message", "data": b"testuser"})
+        await asyncio.sleep(0)
+        assert cache.local.get("testuser") is None
+        assert cache.local.get("other") == {}
+
+        listener.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listener
+        pubsub.aclose.assert_awaited_once()
+        assert not cache.local_enabled
+        assert len(cache.local) == 0
+
+
+class TestRedisCircuitBreaker:
+    @pytest.fixture
+    def cache(self, cache):
+        cache.breaker.failure_threshold = 2
+        cache.breaker.reset_timeout = 60
+        cache.redis.get.side_effect = ConnectionError("redis down")
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_opens_after_consecutive_failures(self, cache, user):
+        assert await cache.get_user("testuser") is None
+        assert await cache.get_user("testuser") is None
+        assert cache.breaker.state == "open"
+
+        assert await cache.get_user("testuser") is None
+        assert await cache.set_user("testuser", user) is False
+
+        assert cache.redis.get.await_count == 2
+        assert cache.breaker.as_dict()["rejected_calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_breaker(self, cache, user):
+        await cache.get_user("testuser")
+        await cache.get_user("testuser")
+        cache.breaker.reset_timeout = 0
+        started = asyncio.Event()
+
+        async def hang(key):
+            started.set()
+            await asyncio.Event().wait()
+
+        cache.redis.get.side_effect = hang
+        probe = asyncio.create_task(cache.get_user("testuser"))
+        await started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        cache.redis.get.side_effect = [None, encode_user(user)]
+        assert (await cache.get_user("testuser")).username == "testuser"
+        assert cache.breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_closes(self, cache, user):
+        await cache.get_user("testuser")
+        await cache.get_user("testuser")
+        cache.breaker.reset_timeout = 0
+        cache.redis.get.side_effect = [None, encode_user(user)]
+
+        assert cache.breaker.state == "half_open"
+        assert (await cache.get_user("testuser")).username == "testuser"
+        assert cache.breaker.state == "closed"
@@ -0,0 +1,117 @@
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.database.redis_db import RedisCache
+from src.services.revocation import BloomFilter, TokenRevocations
+
+
+@pytest.fixture
+def cache():
+    cache = AsyncMock(spec=RedisCache)
+    cache.revoke_token.return_value = True
+    cache.get_revoked_tokens.return_value = []
+    return cache
+
+
+@pytest.fixture
+def revocations():
+    return TokenRevocations(capacity=100, error_rate=0.01, refresh_interval=1)
+
+
+def payload(jti="abc", expires_in=60):
+    return {"sub": "testuser", "jti": jti, "exp": int(time.time()) + expires_in}
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        items = [f"token-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+        assert len(bloom) == 1000
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f"token-{i}")
+
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestTokenRevocations:
+    @pytest.mark.asyncio
+    async def test_revoke_until_expiry(self, revocations, cache):
+        assert await revocations.revoke(payload(expires_in=60), cache)
+
+        jti, expire, retention = cache.revoke_token.await_args.args
+        assert jti == "abc"
+        assert 59 <= expire <= 61
+        assert "abc" in revocations.filter
+
+    @pytest.mark.asyncio
+    async def test_expired_and_legacy_tokens_not_stored(self, revocations, cache):
+        assert await revocations.revoke(payload(expires_in=-5), cache)
+        assert await revocations.revoke({"sub": "testuser"}, cache) is None
+
+        cache.revoke_token.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_revoke_reports_earlier_revocation(self, revocations, cache):
+        cache.revoke_token.return_value = False
+
+        assert await revocations.revoke(payload(expires_in=60), cache) is False
+
+    @pytest.mark.asyncio
+    async def test_unrevoked_token_needs_no_redis(self, revocations, cache):
+        assert not await revocations.is_revoked(payload(), cache)
+
+        cache.is_token_revoked.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_filter_hit_confirmed_in_redis(self, revocations, cache):
+        revocations.filter.add("abc")
+        cache.is_token_revoked.return_value = True
+
+        assert await revocations.is_revoked(payload(), cache)
+
+        cache.is_token_revoked.return_value = False
+        assert not await revocations.is_revoked(payload(), cache)
+        assert revocations.as_dict()["false_positives"] == 1
+
+    @pytest.mark.asyncio
+    async def test_filter_hit_revoked_while_redis_down(self, revocations, cache):
+        revocations.filter.add("abc")
+        cache.is_token_revoked.return_value = None
+
+        assert await revocations.is_revoked(payload(), cache)
+
+    @pytest.mark.asyncio
+    async def test_refresh_is_incremental(self, revocations, cache):
+        cache.get_revoked_tokens.return_value = [("abc", 10), ("def", 12)]
+        assert await revocations.refresh(cache) == 2
+
+        cache.get_revoked_tokens.return_value = [("def", 12), ("ghi", 15)]
+        await revocations.refresh(cache)
+
+        assert cache.get_revoked_tokens.await_args_list[1].args == (12,)
+        assert all(jti in revocations.filter for jti in ("abc", "def", "ghi"))
+        assert len(revocations.filter) == 3
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_when_full(self, cache):
+        revocations = TokenRevocations(capacity=2, error_rate=0.01, refresh_interval=1)
+        revocations.filter.add("expired")
+        log = [("abc", 10), ("def", 12)]
+        cache.get_revoked_tokens.side_effect = [log, log]
+
+        await revocations.refresh(cache)
+
+        assert cache.get_revoked_tokens.await_args.args == (0,)
+        assert revocations.rebuilds == 1
+        assert len(revocations.filter) == 2
+        assert "abc" in revocations.filter
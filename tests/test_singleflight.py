@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from src.services.singleflight import SingleFlight
+
+
+@pytest.fixture
+def flight():
+    return SingleFlight()
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self, flight):
+        calls = 0
+        release = asyncio.Event()
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "user"
+
+        tasks = [asyncio.create_task(flight.do("key", load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert flight.in_flight("key")
+        release.set()
+
+        assert await asyncio.gather(*tasks) == ["user"] * 5
+        assert calls == 1
+        assert not flight.in_flight("key")
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self, flight):
+        async def load(value):
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: load(1)), flight.do("b", lambda: load(2))
+        )
+
+        assert results == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_exception_shared(self, flight):
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            raise RuntimeError("db down")
+
+        tasks = [asyncio.create_task(flight.do("key", load)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert not flight.in_flight("key")
+
+    @pytest.mark.asyncio
+    async def test_waiter_takes_over_after_leader_cancelled(self, flight):
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.Event().wait()
+            return "user"
+
+        leader = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+
+        assert await waiter == "user"
+        assert calls == 2
+        with pytest.raises(asyncio.CancelledError):
+            await leader
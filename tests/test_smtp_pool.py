@@ -0,0 +1,154 @@
+from unittest.mock import MagicMock, patch
+
+import aiosmtplib
+import pytest
+from fastapi_mail.errors import ConnectionErrors
+
+from src.services.smtp_pool import SMTPConnectionPool
+
+
+class FakeSMTP:
+    instances = []
+    refuse_connections = False
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.is_connected = False
+        self.logins = 0
+        self.noops = 0
+        self.noop_error = None
+        self.closed = False
+        FakeSMTP.instances.append(self)
+
+    async def connect(self):
+        if FakeSMTP.refuse_connections:
+            raise OSError("Connection refused")
+        self.is_connected = True
+
+    async def login(self, username, password):
+        self.logins += 1
+
+    async def noop(self):
+        self.noops += 1
+        if self.noop_error is not None:
+            raise self.noop_error
+
+    async def quit(self):
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+        self.closed = True
+
+
+@pytest.fixture
+def config():
+    config = MagicMock()
+    config.MAIL_SERVER = "smtp.example.com"
+    config.MAIL_PORT = 465
+    config.USE_CREDENTIALS = True
+    return config
+
+
+@pytest.fixture(autouse=True)
+def fake_smtp():
+    FakeSMTP.instances = []
+    FakeSMTP.refuse_connections = False
+    with patch("src.services.smtp_pool.aiosmtplib.SMTP", FakeSMTP):
+        yield FakeSMTP
+
+
+def make_pool(config, size=2, idle_check_seconds=30):
+    return SMTPConnectionPool(config, size, idle_check_seconds)
+
+
+class TestSMTPConnectionPool:
+    @pytest.mark.asyncio
+    async def test_reuses_connection(self, config):
+        pool = make_pool(config)
+
+        async with pool.connection() as first:
+            pass
+        async with pool.connection() as second:
+            pass
+
+        assert first is second
+        assert first.logins == 1
+        assert pool.as_dict() == {
+            "size": 2,
+            "idle": 1,
+            "connects": 1,
+            "stale": 0,
+            "discarded": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_opens_connections_up_to_size(self, config):
+        pool = make_pool(config)
+
+        async with pool.connection() as first:
+            async with pool.connection() as second:
+                assert first is not second
+
+        assert pool.connects == 2
+        assert pool.as_dict()["idle"] == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_connection_checked_with_noop(self, config):
+        pool = make_pool(config, idle_check_seconds=0)
+        async with pool.connection() as first:
+            pass
+
+        async with pool.connection() as second:
+            pass
+
+        assert second is first
+        assert first.noops == 1
+
+    @pytest.mark.asyncio
+    async def test_dropped_connection_is_replaced(self, config):
+        pool = make_pool(config, idle_check_seconds=0)
+        async with pool.connection() as first:
+            first.noop_error = aiosmtplib.SMTPServerDisconnected("Gone")
+
+        async with pool.connection() as second:
+            pass
+
+        assert second is not first
+        assert first.closed
+        assert pool.stale == 1
+        assert pool.connects == 2
+
+    @pytest.mark.asyncio
+    async def test_connection_closed_after_error(self, config):
+        pool = make_pool(config)
+
+        with pytest.raises(aiosmtplib.SMTPServerDisconnected):
+            async with pool.connection() as smtp:
+                raise aiosmtplib.SMTPServerDisconnected("Gone")
+
+        assert smtp.closed
+        assert pool.discarded == 1
+        assert pool.as_dict()["idle"] == 0
+
+    @pytest.mark.asyncio
+    async def test_connect_failure(self, config, fake_smtp):
+        fake_smtp.refuse_connections = True
+        pool = make_pool(config)
+
+        with pytest.raises(ConnectionErrors):
+            async with pool.connection():
+                pass
+
+        assert pool.connects == 0
+
+    @pytest.mark.asyncio
+    async def test_close(self, config):
+        pool = make_pool(config)
+        async with pool.connection() as smtp:
+            pass
+
+        await pool.close()
+
+        assert not smtp.is_connected
+        assert pool.as_dict()["idle"] == 0
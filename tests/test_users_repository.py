@@ -27,6 +27,7 @@ def sample_user():
         confirmed=False,
         role=UserRole.USER,
         avatar="http://example.com/avatar.png",
+        token_version=0,
     )
 
 
@@ -251,6 +252,7 @@ class TestUserRepository:
 
         assert updated_user.hashed_password == new_password_hash
         assert updated_user.hashed_password != original_password
+        assert updated_user.token_version == 1
         mock_session.commit.assert_awaited_once()
         mock_session.refresh.assert_awaited_once_with(sample_user)
 
@@ -277,6 +279,7 @@ class TestUserRepository:
         )
 
         assert updated_user.role == UserRole.ADMIN
+        assert updated_user.token_version == 1
         mock_session.commit.assert_awaited_once()
         mock_session.refresh.assert_awaited_once_with(sample_user)
 
@@ -79,10 +79,10 @@ class TestUserService:
             mock_gravatar.get_image.return_value = "http://gravatar.com/avatar/hash"
             mock_gravatar_class.return_value = mock_gravatar
 
-            with patch("src.services.users.CryptContext") as mock_crypt:
-                mock_crypt_instance = MagicMock()
-                mock_crypt_instance.hash.return_value = "hashed_securepassword"
-                mock_crypt.return_value = mock_crypt_instance
+            with patch("src.services.users.Hash") as mock_hash:
+                mock_hash_instance = MagicMock()
+                mock_hash_instance.get_password_hash.return_value = "hashed_securepassword"
+                mock_hash.return_value = mock_hash_instance
 
                 expected_user = User(
                     id=1,
@@ -115,10 +115,10 @@ class TestUserService:
             mock_gravatar.get_image.return_value = "http://gravatar.com/admin_hash"
             mock_gravatar_class.return_value = mock_gravatar
 
-            with patch("src.services.users.CryptContext") as mock_crypt:
-                mock_crypt_instance = MagicMock()
-                mock_crypt_instance.hash.return_value = "hashed_adminpassword"
-                mock_crypt.return_value = mock_crypt_instance
+            with patch("src.services.users.Hash") as mock_hash:
+                mock_hash_instance = MagicMock()
+                mock_hash_instance.get_password_hash.return_value = "hashed_adminpassword"
+                mock_hash.return_value = mock_hash_instance
 
                 expected_user = User(
                     id=2,
@@ -153,10 +153,10 @@ class TestUserService:
         with patch("src.services.users.Gravatar") as mock_gravatar_class:
             mock_gravatar_class.side_effect = Exception("Gravatar service unavailable")
 
-            with patch("src.services.users.CryptContext") as mock_crypt:
-                mock_crypt_instance = MagicMock()
-                mock_crypt_instance.hash.return_value = "hashed_password123"
-                mock_crypt.return_value = mock_crypt_instance
+            with patch("src.services.users.Hash") as mock_hash:
+                mock_hash_instance = MagicMock()
+                mock_hash_instance.get_password_hash.return_value = "hashed_password123"
+                mock_hash.return_value = mock_hash_instance
 
                 expected_user = User(
                     id=3,
@@ -265,10 +265,10 @@ class TestUserService:
             avatar=sample_user.avatar,
         )
 
-        with patch("src.services.users.CryptContext") as mock_crypt:
-            mock_crypt_instance = MagicMock()
-            mock_crypt_instance.hash.return_value = "hashed_newpassword123"
-            mock_crypt.return_value = mock_crypt_instance
+        with patch("src.services.users.Hash") as mock_hash:
+            mock_hash.return_value.get_password_hash_async = AsyncMock(
+                return_value="hashed_newpassword123"
+            )
 
             user_service.repository.update_password = AsyncMock(
                 return_value=updated_user
@@ -322,7 +322,10 @@ class TestUserServiceErrorHandling:
 
     @pytest.mark.asyncio
     async def test_update_password_user_not_found(self, user_service):
-        with patch("src.services.users.CryptContext") as mock_crypt:
+        with patch("src.services.users.Hash") as mock_hash:
+            mock_hash.return_value.get_password_hash_async = AsyncMock(
+                return_value="hashed_newpassword"
+            )
             user_service.repository.update_password = AsyncMock(
                 side_effect=ValueError("User not found")
             )